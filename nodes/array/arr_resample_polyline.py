@@ -4,16 +4,16 @@
 #
 # SPDX-License-Identifier: GPL3
 # License-Filename: LICENSE
-import numpy as np
-
 try:
     import awkward as ak
 except ImportError:
     ak = None
 
 import bpy
+from bpy.props import EnumProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
+from sverchok.utils.profile import profile
 from sverchok_extra.utils import array_math as amath
 
 
@@ -27,6 +27,18 @@ class SvResamplePolylineNode(SverchCustomTreeNode, bpy.types.Node):
     sv_icon = 'SV_ALPHA'
     sv_dependencies = ['awkward']
 
+    interpolations = [
+        ('LINEAR', 'Linear', '', 0),
+        ('CUBIC', 'Cubic', '', 1),
+        ('CATMULL_ROM', 'Catmull-Rom', '', 2),
+    ]
+
+    interpolation: EnumProperty(items=interpolations,
+                                update=lambda s, c: s.process_node(c))
+
+    def sv_draw_buttons(self, context, layout):
+        layout.prop(self, 'interpolation', text='')
+
     def sv_init(self, context):
         self.inputs.new('SvStringsSocket', 'Array')
         s = self.inputs.new('SvStringsSocket', 'Count')
@@ -35,23 +47,18 @@ class SvResamplePolylineNode(SverchCustomTreeNode, bpy.types.Node):
         s.default_int_property = 10
         self.outputs.new('SvStringsSocket', 'Array')
 
+    @profile
     def process(self):
         line = self.inputs[0].sv_get(deepcopy=False, default=None)
         if line is None:
             return
         count = self.inputs[1].sv_get(deepcopy=False)
-        count = count if self.inputs[1].is_linked else ak.Array(count[0])
-        segment_len = amath.segment_length(line.verts)
-        line_len = ak.sum(segment_len, axis=-1)
-        step = line_len / count
-        segment_count = ak.values_astype(segment_len / step, int)
-        total_num = ak.sum(count)
-        new_verts = np.zeros((total_num, 3))
-        new_verts = ak.unflatten(new_verts, count)
-        vert1 = line.verts[..., :-1, :]
-        vert2 = line.verts[..., 1:, :]
-        breakpoint()
-        self.outputs[0].sv_set(line)
+        count = ak.values_astype(count, int) if self.inputs[1].is_linked \
+            else ak.Array(count[0])
 
+        new_verts = amath.resample_polyline(line.verts, count, self.interpolation)
+        new_edges = amath.connect_polyline(new_verts)
+        new_line = ak.Array({'verts': new_verts, 'edges': new_edges})
+        self.outputs[0].sv_set(new_line)
 
 register, unregister = bpy.utils.register_classes_factory([SvResamplePolylineNode])
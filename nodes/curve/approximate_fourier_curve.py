@@ -17,6 +17,8 @@ from sverchok.utils.math import supported_metrics, xyz_metrics
 from sverchok.utils.curve.fourier import SvFourierCurve
 from sverchok.dependencies import scipy
 
+from sverchok_extra.utils.curve.fourier import approximate_fft
+
 class SvApproxFourierCurveNode(SverchCustomTreeNode, bpy.types.Node):
     """
     Triggers: Approximate Fourier Curve
@@ -51,7 +53,8 @@ class SvApproxFourierCurveNode(SverchCustomTreeNode, bpy.types.Node):
     algorithm : EnumProperty(name = "Algorithm",
         items = [
             ('FIT', "Curve fitting", "Curve fitting", 0),
-            ('LSTSQ', "Least squares", "Least squares", 1)
+            ('LSTSQ', "Least squares", "Least squares", 1),
+            ('FFT', "FFT", "Fast Fourier transform. Points are considered as a closed sequence, which is resampled to even parametrization according to metric if needed. Omega is always 2*pi", 2)
         ],
         update = update_sockets)
 
@@ -68,6 +71,18 @@ class SvApproxFourierCurveNode(SverchCustomTreeNode, bpy.types.Node):
         self.outputs.new('SvVerticesSocket', "Amplitudes")
         self.update_sockets(context)
 
+    def approximate_fft(self, items):
+        # Curves of the same degree are transformed in batches
+        groups = dict()
+        for i, (vertices, degree, omega) in enumerate(items):
+            groups.setdefault(degree, []).append(i)
+        curves = [None] * len(items)
+        for degree, idxs in groups.items():
+            new_curves = approximate_fft([items[i][0] for i in idxs], degree, metric=self.metric)
+            for i, curve in zip(idxs, new_curves):
+                curves[i] = curve
+        return curves
+
     def process(self):
         if not any(socket.is_linked for socket in self.outputs):
             return
@@ -86,15 +101,23 @@ class SvApproxFourierCurveNode(SverchCustomTreeNode, bpy.types.Node):
         points_out = []
         omega_out = []
 
-        for params in zip_long_repeat(vertices_s, degree_s, omega_s):
+        items_s = [list(zip_long_repeat(*params)) for params in zip_long_repeat(vertices_s, degree_s, omega_s)]
+        if self.algorithm == 'FFT':
+            fft_curves = self.approximate_fft([item for items in items_s for item in items])
+
+        idx = 0
+        for items in items_s:
             new_curves = []
             new_points = []
             new_omega = []
-            for vertices, degree, omega in zip_long_repeat(*params):
+            for vertices, degree, omega in items:
                 if self.algorithm == 'FIT':
                     curve = SvFourierCurve.approximate_fit(np.array(vertices), degree, metric=self.metric)
-                else:
+                elif self.algorithm == 'LSTSQ':
                     curve = SvFourierCurve.approximate_lstsq(np.array(vertices), omega, degree, metric=self.metric)
+                else:
+                    curve = fft_curves[idx]
+                    idx += 1
                 amplitudes = [tuple(curve.start)] + curve.coeffs.tolist()
                 omega = curve.omega
 
@@ -18,6 +18,8 @@ from sverchok.utils.math import np_multiply_matrices_vectors
 
 from sverchok.utils.geodesic import geodesic_cauchy_problem, cubic_spline
 
+from sverchok_extra.utils.geodesic import shoot_geodesics
+
 def calc_angles(surface, uvs, directions):
     n = len(uvs)
     uvs = np.asarray(uvs)
@@ -78,6 +80,12 @@ class SvExGeodesicCauchyNode(SverchCustomTreeNode, bpy.types.Node):
         default = True,
         update = updateNode)
 
+    vectorize : BoolProperty(
+        name = "Vectorize",
+        description = "Integrate all geodesics on the same surface as one system with shared step size",
+        default = False,
+        update = updateNode)
+
     def update_sockets(self, context):
         self.inputs['Direction'].hide_safe = self.angle_mode == 'ANGLE'
         self.inputs['Angle'].hide_safe = self.angle_mode == 'DIRECTION'
@@ -88,6 +96,7 @@ class SvExGeodesicCauchyNode(SverchCustomTreeNode, bpy.types.Node):
         row.prop(self, 'closed_v', toggle=True)
         layout.prop(self, 'angle_mode')
         layout.prop(self, 'join')
+        layout.prop(self, 'vectorize')
 
     modes = [
             ('ANGLE', "By Angle", "Angle", 0),
@@ -172,12 +181,21 @@ class SvExGeodesicCauchyNode(SverchCustomTreeNode, bpy.types.Node):
                     angles = np.array(angles)
                     starts = repeat_last_for_length(starts, k)
                 starts = np.array(starts)
-                solution = geodesic_cauchy_problem(surface, starts, angles=angles,
-                                                   target_radius=distance,
-                                                   n_steps=steps,
-                                                   closed_u = self.closed_u,
-                                                   closed_v = self.closed_v)
-                uv_curve = [cubic_spline(surface, uv_points) for uv_points in solution.uv_points]
+                if self.vectorize:
+                    solution = shoot_geodesics(surface, starts, angles,
+                                               target_radius=distance,
+                                               n_steps=steps,
+                                               closed_u = self.closed_u,
+                                               closed_v = self.closed_v)
+                    uv_lines = solution.get_uv_lines()
+                else:
+                    solution = geodesic_cauchy_problem(surface, starts, angles=angles,
+                                                       target_radius=distance,
+                                                       n_steps=steps,
+                                                       closed_u = self.closed_u,
+                                                       closed_v = self.closed_v)
+                    uv_lines = solution.uv_points
+                uv_curve = [cubic_spline(surface, uv_points) for uv_points in uv_lines]
                 curve = [SvCurveOnSurface(uv, surface, axis=2) for uv in uv_curve]
 
                 new_orig_points.append(solution.get_all_orig_points())
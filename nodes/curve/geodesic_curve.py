@@ -17,6 +17,8 @@ from sverchok.utils.curve.algorithms import SvCurveOnSurface
 
 from sverchok.utils.geodesic import geodesic_curve_by_two_points, cubic_spline
 
+from sverchok_extra.utils.geodesic import process_batch, process_multilevel
+
 class SvExGeodesicCurveNode(SverchCustomTreeNode, bpy.types.Node):
     """
     Triggers: Geodesic Curve by two points
@@ -82,8 +84,66 @@ class SvExGeodesicCurveNode(SverchCustomTreeNode, bpy.types.Node):
         self.outputs.new('SvVerticesSocket', "UVPoints")
         self.outputs.new('SvCurveSocket', "UVCurve")
 
+    vectorize : BoolProperty(
+        name = "Vectorize",
+        description = "Relax all curves on the same surface at once",
+        default = False,
+        update = updateNode)
+
+    multilevel : BoolProperty(
+        name = "Multilevel",
+        description = "Relax curves with small number of points first, and then refine them level by level",
+        default = False,
+        update = updateNode)
+
+    level_iterations : IntProperty(
+        name = "Level Iterations",
+        description = "Maximum number of iterations at each level except for the coarsest one",
+        min = 1,
+        default = 20,
+        update = updateNode)
+
     def draw_buttons(self, context, layout):
         layout.prop(self, 'join')
+        layout.prop(self, 'vectorize')
+        layout.prop(self, 'multilevel')
+        if self.multilevel:
+            layout.prop(self, 'level_iterations')
+
+    def calc_batch(self, items):
+        # Group curves which share the same surface and parameters, so that
+        # each group is relaxed by one call of process_batch() or
+        # process_multilevel().
+        groups = dict()
+        for i, (surface, point1, point2, n_points, n_iterations, step, tolerance) in enumerate(items):
+            if self.vectorize:
+                key = (id(surface), n_points, n_iterations, step, tolerance)
+            else:
+                key = i
+            groups.setdefault(key, []).append(i)
+
+        results = [None] * len(items)
+        for idxs in groups.values():
+            surface, _, _, n_points, n_iterations, step, tolerance = items[idxs[0]]
+            pts1 = [items[i][1] for i in idxs]
+            pts2 = [items[i][2] for i in idxs]
+            if self.multilevel:
+                uv_pts, stats = process_multilevel(surface, pts1, pts2,
+                                        n_points, n_iterations,
+                                        step, tolerance,
+                                        level_iterations = self.level_iterations)
+                levels = ", ".join(f"{level_points} points: {level_iterations}" for level_points, level_iterations in stats)
+                self.info(f"Iterations per level: {levels}")
+            else:
+                uv_pts = process_batch(surface, pts1, pts2,
+                                       n_points, n_iterations,
+                                       step, tolerance)
+            flat_uv = uv_pts.reshape((-1, uv_pts.shape[2]))
+            pts = surface.evaluate_array(flat_uv[:,0], flat_uv[:,1])
+            pts = pts.reshape((len(idxs), n_points, 3))
+            for i, curve_uv_pts, curve_pts in zip(idxs, uv_pts, pts):
+                results[i] = (curve_uv_pts, curve_pts)
+        return results
 
     def process(self):
         if not any(socket.is_linked for socket in self.outputs):
@@ -114,12 +174,20 @@ class SvExGeodesicCurveNode(SverchCustomTreeNode, bpy.types.Node):
             new_uv_pts = []
             new_curves = []
             new_points = []
-            for surface, point1, point2, n_points, n_iterations, step, tolerance in zip_long_repeat(*params):
-                uv_pts = geodesic_curve_by_two_points(surface, point1, point2,
-                                                      n_points, n_iterations,
-                                                      step, tolerance,
-                                                      logger=self.sv_logger)
-                pts = surface.evaluate_array(uv_pts[:,0], uv_pts[:,1])
+            items = list(zip_long_repeat(*params))
+            if self.vectorize or self.multilevel:
+                results = self.calc_batch(items)
+            else:
+                results = []
+                for surface, point1, point2, n_points, n_iterations, step, tolerance in items:
+                    uv_pts = geodesic_curve_by_two_points(surface, point1, point2,
+                                                          n_points, n_iterations,
+                                                          step, tolerance,
+                                                          logger=self.sv_logger)
+                    pts = surface.evaluate_array(uv_pts[:,0], uv_pts[:,1])
+                    results.append((uv_pts, pts))
+
+            for (surface, *_), (uv_pts, pts) in zip(items, results):
                 uv_curve = cubic_spline(surface, uv_pts)
                 curve = SvCurveOnSurface(uv_curve, surface, axis=2)
                 new_uv_curves.append(uv_curve)
@@ -1,6 +1,6 @@
 
 import bpy
-from bpy.props import EnumProperty, IntProperty
+from bpy.props import EnumProperty, IntProperty, BoolProperty, FloatProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level
@@ -8,7 +8,8 @@ from sverchok.utils.surface import SvSurface
 from sverchok.utils.geom import PlaneEquation
 from sverchok.dependencies import scipy, skimage
 
-from sverchok_extra.utils.manifolds import intersect_surface_plane_msquares, intersect_surface_plane_uv
+from sverchok_extra.utils.manifolds import (intersect_surface_plane_msquares, intersect_surface_planes_msquares,
+        intersect_surface_plane_uv, intersect_surface_plane_isolines)
 
 
 class SvExCrossSurfacePlaneNode(SverchCustomTreeNode, bpy.types.Node):
@@ -40,16 +41,46 @@ class SvExCrossSurfacePlaneNode(SverchCustomTreeNode, bpy.types.Node):
         min = 3,
         update = updateNode)
 
+    contour_stack : BoolProperty(
+        name = "Contour Stack",
+        description = "Intersect each surface with all planes at once; the surface is sampled only once",
+        default = False,
+        update = updateNode)
+
+    refine : BoolProperty(
+        name = "Refine",
+        description = "Move contour points to exact intersection by Newton iterations",
+        default = False,
+        update = updateNode)
+
+    refine_tolerance : FloatProperty(
+        name = "Tolerance",
+        description = "Maximum allowed distance from refined points to the plane",
+        min = 1e-12,
+        default = 1e-6,
+        precision = 8,
+        update = updateNode)
+
+    chord_tolerance : FloatProperty(
+        name = "Chord Tolerance",
+        description = "Insert refined middle points into segments which deviate from the intersection by more than this value; zero means do not insert points",
+        min = 0.0,
+        default = 0.0,
+        precision = 6,
+        update = updateNode)
+
     def get_modes(self, context):
         modes = []
         if skimage is not None:
             modes.append(('skimage', "Marching Squares", "Use marching squares algorithm", 0))
         if scipy is not None:
             modes.append(('scipy', "OP + Tangent (Unsorted!)", "Use orthogonal projections + tangent method", 1))
+        if skimage is not None:
+            modes.append(('isolines', "Iso-lines", "Find intersections of all iso-lines with the plane at once, and connect them into polylines", 2))
         return modes
 
     def update_sockets(self, context):
-        self.outputs['UVPoints'].hide_safe = self.algorithm != 'skimage'
+        self.outputs['UVPoints'].hide_safe = self.algorithm not in {'skimage', 'isolines'}
         updateNode(self, context)
 
     algorithm : EnumProperty(
@@ -69,15 +100,30 @@ class SvExCrossSurfacePlaneNode(SverchCustomTreeNode, bpy.types.Node):
         self.inputs.new('SvStringsSocket', "SamplesV").prop_name = 'samples_v'
         self.outputs.new('SvVerticesSocket', "Points")
         self.outputs.new('SvVerticesSocket', "UVPoints")
-        self.update_socket(context)
+        self.update_sockets(context)
 
     def draw_buttons(self, context, layout):
         layout.prop(self, 'algorithm', text='')
+        if self.algorithm == 'skimage':
+            layout.prop(self, 'contour_stack')
+            layout.prop(self, 'refine')
 
     def draw_buttons_ext(self, context, layout):
-        self.draw_buttons(context)
+        self.draw_buttons(context, layout)
         if self.algorithm == 'scipy':
             layout.prop(self, 'init_samples')
+        elif self.algorithm == 'isolines':
+            layout.prop(self, 'refine_tolerance')
+        elif self.refine:
+            layout.prop(self, 'refine_tolerance')
+            layout.prop(self, 'chord_tolerance')
+
+    def get_refine_args(self):
+        if not self.refine:
+            return dict()
+        return dict(refine = True,
+                    tolerance = self.refine_tolerance,
+                    chord_tolerance = self.chord_tolerance if self.chord_tolerance > 0 else None)
 
     def process(self):
         if not any(socket.is_linked for socket in self.outputs):
@@ -96,26 +142,57 @@ class SvExCrossSurfacePlaneNode(SverchCustomTreeNode, bpy.types.Node):
         uv_out = []
         points_out = []
         for surfaces, points, normals, samples_u_i, samples_v_i in zip_long_repeat(surfaces_s, point_s, normal_s, samples_u_s, samples_v_s):
-            uv_new = []
-            points_new = []
-            for surface, point, normal, samples_u, samples_v in zip_long_repeat(surfaces, points, normals, samples_u_i, samples_v_i):
-                plane = PlaneEquation.from_normal_and_point(normal, point)
-                if self.algorithm == 'skimage':
-                    uv_new, points_new = intersect_surface_plane_msquares(surface, plane,
-                                            need_points = need_points,
-                                            samples_u = samples_u, samples_v = samples_v)
-                else:
-                    points_new = intersect_surface_plane_uv(surface, plane,
-                                    samples_u = samples_u, samples_v = samples_v,
-                                    init_samples = self.init_samples, ortho_samples = self.init_samples)
-                    points_new = [points_new]
-
-            uv_out.extend(uv_new)
-            points_out.extend(points_new)
+            items = list(zip_long_repeat(surfaces, points, normals, samples_u_i, samples_v_i))
+            if self.algorithm == 'skimage' and self.contour_stack:
+                results = self.process_stack(items, need_points)
+            else:
+                results = []
+                for surface, point, normal, samples_u, samples_v in items:
+                    plane = PlaneEquation.from_normal_and_point(normal, point)
+                    if self.algorithm == 'skimage':
+                        uv_new, points_new = intersect_surface_plane_msquares(surface, plane,
+                                                need_points = need_points,
+                                                samples_u = samples_u, samples_v = samples_v,
+                                                **self.get_refine_args())
+                    elif self.algorithm == 'isolines':
+                        uv_new, points_new = intersect_surface_plane_isolines(surface, plane,
+                                                samples_u = samples_u, samples_v = samples_v,
+                                                tolerance = self.refine_tolerance)
+                    else:
+                        uv_new = []
+                        points_new = intersect_surface_plane_uv(surface, plane,
+                                        samples_u = samples_u, samples_v = samples_v,
+                                        init_samples = self.init_samples, ortho_samples = self.init_samples)
+                        points_new = [points_new]
+                    results.append((uv_new, points_new))
+
+            for uv_new, points_new in results:
+                uv_out.extend(uv_new)
+                points_out.extend(points_new)
 
         self.outputs['Points'].sv_set(points_out)
         self.outputs['UVPoints'].sv_set(uv_out)
 
+    def process_stack(self, items, need_points):
+        # Group planes by surface and sampling, so that each surface is
+        # sampled once for all planes it is intersected with.
+        groups = dict()
+        for i, (surface, point, normal, samples_u, samples_v) in enumerate(items):
+            key = (id(surface), samples_u, samples_v)
+            groups.setdefault(key, []).append(i)
+
+        results = [None] * len(items)
+        for idxs in groups.values():
+            surface, _, _, samples_u, samples_v = items[idxs[0]]
+            planes = [PlaneEquation.from_normal_and_point(items[i][2], items[i][1]) for i in idxs]
+            group_results = intersect_surface_planes_msquares(surface, planes,
+                                need_points = need_points,
+                                samples_u = samples_u, samples_v = samples_v,
+                                **self.get_refine_args())
+            for i, result in zip(idxs, group_results):
+                results[i] = result
+        return results
+
 
 def register():
     bpy.utils.register_class(SvExCrossSurfacePlaneNode)
@@ -16,6 +16,8 @@ from sverchok.utils.curve.core import SvCurve
 from sverchok.utils.curve.nurbs import SvNurbsCurve
 from sverchok.utils.curve.nurbs_solver import SvNurbsCurveSolver, SvNurbsCurveGoal
 
+from sverchok_extra.utils.curve.nurbs_batch_solver import SvNurbsCurveBatchSolver, is_batch_solvable, goals_key
+
 class SvNurbsCurveSolverNode(SverchCustomTreeNode, bpy.types.Node):
     """
     Triggers: NURBS Curve Solver
@@ -57,8 +59,16 @@ class SvNurbsCurveSolverNode(SverchCustomTreeNode, bpy.types.Node):
             min = 2,
             update = updateNode)
 
+    vectorize : BoolProperty(
+            name = "Vectorize",
+            description = "Solve curves which share degree, knotvector, weights and goal parameters with one matrix factorization. Supported for point goals only",
+            default = False,
+            update = updateNode)
+
     def draw_buttons(self, context, layout):
         layout.prop(self, 'mode')
+        if self.mode != 'GUESS':
+            layout.prop(self, 'vectorize')
 
     def sv_init(self, context):
         self.inputs.new('SvStringsSocket', "Goals")
@@ -70,6 +80,52 @@ class SvNurbsCurveSolverNode(SverchCustomTreeNode, bpy.types.Node):
         self.outputs.new('SvCurveSocket', "Curve")
         self.update_sockets(context)
 
+    def solve_single(self, goals, degree, n_cpts, knotvector, weights, curve):
+        self.debug(f"Goals: {len(goals)}, degree: {degree}, KV: {knotvector}, Ws: {weights}, curve: {curve}")
+        solver = SvNurbsCurveSolver(degree=degree, src_curve=curve)
+        solver.set_goals(goals)
+        if self.mode == 'GUESS':
+            solver.guess_curve_params()
+        elif self.mode == 'EXPLICIT':
+            solver.set_curve_params(n_cpts, knotvector, weights)
+        else: # CURVE
+            n_cpts = len(curve.get_control_points())
+            knotvector = curve.get_knotvector()
+            weights = curve.get_weights()
+            solver.set_curve_params(n_cpts, knotvector, weights)
+
+        return solver.solve(logger=self.sv_logger)
+
+    def solve_batch(self, items):
+        # Curves which share degree, knotvector, weights and goal parameters
+        # differ only in target points; solve each such group with one
+        # factorization of the equations matrix.
+        groups = dict()
+        results = [None] * len(items)
+        for i, (goals, degree, n_cpts, knotvector, weights, curve) in enumerate(items):
+            if not is_batch_solvable(goals):
+                results[i] = self.solve_single(goals, degree, n_cpts, knotvector, weights, curve)
+                continue
+            if self.mode == 'CURVE':
+                degree = curve.get_degree()
+                n_cpts = len(curve.get_control_points())
+                knotvector = curve.get_knotvector()
+                weights = curve.get_weights()
+            key = (degree, n_cpts,
+                    None if knotvector is None else tuple(knotvector),
+                    None if weights is None else tuple(weights),
+                    goals_key(goals))
+            groups.setdefault(key, []).append(i)
+
+        for (degree, n_cpts, knotvector, weights, _), idxs in groups.items():
+            solver = SvNurbsCurveBatchSolver(degree, n_cpts, knotvector, weights)
+            src_curves = [items[i][5] for i in idxs]
+            curves = solver.solve([items[i][0] for i in idxs], src_curves)
+            self.debug(f"Solved {len(idxs)} curves with one factorization")
+            for i, curve in zip(idxs, curves):
+                results[i] = curve
+        return results
+
     def process(self):
         if not any(socket.is_linked for socket in self.outputs):
             return
@@ -109,31 +165,29 @@ class SvNurbsCurveSolverNode(SverchCustomTreeNode, bpy.types.Node):
             weights_s = [[None]]
             curves_s = [[None]]
 
-        curves_out = []
+        items_s = []
         for params in zip_long_repeat(goals_s, degree_s, n_cpts_s, knotvector_s, weights_s, curves_s):
-            new_curves = []
+            items = []
             for goals, degree, n_cpts, knotvector, weights, curve in zip_long_repeat(*params):
                 if self.mode == 'CURVE':
                     curve = SvNurbsCurve.to_nurbs(curve)
                     if curve is None:
                         raise Exception("One of curves is not NURBS")
                     degree = None
-                print(f"Goals: {len(goals)}, degree: {degree}, KV: {knotvector}, Ws: {weights}, curve: {curve}")
-                solver = SvNurbsCurveSolver(degree=degree, src_curve=curve)
-                solver.set_goals(goals)
-                if self.mode == 'GUESS':
-                    solver.guess_curve_params()
-                elif self.mode == 'EXPLICIT':
-                    solver.set_curve_params(n_cpts, knotvector, weights)
-                else: # CURVE
-                    n_cpts = len(curve.get_control_points())
-                    knotvector = curve.get_knotvector()
-                    weights = curve.get_weights()
-                    solver.set_curve_params(n_cpts, knotvector, weights)
-
-                new_curve = solver.solve(logger=self.sv_logger)
-                new_curves.append(new_curve)
-            curves_out.append(new_curves)
+                items.append((goals, degree, n_cpts, knotvector, weights, curve))
+            items_s.append(items)
+
+        if self.vectorize and self.mode != 'GUESS':
+            # Solve all curves together, so that they can share
+            # factorizations across input lists
+            all_curves = self.solve_batch([item for items in items_s for item in items])
+            curves_out = []
+            start = 0
+            for items in items_s:
+                curves_out.append(all_curves[start : start + len(items)])
+                start += len(items)
+        else:
+            curves_out = [[self.solve_single(*item) for item in items] for items in items_s]
 
         self.outputs['Curve'].sv_set(curves_out)
 
@@ -1,5 +1,5 @@
 import bpy
-from bpy.props import StringProperty, BoolProperty, EnumProperty, FloatProperty
+from bpy.props import StringProperty, BoolProperty, EnumProperty, FloatProperty, IntProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
@@ -22,7 +22,7 @@ class SvReadSvgOperator(bpy.types.Operator, SvGenericNodeLocator):
         if not node.inputs['FilePath'].is_linked:
             return {'CANCELLED'}
 
-        node.read_file()
+        node.read_file(use_cache=False)
         updateNode(node, context)
 
         return {'FINISHED'}
@@ -61,6 +61,19 @@ class SvReadSvgNode(SverchCustomTreeNode, bpy.types.Node):
         precision = 8,
         update = updateNode)
 
+    iterative : BoolProperty(
+            name = "Iterative parsing",
+            description = "Parse elements of the document by small groups, to keep memory usage low for huge files. References between elements (use, defs, style) are not supported in this mode",
+            default = False,
+            update = updateNode)
+
+    n_workers : IntProperty(
+            name = "Workers",
+            description = "Number of processes used to convert SVG elements. Values greater than 1 imply iterative parsing. Not supported on Windows and macOS",
+            default = 1,
+            min = 1,
+            update = updateNode)
+
     def draw_buttons(self, context, layout):
         self.wrapper_tracked_ui_draw_op(layout, SvReadSvgOperator.bl_idname, icon='FILE_REFRESH', text="UPDATE")
         layout.prop(self, 'convert_coords')
@@ -68,17 +81,25 @@ class SvReadSvgNode(SverchCustomTreeNode, bpy.types.Node):
         layout.prop(self, 'svg_ppi')
         layout.prop(self, 'tolerance')
 
+    def draw_buttons_ext(self, context, layout):
+        self.draw_buttons(context, layout)
+        layout.prop(self, 'iterative')
+        layout.prop(self, 'n_workers')
+
     def sv_init(self, context):
         self.inputs.new('SvFilePathSocket', "FilePath")
         self.outputs.new('SvCurveSocket', "Curves")
 
-    def read_file(self):
+    def read_file(self, use_cache=True):
         path = self.inputs['FilePath'].sv_get()[0][0]
         curves = parse_svg(path,
                            ppi = self.svg_ppi,
                            concatenate_paths = self.concat_paths,
                            convert_coords = self.convert_coords,
-                           tolerance = self.tolerance)
+                           tolerance = self.tolerance,
+                           iterative = self.iterative,
+                           use_cache = use_cache,
+                           n_workers = self.n_workers)
         self.outputs['Curves'].sv_set(curves)
 
     def process(self):
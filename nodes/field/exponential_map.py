@@ -16,6 +16,9 @@ from sverchok.utils.curve.core import SvCurve
 from sverchok.utils.surface.core import SvSurface
 from sverchok.utils.geodesic import exponential_map, curve_exponential_map, BY_PARAMETER, BY_LENGTH
 
+from sverchok_extra.utils.geodesic import exponential_map_fan
+from sverchok_extra.utils.interpolated_field import SvExInterpolatedVectorField, LOCAL_RBF, LINEAR
+
 class SvExExponentialMapNode(SverchCustomTreeNode, bpy.types.Node):
     """
     Triggers: Geodesic Exponential Map
@@ -74,6 +77,32 @@ class SvExExponentialMapNode(SverchCustomTreeNode, bpy.types.Node):
         default = True,
         update = updateNode)
 
+    interpolation_modes = [
+            ('RBF', "Global RBF", "Thin plate RBF fitted to all points. Slow for big number of points", 0),
+            (LOCAL_RBF, "Local RBF", "Thin plate RBF fitted to nearest points only", 1),
+            (LINEAR, "Linear", "Barycentric interpolation on triangulation of points", 2)
+        ]
+
+    interpolation : EnumProperty(
+            name = "Interpolation",
+            description = "Interpolation method for Field and UVField outputs",
+            items = interpolation_modes,
+            default = 'RBF',
+            update = updateNode)
+
+    neighbors : IntProperty(
+            name = "Neighbors",
+            description = "Number of nearest points to use for local RBF interpolation",
+            default = 16,
+            min = 4,
+            update = updateNode)
+
+    vectorize : BoolProperty(
+        name = "Vectorize",
+        description = "Shoot all geodesics from the center as one vectorized system (polar mode only)",
+        default = False,
+        update = updateNode)
+
     u_steps : IntProperty(
             name = "U Steps",
             default = 50,
@@ -111,6 +140,11 @@ class SvExExponentialMapNode(SverchCustomTreeNode, bpy.types.Node):
         layout.prop(self, 'map_mode')
         if self.map_mode == 'CURVE':
             layout.prop(self, 'u_mode')
+        else:
+            layout.prop(self, 'vectorize')
+        layout.prop(self, 'interpolation')
+        if self.interpolation == LOCAL_RBF:
+            layout.prop(self, 'neighbors')
         layout.prop(self, 'join')
 
     def sv_init(self, context):
@@ -134,6 +168,27 @@ class SvExExponentialMapNode(SverchCustomTreeNode, bpy.types.Node):
         self.outputs.new('SvVerticesSocket', "OrigPoints")
         self.update_sockets(context)
 
+    def make_fields(self, exp_map):
+        # Fields are expensive to build, so do it only when they are needed
+        need_uv_field = self.outputs['UVField'].is_linked
+        need_field = self.outputs['Field'].is_linked
+        uv_field, field = None, None
+        if self.interpolation == 'RBF':
+            if need_uv_field:
+                uv_field = exp_map.get_uv_field(function='thin_plate')
+            if need_field:
+                field = exp_map.get_field(function='thin_plate')
+        else:
+            if need_uv_field:
+                uv_field = SvExInterpolatedVectorField(exp_map.orig_points, exp_map.uv_points,
+                                method = self.interpolation,
+                                neighbors = self.neighbors)
+            if need_field:
+                field = SvExInterpolatedVectorField(exp_map.orig_points, exp_map.surface_points,
+                                method = self.interpolation,
+                                neighbors = self.neighbors)
+        return uv_field, field
+
     def process(self):
         if not any(socket.is_linked for socket in self.outputs):
             return
@@ -184,7 +239,13 @@ class SvExExponentialMapNode(SverchCustomTreeNode, bpy.types.Node):
             new_uv_points = []
             new_orig_points = []
             for surface, center, curve, radius, r_steps, angle_steps, u_steps, resolution in zip_long_repeat(*params):
-                if self.map_mode == 'POLAR':
+                if self.map_mode == 'POLAR' and self.vectorize:
+                    exp_map = exponential_map_fan(surface, center, radius,
+                                              radius_steps = r_steps,
+                                              angle_steps = angle_steps,
+                                              closed_u = self.closed_u,
+                                              closed_v = self.closed_v)
+                elif self.map_mode == 'POLAR':
                     exp_map = exponential_map(surface, center, radius,
                                               radius_steps = r_steps,
                                               angle_steps = angle_steps,
@@ -199,8 +260,7 @@ class SvExExponentialMapNode(SverchCustomTreeNode, bpy.types.Node):
                                                     length_resolution = resolution,
                                                     closed_u = self.closed_u,
                                                     closed_v = self.closed_v)
-                uv_field = exp_map.get_uv_field(function='thin_plate')
-                field = exp_map.get_field(function='thin_plate')
+                uv_field, field = self.make_fields(exp_map)
                 new_uv_fields.append(uv_field)
                 new_fields.append(field)
                 new_points.append(exp_map.surface_points.tolist())
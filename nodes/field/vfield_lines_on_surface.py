@@ -14,33 +14,38 @@ from sverchok.dependencies import scipy
 if scipy is not None:
     from scipy.integrate import solve_ivp
 
-def solve_lines(surface, field, p0, max_t = None, step = None, iterations=None, method='RK45', rotate=False):
+# Methods which are supported by solve_lines_batch()
+BATCH_METHODS = {'EULER', 'RK4', 'RK45'}
 
-    def do_step(ps):
-        #print("P:", ps)
-        us = ps[0,:]
-        vs = ps[1,:]
+def uv_velocity(surface, field, us, vs, rotate=False):
+    """
+    Project vector field onto surface tangent directions.
+    Returns an array of shape (n, 2) with (du, dv) per point.
+    """
+    derivs = surface.derivatives_data_array(us, vs)
+    du = derivs.du
+    dv = derivs.dv
 
-        derivs = surface.derivatives_data_array(us, vs)
-        du = derivs.du
-        dv = derivs.dv
+    xs = derivs.points[:,0]
+    ys = derivs.points[:,1]
+    zs = derivs.points[:,2]
 
-        xs = derivs.points[:,0]
-        ys = derivs.points[:,1]
-        zs = derivs.points[:,2]
+    vxs, vys, vzs = field.evaluate_grid(xs,ys,zs)
+    vecs = np.stack((vxs, vys, vzs)).T
 
-        vxs, vys, vzs = field.evaluate_grid(xs,ys,zs)
-        vecs = np.stack((vxs, vys, vzs)).T
+    vec_u = (vecs * du).sum(axis=1)
+    vec_v = (vecs * dv).sum(axis=1)
 
-        vec_u = (vecs * du).sum(axis=1)
-        vec_v = (vecs * dv).sum(axis=1)
+    if rotate:
+        vec_u, vec_v = -vec_v, vec_u
 
-        if rotate:
-            vec_u, vec_v = -vec_v, vec_u
+    return np.stack((vec_u, vec_v), axis=1)
 
-        res = np.array([vec_u, vec_v])
-        #print("R:", res)
-        return res
+def solve_lines(surface, field, p0, max_t = None, step = None, iterations=None, method='RK45', rotate=False):
+
+    def do_step(ps):
+        #print("P:", ps)
+        return uv_velocity(surface, field, ps[0,:], ps[1,:], rotate=rotate).T
 
     def f(t, ps):
         return do_step(ps)
@@ -59,15 +64,155 @@ def solve_lines(surface, field, p0, max_t = None, step = None, iterations=None,
 
     if method == 'EULER':
         return solve_lines_euler()
+    if method == 'RK4':
+        return solve_lines_batch(surface, field, np.array([p0]),
+                    step = step, iterations = iterations,
+                    method = method, rotate = rotate)[0]
 
     res = solve_ivp(f, (0, max_t), p0, method=method, vectorized=True)
 
     if not res.success:
         raise Exception("Can't solve the equation: " + res.message)
-    result = rs.y.T
+    result = res.y.T
     #print("R", result.shape)
     return result
 
+# Dormand-Prince 5(4) coefficients, the same which are used by
+# scipy.integrate.RK45.
+DP_C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1])
+DP_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656]
+]
+DP_B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84])
+DP_E = np.array([-71/57600, 0, 71/16695, -71/1920, 17253/339200, -22/525, 1/40])
+
+def solve_lines_batch(surface, field, p0s, max_t = None, step = None, iterations = None,
+        method = 'EULER', rotate = False,
+        tolerance = 1e-4, stall_tolerance = 1e-8, max_steps = 10000):
+    """
+    Integrate field lines for many start points at once.
+
+    All start points are advanced together, so each integration step costs
+    a fixed number of calls to surface.derivatives_data_array() and
+    field.evaluate_grid(), independent of the number of start points.
+    Lines which leave the surface domain, or which stall (the step in UV
+    space becomes shorter than stall_tolerance), are dropped from the
+    active set.
+
+    Supported methods:
+    * EULER, RK4: fixed step size `step`, at most `iterations` steps.
+    * RK45: adaptive Dormand-Prince 5(4) method with per-line step size
+      control, integrating from 0 to `max_t`; `step` is used as initial step
+      size, if provided.
+
+    Returns a list of np.arrays of shape (k_i, 2) - UV points of each line.
+    """
+    p0s = np.asarray(p0s, dtype=np.float64)[:, :2]
+    n = len(p0s)
+
+    u_min, u_max = surface.get_u_min(), surface.get_u_max()
+    v_min, v_max = surface.get_v_min(), surface.get_v_max()
+
+    def inside(ps):
+        us, vs = ps[:,0], ps[:,1]
+        return (us >= u_min) & (us <= u_max) & (vs >= v_min) & (vs <= v_max)
+
+    def velocity(ps):
+        return uv_velocity(surface, field, ps[:,0], ps[:,1], rotate=rotate)
+
+    if method in {'EULER', 'RK4'}:
+        capacity = iterations + 1
+    elif method == 'RK45':
+        capacity = 64
+    else:
+        raise Exception(f"Unsupported method for batch integration: {method}")
+
+    result = np.empty((capacity, n, 2))
+    result[0] = p0s
+    counts = np.ones(n, dtype=np.int64)
+    active = np.flatnonzero(inside(p0s))
+
+    def record(idxs, new_ps, deltas):
+        nonlocal result, active
+        ok = inside(new_ps) & (np.linalg.norm(deltas, axis=1) >= stall_tolerance)
+        idxs, new_ps = idxs[ok], new_ps[ok]
+        capacity = len(result)
+        if len(idxs) and counts[idxs].max() >= capacity:
+            grown = np.empty((2*capacity, n, 2))
+            grown[:capacity] = result
+            result = grown
+        result[counts[idxs], idxs] = new_ps
+        counts[idxs] += 1
+        return ok
+
+    if method in {'EULER', 'RK4'}:
+        for i in range(iterations):
+            if len(active) == 0:
+                break
+            ps = result[counts[active]-1, active]
+            if method == 'EULER':
+                deltas = step * velocity(ps)
+            else:
+                k1 = velocity(ps)
+                k2 = velocity(ps + 0.5*step*k1)
+                k3 = velocity(ps + 0.5*step*k2)
+                k4 = velocity(ps + step*k3)
+                deltas = (step / 6.0) * (k1 + 2*k2 + 2*k3 + k4)
+            ok = record(active, ps + deltas, deltas)
+            active = active[ok]
+    else:
+        ts = np.zeros(n)
+        if step is None:
+            step = max_t / 100.0
+        hs = np.full(n, step)
+        min_step = max_t * 1e-6
+        # Derivative at the start of the current step (FSAL)
+        fs = np.zeros((n, 2))
+        fs[active] = velocity(p0s[active])
+        for i in range(max_steps):
+            if len(active) == 0:
+                break
+            ps = result[counts[active]-1, active]
+            h = np.minimum(hs[active], max_t - ts[active])[:, np.newaxis]
+            ks = [fs[active]]
+            for s in range(1, 6):
+                dy = sum(a * k for a, k in zip(DP_A[s], ks))
+                ks.append(velocity(ps + h * dy))
+            deltas = h * sum(b * k for b, k in zip(DP_B, ks))
+            new_ps = ps + deltas
+            ks.append(velocity(new_ps))
+            err = h * sum(e * k for e, k in zip(DP_E, ks))
+            scale = tolerance * (1.0 + np.maximum(abs(ps), abs(new_ps)))
+            err_norm = np.sqrt(((err / scale)**2).mean(axis=1))
+
+            accepted = err_norm <= 1.0
+            with np.errstate(divide='ignore'):
+                factor = 0.9 * err_norm ** (-0.2)
+            factor = np.where(accepted, np.clip(factor, 0.2, 10.0), np.clip(factor, 0.2, 1.0))
+            # Approach the domain boundary with smaller steps instead of
+            # dropping the line at the first step which jumps outside.
+            retry = accepted & ~inside(new_ps) & (h[:,0] > min_step)
+            accepted &= ~retry
+            factor[retry] = 0.5
+            hs[active] = h[:,0] * factor
+
+            acc_idxs = active[accepted]
+            ts[acc_idxs] += h[accepted,0]
+            fs[acc_idxs] = ks[-1][accepted]
+            ok = record(acc_idxs, new_ps[accepted], deltas[accepted])
+
+            stopped = np.zeros(len(active), dtype=bool)
+            stopped[accepted] = ~ok
+            finished = ts[active] >= max_t * (1 - 1e-12)
+            active = active[~(stopped | finished)]
+
+    return [result[:counts[i], i] for i in range(n)]
+
 class SvExVFieldLinesOnSurfNode(SverchCustomTreeNode, bpy.types.Node):
     """
     Triggers: Vector Field lines on Surface
@@ -79,9 +224,10 @@ class SvExVFieldLinesOnSurfNode(SverchCustomTreeNode, bpy.types.Node):
     sv_dependencies = {'scipy'}
 
     def update_sockets(self, context):
-        self.inputs['MaxT'].hide_safe = self.method == 'EULER'
-        self.inputs['Step'].hide_safe = self.method != 'EULER'
-        self.inputs['Iterations'].hide_safe = self.method != 'EULER'
+        fixed_step = self.method in {'EULER', 'RK4'}
+        self.inputs['MaxT'].hide_safe = fixed_step
+        self.inputs['Step'].hide_safe = not fixed_step
+        self.inputs['Iterations'].hide_safe = not fixed_step
         updateNode(self, context)
 
     methods = [
@@ -91,7 +237,8 @@ class SvExVFieldLinesOnSurfNode(SverchCustomTreeNode, bpy.types.Node):
         ('DOP853', "Runge-Kutta 8(7)", "Runge-Kutta 8(7)", 3),
         ('Radau', "Implicit Runge-Kutta", "Implicit Runge-Kutta - Radau IIA 5", 4),
         ('BDF', "Backward differentiation", "Implicit multi-step variable-order (1 to 5) method based on a backward differentiation formula for the derivative approximation", 5),
-        ('LSODA', "Adams / BDF", "Adams/BDF method with automatic stiffness detection and switching", 6)
+        ('LSODA', "Adams / BDF", "Adams/BDF method with automatic stiffness detection and switching", 6),
+        ('RK4', "Runge-Kutta 4", "Classic Runge-Kutta 4 method with fixed step", 7)
     ]
 
     method : EnumProperty(
@@ -122,9 +269,27 @@ class SvExVFieldLinesOnSurfNode(SverchCustomTreeNode, bpy.types.Node):
         default = 100,
         update = updateNode)
 
+    vectorize : BoolProperty(
+        name = "Vectorize",
+        description = "Integrate lines from all start points at once. Supported for Euler, Runge-Kutta 4 and Runge-Kutta 5(4) methods",
+        default = False,
+        update = updateNode)
+
+    tolerance : FloatProperty(
+        name = "Tolerance",
+        description = "Relative tolerance for adaptive step size control in vectorized Runge-Kutta 5(4) mode",
+        min = 1e-12,
+        default = 1e-4,
+        precision = 8,
+        update = updateNode)
+
     def draw_buttons(self, context, layout):
         layout.prop(self, 'method')
         layout.prop(self, 'cograd')
+        if self.method in BATCH_METHODS:
+            layout.prop(self, 'vectorize')
+            if self.vectorize and self.method == 'RK45':
+                layout.prop(self, 'tolerance')
 
     def sv_init(self, context):
         self.inputs.new('SvVectorFieldSocket', 'Field')
@@ -154,6 +319,12 @@ class SvExVFieldLinesOnSurfNode(SverchCustomTreeNode, bpy.types.Node):
         step_s = ensure_nesting_level(step_s, 2)
         iterations_s = ensure_nesting_level(iterations_s, 2)
 
+        if self.vectorize and self.method in BATCH_METHODS:
+            verts_out, uv_out = self.process_batch(start_s, field_s, surface_s, maxt_s, step_s, iterations_s)
+            self.outputs['Vertices'].sv_set(verts_out)
+            self.outputs['UVPoints'].sv_set(uv_out)
+            return
+
         verts_out = []
         uv_out = []
         for params in zip_long_repeat(start_s, field_s, surface_s, maxt_s, step_s, iterations_s):
@@ -178,6 +349,46 @@ class SvExVFieldLinesOnSurfNode(SverchCustomTreeNode, bpy.types.Node):
         self.outputs['Vertices'].sv_set(verts_out)
         self.outputs['UVPoints'].sv_set(uv_out)
 
+    def process_batch(self, start_s, field_s, surface_s, maxt_s, step_s, iterations_s):
+        verts_out = []
+        uv_out = []
+        for params in zip_long_repeat(start_s, field_s, surface_s, maxt_s, step_s, iterations_s):
+            # Group start points which share the same field, surface and
+            # integration parameters, so that each group is integrated by
+            # one call of solve_lines_batch().
+            groups = dict()
+            items = list(zip_long_repeat(*params))
+            for i, (start, field, surface, max_t, step, iterations) in enumerate(items):
+                key = (id(field), id(surface), max_t, step, iterations)
+                groups.setdefault(key, []).append(i)
+
+            lines = [None] * len(items)
+            for idxs in groups.values():
+                _, field, surface, max_t, step, iterations = items[idxs[0]]
+                starts = np.array([items[i][0] for i in idxs])
+                uvs = solve_lines_batch(surface, field, starts,
+                            max_t = max_t,
+                            step = step,
+                            iterations = iterations,
+                            method = self.method,
+                            rotate = self.cograd,
+                            tolerance = self.tolerance)
+                self.debug(f"Group of {len(idxs)} start points => {sum(len(line) for line in uvs)} points")
+
+                all_uvs = np.concatenate(uvs)
+                all_verts = surface.evaluate_array(all_uvs[:,0], all_uvs[:,1])
+                splits = np.cumsum([len(line) for line in uvs])[:-1]
+                for i, line_uvs, line_verts in zip(idxs, uvs, np.split(all_verts, splits)):
+                    new_uvs = np.zeros((len(line_uvs), 3))
+                    new_uvs[:,:2] = line_uvs
+                    lines[i] = (line_verts.tolist(), new_uvs.tolist())
+
+            for new_verts, new_uvs in lines:
+                verts_out.append(new_verts)
+                uv_out.append(new_uvs)
+
+        return verts_out, uv_out
+
 def register():
     bpy.utils.register_class(SvExVFieldLinesOnSurfNode)
 
@@ -70,12 +70,15 @@ class SvExSdfBooleanNode(SverchCustomTreeNode, bpy.types.Node):
 
         if not sdfs:
             return sdfs
-
-        result = sdfs[0]
-        for sdf in sdfs[1:]:
-            result = op(result, sdf, k=k)
-
-        return result
+        if len(sdfs) == 1:
+            return sdfs[0]
+
+        # sdf operations accept any number of arguments. One call evaluates
+        # all fields in a single loop, instead of a chain of N nested
+        # functions (which is also limited by Python recursion depth).
+        # For difference, this is the same as subtracting the union of
+        # sdfs[1:] from sdfs[0].
+        return op(sdfs[0], *sdfs[1:], k=k)
 
     def process(self):
         if not any(socket.is_linked for socket in self.outputs):
@@ -5,6 +5,7 @@ from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty, Fl
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level, get_data_nesting_level
 from sverchok_extra.dependencies import shapely
+from sverchok_extra.utils.shapely import vectorize_nested, nested_geometries
 
 class SvExShapelyAreaNode(SverchCustomTreeNode, bpy.types.Node):
     """
@@ -25,21 +26,10 @@ class SvExShapelyAreaNode(SverchCustomTreeNode, bpy.types.Node):
         if not any(socket.is_linked for socket in self.outputs):
             return
 
-        geometry_s = self.inputs['Geometry'].sv_get()
-        input_level = get_data_nesting_level(geometry_s, data_types=(shapely.Geometry,))
-        flat_output = input_level == 1
-        geometry_s = ensure_nesting_level(geometry_s, 2, data_types=(shapely.Geometry,))
-
-        area_out = []
-        for params in geometry_s:
-            new_area = []
-            for geometry in params:
-                area = geometry.area
-                new_area.append(area)
-            if flat_output:
-                area_out.extend(new_area)
-            else:
-                area_out.append(new_area)
+        geometry_s = self.inputs['Geometry'].sv_get(packed=True)
+        geometry_s, flat_output = nested_geometries(geometry_s)
+
+        area_out = vectorize_nested(shapely.area, [geometry_s], flat_output)
 
         self.outputs['Area'].sv_set(area_out)
 
@@ -5,6 +5,7 @@ from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty, Fl
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level, get_data_nesting_level
 from sverchok_extra.dependencies import shapely
+from sverchok_extra.utils.shapely import vectorize_nested, query_pairs, as_ufunc_arg, difference_all
 
 class SvExShapelyBooleanNode(SverchCustomTreeNode, bpy.types.Node):
     """
@@ -30,26 +31,95 @@ class SvExShapelyBooleanNode(SverchCustomTreeNode, bpy.types.Node):
             default = 'UNION',
             update = updateNode)
 
+    predicates = [
+            ('INTERSECTS', "Intersects", "Geometries intersect", 0),
+            ('OVERLAPS', "Overlaps", "Geometries overlap", 1),
+            ('TOUCHES', "Touches", "Geometries touch", 2),
+            ('CROSSES', "Crosses", "Geometries cross", 3),
+            ('CONTAINS', "Contains", "Geometry 1 contains Geometry 2", 4),
+            ('WITHIN', "Within", "Geometry 1 is within Geometry 2", 5),
+            ('COVERS', "Covers", "Geometry 1 covers Geometry 2", 6),
+            ('COVERED_BY', "Covered By", "Geometry 1 is covered by Geometry 2", 7)
+        ]
+
+    predicate : EnumProperty(
+            name = "Predicate",
+            description = "Condition for pairs of geometries to be processed",
+            items = predicates,
+            default = 'INTERSECTS',
+            update = updateNode)
+
     def update_sockets(self, context):
         self.inputs['Geometry1'].hide_safe = self.accumulate_nested
         self.inputs['Geometry2'].hide_safe = self.accumulate_nested
         self.inputs['Geometries'].hide_safe = not self.accumulate_nested
+        pairs = self.pairwise and not self.accumulate_nested
+        # Nodes created with older versions do not have index outputs
+        if 'Index1' in self.outputs:
+            self.outputs['Index1'].hide_safe = not pairs
+        if 'Index2' in self.outputs:
+            self.outputs['Index2'].hide_safe = not pairs
 
     accumulate_nested : BoolProperty(
             name = "Accumulate Nested",
             default = False,
             update = update_sockets)
 
+    pairwise : BoolProperty(
+            name = "Pairwise",
+            description = "Process each geometry of Geometry1 list with all geometries of Geometry2 list which satisfy the predicate, instead of matching lists item by item. Candidate pairs are found by spatial index",
+            default = False,
+            update = update_sockets)
+
+    union_first : BoolProperty(
+            name = "Union Subtrahends",
+            description = "Merge all subtracted geometries by one union, and then subtract the result at once. This is much faster than subtracting geometries one by one",
+            default = True,
+            update = updateNode)
+
+    skip_distant : BoolProperty(
+            name = "Skip Distant",
+            description = "Do not process subtracted geometries which do not intersect the first one; they are found by spatial index",
+            default = True,
+            update = updateNode)
+
     def sv_init(self, context):
         self.inputs.new('SvGeom2DSocket', "Geometry1")
         self.inputs.new('SvGeom2DSocket', "Geometry2")
         self.inputs.new('SvGeom2DSocket', "Geometries")
         self.outputs.new('SvGeom2DSocket', "Geometry")
+        self.outputs.new('SvStringsSocket', "Index1")
+        self.outputs.new('SvStringsSocket', "Index2")
         self.update_sockets(context)
 
     def draw_buttons(self, context, layout):
         layout.prop(self, 'operation')
         layout.prop(self, 'accumulate_nested')
+        if self.accumulate_nested and self.operation == 'DIFFERENCE':
+            layout.prop(self, 'union_first')
+            layout.prop(self, 'skip_distant')
+        if not self.accumulate_nested:
+            layout.prop(self, 'pairwise')
+            if self.pairwise:
+                layout.prop(self, 'predicate')
+
+    def process_pairs(self, func, geometry1_s, geometry2_s, flat_output):
+        geometry_out = []
+        index1_out = []
+        index2_out = []
+        for geometries1, geometries2 in zip_long_repeat(geometry1_s, geometry2_s):
+            # The index is built once per list and shared by all outputs
+            idxs1, idxs2 = query_pairs(geometries1, geometries2, predicate=self.predicate.lower())
+            geometries1 = as_ufunc_arg(geometries1)
+            geometries2 = as_ufunc_arg(geometries2)
+            new_geometry = func(geometries1[idxs1], geometries2[idxs2]).tolist()
+            if flat_output:
+                geometry_out.extend(new_geometry)
+            else:
+                geometry_out.append(new_geometry)
+            index1_out.append(idxs1.tolist())
+            index2_out.append(idxs2.tolist())
+        return geometry_out, index1_out, index2_out
 
     def process(self):
         if not any(socket.is_linked for socket in self.outputs):
@@ -63,22 +133,22 @@ class SvExShapelyBooleanNode(SverchCustomTreeNode, bpy.types.Node):
             flat_output = input_level == 1
             geometry1_s = ensure_nesting_level(geometry1_s, 2, data_types=(shapely.Geometry,))
             geometry2_s = ensure_nesting_level(geometry2_s, 2, data_types=(shapely.Geometry,))
-            for params in zip_long_repeat(geometry1_s, geometry2_s):
-                new_geometry = []
-                for geometry1, geometry2 in zip_long_repeat(*params):
-                    if self.operation == 'UNION':
-                        geometry = geometry1.union(geometry2)
-                    elif self.operation == 'INTERSECTION':
-                        geometry = geometry1.intersection(geometry2)
-                    elif self.operation == 'DIFFERENCE':
-                        geometry = geometry1.difference(geometry2)
-                    else:
-                        geometry = geometry1.symmetric_difference(geometry2)
-                    new_geometry.append(geometry)
-                if flat_output:
-                    geometry_out.extend(new_geometry)
-                else:
-                    geometry_out.append(new_geometry)
+            if self.operation == 'UNION':
+                func = shapely.union
+            elif self.operation == 'INTERSECTION':
+                func = shapely.intersection
+            elif self.operation == 'DIFFERENCE':
+                func = shapely.difference
+            else:
+                func = shapely.symmetric_difference
+            if self.pairwise:
+                geometry_out, index1_out, index2_out = self.process_pairs(func, geometry1_s, geometry2_s, flat_output)
+                if 'Index1' in self.outputs:
+                    self.outputs['Index1'].sv_set(index1_out)
+                if 'Index2' in self.outputs:
+                    self.outputs['Index2'].sv_set(index2_out)
+            else:
+                geometry_out = vectorize_nested(func, [geometry1_s, geometry2_s], flat_output)
         else:
             geometries_s = self.inputs['Geometries'].sv_get()
             input_level = get_data_nesting_level(geometries_s, data_types=(shapely.Geometry,))
@@ -92,9 +162,9 @@ class SvExShapelyBooleanNode(SverchCustomTreeNode, bpy.types.Node):
                     elif self.operation == 'INTERSECTION':
                         geometry = shapely.intersection_all(geometries)
                     elif self.operation == 'DIFFERENCE':
-                        geometry = geometries[0]
-                        for g in geometries[1:]:
-                            geometry = geometry.difference(g)
+                        geometry = difference_all(geometries,
+                                        union_first = self.union_first,
+                                        prefilter = self.skip_distant)
                     else:
                         geometry = shapely.symmetric_difference_all(geometries)
                     new_geometry.append(geometry)
@@ -4,6 +4,7 @@ from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty, Fl
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level, get_data_nesting_level
 from sverchok_extra.dependencies import shapely
+from sverchok_extra.utils.shapely import vectorize_nested, nested_geometries
 
 class SvExShapelyBufferNode(SverchCustomTreeNode, bpy.types.Node):
     """
@@ -83,31 +84,25 @@ class SvExShapelyBufferNode(SverchCustomTreeNode, bpy.types.Node):
         if not any(socket.is_linked for socket in self.outputs):
             return
 
-        geometry_s = self.inputs['Geometry'].sv_get()
-        input_level = get_data_nesting_level(geometry_s, data_types=(shapely.Geometry,))
-        flat_output = input_level == 1
-        geometry_s = ensure_nesting_level(geometry_s, 2, data_types=(shapely.Geometry,))
+        geometry_s = self.inputs['Geometry'].sv_get(packed=True)
+        geometry_s, flat_output = nested_geometries(geometry_s)
         distance_s = self.inputs['Distance'].sv_get()
         distance_s = ensure_nesting_level(distance_s, 2)
         quad_segs_s = self.inputs['QuadSegs'].sv_get()
         quad_segs_s = ensure_nesting_level(quad_segs_s, 2)
 
-        geometry_out = []
-        for params in zip_long_repeat(geometry_s, distance_s, quad_segs_s):
-            new_geometry = []
-            for geometry, distance, quad_segs in zip_long_repeat(*params):
-                if self.operation == 'ERODE':
-                    distance = -distance
-                g = shapely.buffer(geometry, distance,
+        sign = -1 if self.operation == 'ERODE' else 1
+
+        def buffer(geometry, distance, quad_segs):
+            return shapely.buffer(geometry, sign * distance,
                                     quad_segs = quad_segs,
                                     cap_style = self.cap_style,
                                     join_style = self.join_style,
                                     single_sided = self.single_sided)
-                new_geometry.append(g)
-            if flat_output:
-                geometry_out.extend(new_geometry)
-            else:
-                geometry_out.append(new_geometry)
+
+        # shapely.buffer accepts only scalar quad_segs
+        geometry_out = vectorize_nested(buffer, [geometry_s, distance_s, quad_segs_s], flat_output,
+                            scalar_params = (2,))
 
         self.outputs['Geometry'].sv_set(geometry_out)
 
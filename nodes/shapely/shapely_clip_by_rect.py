@@ -4,6 +4,7 @@ from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty, Fl
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level, get_data_nesting_level
 from sverchok_extra.dependencies import shapely
+from sverchok_extra.utils.shapely import vectorize_nested, nested_geometries
 
 class SvExShapelyClipByRectNode(SverchCustomTreeNode, bpy.types.Node):
     """
@@ -48,10 +49,8 @@ class SvExShapelyClipByRectNode(SverchCustomTreeNode, bpy.types.Node):
         if not any(socket.is_linked for socket in self.outputs):
             return
 
-        geometry_s = self.inputs['Geometry'].sv_get()
-        input_level = get_data_nesting_level(geometry_s, data_types=(shapely.Geometry,))
-        flat_output = input_level == 1
-        geometry_s = ensure_nesting_level(geometry_s, 2, data_types=(shapely.Geometry,))
+        geometry_s = self.inputs['Geometry'].sv_get(packed=True)
+        geometry_s, flat_output = nested_geometries(geometry_s)
 
         x_min_s = self.inputs['XMin'].sv_get()
         x_min_s = ensure_nesting_level(x_min_s, 2)
@@ -62,16 +61,12 @@ class SvExShapelyClipByRectNode(SverchCustomTreeNode, bpy.types.Node):
         y_max_s = self.inputs['YMax'].sv_get()
         y_max_s = ensure_nesting_level(y_max_s, 2)
 
-        geometry_out = []
-        for params in zip_long_repeat(geometry_s, x_min_s, x_max_s, y_min_s, y_max_s):
-            new_geometry = []
-            for geometry, x_min, x_max, y_min, y_max in zip_long_repeat(*params):
-                g = shapely.clip_by_rect(geometry, x_min, y_min, x_max, y_max)
-                new_geometry.append(g)
-            if flat_output:
-                geometry_out.extend(new_geometry)
-            else:
-                geometry_out.append(new_geometry)
+        def clip(geometry, x_min, x_max, y_min, y_max):
+            return shapely.clip_by_rect(geometry, x_min, y_min, x_max, y_max)
+
+        # shapely.clip_by_rect accepts only scalar bounds
+        geometry_out = vectorize_nested(clip, [geometry_s, x_min_s, x_max_s, y_min_s, y_max_s], flat_output,
+                            scalar_params = (1, 2, 3, 4))
 
         self.outputs['Geometry'].sv_set(geometry_out)
 
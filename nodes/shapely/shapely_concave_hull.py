@@ -4,6 +4,7 @@ from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty, Fl
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level, get_data_nesting_level
 from sverchok_extra.dependencies import shapely
+from sverchok_extra.utils.shapely import vectorize_nested, nested_geometries
 
 class SvExShapelyConcaveHullNode(SverchCustomTreeNode, bpy.types.Node):
     """
@@ -39,25 +40,19 @@ class SvExShapelyConcaveHullNode(SverchCustomTreeNode, bpy.types.Node):
         if not any(socket.is_linked for socket in self.outputs):
             return
 
-        geometry_s = self.inputs['Geometry'].sv_get()
-        input_level = get_data_nesting_level(geometry_s, data_types=(shapely.Geometry,))
-        flat_output = input_level == 1
-        geometry_s = ensure_nesting_level(geometry_s, 2, data_types=(shapely.Geometry,))
+        geometry_s = self.inputs['Geometry'].sv_get(packed=True)
+        geometry_s, flat_output = nested_geometries(geometry_s)
         ratio_s = self.inputs['Ratio'].sv_get()
         ratio_s = ensure_nesting_level(ratio_s, 2)
 
-        geometry_out = []
-        for params in zip_long_repeat(geometry_s, ratio_s):
-            new_geometry = []
-            for geometry, ratio in zip_long_repeat(*params):
-                g = shapely.concave_hull(geometry,
-                                         ratio = ratio,
-                                         allow_holes = self.allow_holes)
-                new_geometry.append(g)
-            if flat_output:
-                geometry_out.extend(new_geometry)
-            else:
-                geometry_out.append(new_geometry)
+        def concave_hull(geometry, ratio):
+            return shapely.concave_hull(geometry,
+                                        ratio = ratio,
+                                        allow_holes = self.allow_holes)
+
+        # shapely.concave_hull accepts only scalar ratio
+        geometry_out = vectorize_nested(concave_hull, [geometry_s, ratio_s], flat_output,
+                            scalar_params = (1,))
 
         self.outputs['Geometry'].sv_set(geometry_out)
 
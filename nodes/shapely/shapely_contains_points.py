@@ -0,0 +1,94 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+import numpy as np
+
+import bpy
+from bpy.props import BoolProperty
+
+from sverchok.node_tree import SverchCustomTreeNode
+from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level, get_data_nesting_level
+from sverchok_extra.dependencies import shapely
+from sverchok_extra.utils.shapely import points_in_geometries
+
+class SvExShapelyContainsPointsNode(SverchCustomTreeNode, bpy.types.Node):
+    """
+    Triggers: 2D Points Inside Region
+    Tooltip: Check which points lie inside 2D geometries
+    """
+    bl_idname = "SvExShapelyContainsPointsNode"
+    bl_label = "2D Points Inside"
+    bl_icon = 'OUTLINER_OB_EMPTY'
+    sv_dependencies = {'shapely'}
+
+    include_boundary : BoolProperty(
+            name = "Include Boundary",
+            description = "Count points lying exactly on geometry boundary as inside",
+            default = False,
+            update = updateNode)
+
+    def sv_init(self, context):
+        self.inputs.new('SvVerticesSocket', "Vertices")
+        self.inputs.new('SvGeom2DSocket', "Geometry")
+        self.outputs.new('SvStringsSocket', "Mask")
+        self.outputs.new('SvStringsSocket', "Index")
+        self.outputs.new('SvVerticesSocket', "Inside")
+        self.outputs.new('SvVerticesSocket', "Outside")
+
+    def draw_buttons(self, context, layout):
+        layout.prop(self, 'include_boundary')
+
+    def process(self):
+        if not any(socket.is_linked for socket in self.outputs):
+            return
+
+        verts_s = self.inputs['Vertices'].sv_get()
+        input_level = get_data_nesting_level(verts_s)
+        nested_output = input_level > 3
+        verts_s = ensure_nesting_level(verts_s, 4)
+        geometry_s = self.inputs['Geometry'].sv_get()
+        geometry_s = ensure_nesting_level(geometry_s, 2, data_types=(shapely.Geometry,))
+
+        mask_out = []
+        index_out = []
+        inside_out = []
+        outside_out = []
+        for params in zip_long_repeat(verts_s, geometry_s):
+            new_mask = []
+            new_index = []
+            new_inside = []
+            new_outside = []
+            all_verts, geometries = params
+            for verts in all_verts:
+                verts = np.asarray(verts)
+                mask, idxs = points_in_geometries(geometries, verts, boundary = self.include_boundary)
+                new_mask.append(mask.tolist())
+                new_index.append(idxs.tolist())
+                new_inside.append(verts[mask].tolist())
+                new_outside.append(verts[~mask].tolist())
+            if nested_output:
+                mask_out.append(new_mask)
+                index_out.append(new_index)
+                inside_out.append(new_inside)
+                outside_out.append(new_outside)
+            else:
+                mask_out.extend(new_mask)
+                index_out.extend(new_index)
+                inside_out.extend(new_inside)
+                outside_out.extend(new_outside)
+
+        self.outputs['Mask'].sv_set(mask_out)
+        self.outputs['Index'].sv_set(index_out)
+        self.outputs['Inside'].sv_set(inside_out)
+        self.outputs['Outside'].sv_set(outside_out)
+
+def register():
+    bpy.utils.register_class(SvExShapelyContainsPointsNode)
+
+def unregister():
+    bpy.utils.unregister_class(SvExShapelyContainsPointsNode)
+
@@ -4,6 +4,7 @@ from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty, Fl
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level, get_data_nesting_level
 from sverchok_extra.dependencies import shapely
+from sverchok_extra.utils.shapely import vectorize_nested, nested_geometries
 
 class SvExShapelyConvexHullNode(SverchCustomTreeNode, bpy.types.Node):
     """
@@ -24,21 +25,10 @@ class SvExShapelyConvexHullNode(SverchCustomTreeNode, bpy.types.Node):
         if not any(socket.is_linked for socket in self.outputs):
             return
 
-        geometry_s = self.inputs['Geometry'].sv_get()
-        input_level = get_data_nesting_level(geometry_s, data_types=(shapely.Geometry,))
-        flat_output = input_level == 1
-        geometry_s = ensure_nesting_level(geometry_s, 2, data_types=(shapely.Geometry,))
-
-        geometry_out = []
-        for params in geometry_s:
-            new_geometry = []
-            for geometry in params:
-                g = shapely.convex_hull(geometry)
-                new_geometry.append(g)
-            if flat_output:
-                geometry_out.extend(new_geometry)
-            else:
-                geometry_out.append(new_geometry)
+        geometry_s = self.inputs['Geometry'].sv_get(packed=True)
+        geometry_s, flat_output = nested_geometries(geometry_s)
+
+        geometry_out = vectorize_nested(shapely.convex_hull, [geometry_s], flat_output)
 
         self.outputs['Geometry'].sv_set(geometry_out)
 
@@ -4,6 +4,7 @@ from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty, Fl
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import ensure_nesting_level, get_data_nesting_level, zip_long_repeat, updateNode
 from sverchok_extra.dependencies import shapely
+from sverchok_extra.utils.shapely import vectorize_nested, query_pairs, as_ufunc_arg
 
 class SvExShapelyDistanceNode(SverchCustomTreeNode, bpy.types.Node):
     """
@@ -23,6 +24,13 @@ class SvExShapelyDistanceNode(SverchCustomTreeNode, bpy.types.Node):
         ]
     def update_sockets(self, context):
         self.inputs['Density'].hide_safe = self.metric == 'CARTESIAN' or not self.specify_density
+        # Nodes created with older versions do not have pairwise sockets
+        if 'MaxDistance' in self.inputs:
+            self.inputs['MaxDistance'].hide_safe = not self.pairwise
+        if 'Index1' in self.outputs:
+            self.outputs['Index1'].hide_safe = not self.pairwise
+        if 'Index2' in self.outputs:
+            self.outputs['Index2'].hide_safe = not self.pairwise
 
     metric : EnumProperty(
             name = "Metric",
@@ -41,17 +49,74 @@ class SvExShapelyDistanceNode(SverchCustomTreeNode, bpy.types.Node):
             default = 0.0,
             update = updateNode)
 
+    pairwise : BoolProperty(
+            name = "Pairwise",
+            description = "Output distances between each geometry of Geometry1 list and all geometries of Geometry2 list which are not farther than Max Distance, instead of matching lists item by item. Candidate pairs are found by spatial index",
+            default = False,
+            update = update_sockets)
+
+    max_distance : FloatProperty(
+            name = "Max Distance",
+            min = 0.0,
+            default = 1.0,
+            update = updateNode)
+
     def sv_init(self, context):
         self.inputs.new('SvGeom2DSocket', "Geometry1")
         self.inputs.new('SvGeom2DSocket', "Geometry2")
         self.inputs.new('SvStringsSocket', "Density").prop_name = 'density'
+        self.inputs.new('SvStringsSocket', "MaxDistance").prop_name = 'max_distance'
         self.outputs.new('SvStringsSocket', "Distance")
+        self.outputs.new('SvStringsSocket', "Index1")
+        self.outputs.new('SvStringsSocket', "Index2")
         self.update_sockets(context)
 
     def draw_buttons(self, context, layout):
         layout.prop(self, 'metric')
         if self.metric != 'CARTESIAN':
             layout.prop(self, 'specify_density')
+        layout.prop(self, 'pairwise')
+
+    def get_function(self):
+        if self.metric == 'CARTESIAN':
+            return lambda g1, g2, density: shapely.distance(g1, g2)
+        if self.metric == 'HAUSDORFF':
+            func = shapely.hausdorff_distance
+        else:
+            func = shapely.frechet_distance
+        if self.specify_density:
+            return lambda g1, g2, density: func(g1, g2, densify = density)
+        else:
+            return lambda g1, g2, density: func(g1, g2)
+
+    def process_pairs(self, geometry1_s, geometry2_s, density_s, flat_output):
+        func = self.get_function()
+        if 'MaxDistance' in self.inputs:
+            max_distance_s = self.inputs['MaxDistance'].sv_get()
+        else:
+            max_distance_s = [[self.max_distance]]
+        max_distance_s = ensure_nesting_level(max_distance_s, 2)
+        distance_out = []
+        index1_out = []
+        index2_out = []
+        for geometries1, geometries2, densities, max_distances in zip_long_repeat(geometry1_s, geometry2_s, density_s, max_distance_s):
+            max_distance = max_distances[0]
+            # Hausdorff and Frechet distances are not less than cartesian
+            # distance, so the same candidates are valid for all metrics
+            idxs1, idxs2 = query_pairs(geometries1, geometries2, distance=max_distance)
+            geometries1 = as_ufunc_arg(geometries1)
+            geometries2 = as_ufunc_arg(geometries2)
+            distances = func(geometries1[idxs1], geometries2[idxs2], densities[0])
+            if self.metric != 'CARTESIAN':
+                good = distances <= max_distance
+                distances, idxs1, idxs2 = distances[good], idxs1[good], idxs2[good]
+            if flat_output:
+                distance_out.extend(distances.tolist())
+            else:
+                distance_out.append(distances.tolist())
+            index1_out.append(idxs1.tolist())
+            index2_out.append(idxs2.tolist())
+        return distance_out, index1_out, index2_out
 
     def process(self):
         if not any(socket.is_linked for socket in self.outputs):
@@ -63,29 +128,28 @@ class SvExShapelyDistanceNode(SverchCustomTreeNode, bpy.types.Node):
         flat_output = input_level == 1
         geometry1_s = ensure_nesting_level(geometry1_s, 2, data_types=(shapely.Geometry,))
         geometry2_s = ensure_nesting_level(geometry2_s, 2, data_types=(shapely.Geometry,))
-        if self.specify_density:
+        if self.pairwise:
             density_s = self.inputs['Density'].sv_get()
             density_s = ensure_nesting_level(density_s, 2)
+            distance_out, index1_out, index2_out = self.process_pairs(geometry1_s, geometry2_s, density_s, flat_output)
+            if 'Index1' in self.outputs:
+                self.outputs['Index1'].sv_set(index1_out)
+            if 'Index2' in self.outputs:
+                self.outputs['Index2'].sv_set(index2_out)
+        elif self.metric == 'CARTESIAN':
+            distance_out = vectorize_nested(shapely.distance, [geometry1_s, geometry2_s], flat_output)
         else:
-            density_s = [[None]]
-
-        distance_out = []
-        for params in zip_long_repeat(geometry1_s, geometry2_s, density_s):
-            new_distances = []
-            for geometry1, geometry2, density in zip_long_repeat(*params):
-                if self.metric == 'CARTESIAN':
-                    distance = shapely.distance(geometry1, geometry2)
-                elif self.metric == 'HAUSDORFF':
-                    distance = shapely.hausdorff_distance(geometry1, geometry2,
-                                                          densify = density)
-                else:
-                    distance = shapely.frechet_distance(geometry1, geometry2,
-                                                          densify = density)
-                new_distances.append(distance)
-            if flat_output:
-                distance_out.extend(new_distances)
+            if self.metric == 'HAUSDORFF':
+                func = shapely.hausdorff_distance
+            else:
+                func = shapely.frechet_distance
+            if self.specify_density:
+                density_s = self.inputs['Density'].sv_get()
+                density_s = ensure_nesting_level(density_s, 2)
+                distance_out = vectorize_nested(lambda g1, g2, density: func(g1, g2, densify = density),
+                                    [geometry1_s, geometry2_s, density_s], flat_output)
             else:
-                distance_out.append(new_distances)
+                distance_out = vectorize_nested(func, [geometry1_s, geometry2_s], flat_output)
 
         self.outputs['Distance'].sv_set(distance_out)
 
@@ -3,6 +3,7 @@ import bpy
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import ensure_nesting_level, get_data_nesting_level
 from sverchok_extra.dependencies import shapely
+from sverchok_extra.utils.shapely import vectorize_nested, nested_geometries
 
 class SvExShapelyLengthNode(SverchCustomTreeNode, bpy.types.Node):
     """
@@ -23,21 +24,10 @@ class SvExShapelyLengthNode(SverchCustomTreeNode, bpy.types.Node):
         if not any(socket.is_linked for socket in self.outputs):
             return
 
-        geometry_s = self.inputs['Geometry'].sv_get()
-        input_level = get_data_nesting_level(geometry_s, data_types=(shapely.Geometry,))
-        flat_output = input_level == 1
-        geometry_s = ensure_nesting_level(geometry_s, 2, data_types=(shapely.Geometry,))
-
-        length_out = []
-        for params in geometry_s:
-            new_length = []
-            for geometry in params:
-                length = shapely.length(geometry)
-                new_length.append(length)
-            if flat_output:
-                length_out.extend(new_length)
-            else:
-                length_out.append(new_length)
+        geometry_s = self.inputs['Geometry'].sv_get(packed=True)
+        geometry_s, flat_output = nested_geometries(geometry_s)
+
+        length_out = vectorize_nested(shapely.length, [geometry_s], flat_output)
 
         self.outputs['Length'].sv_set(length_out)
 
@@ -1,10 +1,12 @@
+import numpy as np
+
 import bpy
 from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty, FloatVectorProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level, get_data_nesting_level
-from sverchok.utils.geom import circle_approximation_2d
 from sverchok_extra.dependencies import shapely
+from sverchok_extra.utils.shapely import broadcast_nested, unflatten_nested, as_ufunc_arg
 
 class SvExShapelyMinBoundingCircleNode(SverchCustomTreeNode, bpy.types.Node):
     """
@@ -32,29 +34,18 @@ class SvExShapelyMinBoundingCircleNode(SverchCustomTreeNode, bpy.types.Node):
         flat_output = input_level == 1
         geometry_s = ensure_nesting_level(geometry_s, 2, data_types=(shapely.Geometry,))
 
-        geometry_out = []
-        center_out = []
-        radius_out = []
-        for params in geometry_s:
-            new_geometry = []
-            new_center = []
-            new_radius = []
-            for geometry in params:
-                g = shapely.minimum_bounding_circle(geometry)
-                coords = shapely.get_coordinates(g)
-                circle = circle_approximation_2d(coords)
-                center = tuple(circle.center) + (0.0, )
-                new_geometry.append(g)
-                new_center.append(center)
-                new_radius.append(circle.radius)
-            if flat_output:
-                geometry_out.extend(new_geometry)
-                center_out.extend(new_center)
-                radius_out.extend(new_radius)
-            else:
-                center_out.append(new_center)
-                radius_out.append(new_radius)
-                geometry_out.append(new_geometry)
+        (geometries,), lengths = broadcast_nested(geometry_s)
+        geometries = as_ufunc_arg(geometries)
+        circles = shapely.minimum_bounding_circle(geometries)
+        # Centroid of the regular polygon approximating the circle is the
+        # center of the circle
+        centroids = shapely.centroid(circles)
+        centers = np.stack([shapely.get_x(centroids), shapely.get_y(centroids), np.zeros((len(centroids),))], axis=1)
+        radiuses = shapely.minimum_bounding_radius(geometries)
+
+        geometry_out = unflatten_nested(circles, lengths, flat_output)
+        center_out = unflatten_nested(centers, lengths, flat_output)
+        radius_out = unflatten_nested(radiuses, lengths, flat_output)
 
         self.outputs['Geometry'].sv_set(geometry_out)
         self.outputs['Center'].sv_set(center_out)
@@ -4,6 +4,7 @@ from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty, Fl
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level, get_data_nesting_level
 from sverchok_extra.dependencies import shapely
+from sverchok_extra.utils.shapely import vectorize_nested, nested_geometries
 
 class SvExShapelyOffsetNode(SverchCustomTreeNode, bpy.types.Node):
     """
@@ -52,27 +53,21 @@ class SvExShapelyOffsetNode(SverchCustomTreeNode, bpy.types.Node):
         if not any(socket.is_linked for socket in self.outputs):
             return
 
-        geometry_s = self.inputs['Geometry'].sv_get()
-        input_level = get_data_nesting_level(geometry_s, data_types=(shapely.Geometry,))
-        flat_output = input_level == 1
-        geometry_s = ensure_nesting_level(geometry_s, 2, data_types=(shapely.Geometry,))
+        geometry_s = self.inputs['Geometry'].sv_get(packed=True)
+        geometry_s, flat_output = nested_geometries(geometry_s)
         distance_s = self.inputs['Distance'].sv_get()
         distance_s = ensure_nesting_level(distance_s, 2)
         quad_segs_s = self.inputs['QuadSegs'].sv_get()
         quad_segs_s = ensure_nesting_level(quad_segs_s, 2)
 
-        geometry_out = []
-        for params in zip_long_repeat(geometry_s, distance_s, quad_segs_s):
-            new_geometry = []
-            for geometry, distance, quad_segs in zip_long_repeat(*params):
-                g = shapely.offset_curve(geometry, distance,
+        def offset(geometry, distance, quad_segs):
+            return shapely.offset_curve(geometry, distance,
                                         quad_segs = quad_segs,
                                         join_style = self.join_style)
-                new_geometry.append(g)
-            if flat_output:
-                geometry_out.extend(new_geometry)
-            else:
-                geometry_out.append(new_geometry)
+
+        # shapely.offset_curve accepts only scalar quad_segs
+        geometry_out = vectorize_nested(offset, [geometry_s, distance_s, quad_segs_s], flat_output,
+                            scalar_params = (2,))
 
         self.outputs['Geometry'].sv_set(geometry_out)
 
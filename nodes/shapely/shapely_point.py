@@ -12,6 +12,7 @@ from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty, Fl
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level
 from sverchok_extra.dependencies import shapely
+from sverchok_extra.utils.shapely import geometries_from_lists
 
 class SvExShapelyPointNode(SverchCustomTreeNode, bpy.types.Node):
     """
@@ -34,15 +35,13 @@ class SvExShapelyPointNode(SverchCustomTreeNode, bpy.types.Node):
         verts_s = self.inputs['Vertices'].sv_get()
         verts_s = ensure_nesting_level(verts_s, 3)
 
-        polygons_out = []
-        for verts in verts_s:
-            if len(verts) == 1:
-                polygon = shapely.Point(verts[0])
-            else:
-                polygon = shapely.MultiPoint(verts)
-            polygons_out.append(polygon)
+        polygons_out = geometries_from_lists(shapely.multipoints, verts_s, shapely.MultiPoint)
+        # Single vertices give Points, not MultiPoints
+        singles = [i for i, verts in enumerate(verts_s) if len(verts) == 1]
+        if singles:
+            polygons_out[singles] = shapely.points([verts_s[i][0] for i in singles])
 
-        self.outputs['Geometry'].sv_set(polygons_out)
+        self.outputs['Geometry'].sv_set(polygons_out.tolist())
 
 def register():
     bpy.utils.register_class(SvExShapelyPointNode)
@@ -12,6 +12,7 @@ from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty, Fl
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level
 from sverchok_extra.dependencies import shapely
+from sverchok_extra.utils.shapely import geometries_from_lists
 
 class SvExShapelyPolygonNode(SverchCustomTreeNode, bpy.types.Node):
     """
@@ -35,12 +36,10 @@ class SvExShapelyPolygonNode(SverchCustomTreeNode, bpy.types.Node):
         verts_s = self.inputs['Vertices'].sv_get()
         verts_s = ensure_nesting_level(verts_s, 3)
 
-        polygons_out = []
-        for verts in verts_s:
-            polygon = shapely.Polygon(verts)
-            polygons_out.append(polygon)
+        rings = geometries_from_lists(shapely.linearrings, verts_s, shapely.LinearRing)
+        polygons_out = shapely.polygons(rings)
 
-        self.outputs['Geometry'].sv_set(polygons_out)
+        self.outputs['Geometry'].sv_set(polygons_out.tolist())
 
 def register():
     bpy.utils.register_class(SvExShapelyPolygonNode)
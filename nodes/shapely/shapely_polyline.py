@@ -12,6 +12,7 @@ from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty, Fl
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level
 from sverchok_extra.dependencies import shapely
+from sverchok_extra.utils.shapely import geometries_from_lists
 
 class SvExShapelyPolylineNode(SverchCustomTreeNode, bpy.types.Node):
     """
@@ -43,15 +44,12 @@ class SvExShapelyPolylineNode(SverchCustomTreeNode, bpy.types.Node):
         verts_s = self.inputs['Vertices'].sv_get()
         verts_s = ensure_nesting_level(verts_s, 3)
 
-        polygons_out = []
-        for verts in verts_s:
-            if self.cycle:
-                polygon = shapely.LinearRing(verts)
-            else:
-                polygon = shapely.LineString(verts)
-            polygons_out.append(polygon)
+        if self.cycle:
+            polygons_out = geometries_from_lists(shapely.linearrings, verts_s, shapely.LinearRing)
+        else:
+            polygons_out = geometries_from_lists(shapely.linestrings, verts_s, shapely.LineString)
 
-        self.outputs['Geometry'].sv_set(polygons_out)
+        self.outputs['Geometry'].sv_set(polygons_out.tolist())
 
 def register():
     bpy.utils.register_class(SvExShapelyPolylineNode)
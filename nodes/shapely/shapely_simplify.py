@@ -4,7 +4,7 @@ from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty, Fl
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level, get_data_nesting_level
 from sverchok_extra.dependencies import shapely
-from sverchok_extra.utils.shapely import union_collection
+from sverchok_extra.utils.shapely import union_collection, vectorize_nested
 
 class SvExShapelySimplifyNode(SverchCustomTreeNode, bpy.types.Node):
     """
@@ -55,20 +55,15 @@ class SvExShapelySimplifyNode(SverchCustomTreeNode, bpy.types.Node):
         tolerance_s = self.inputs['Tolerance'].sv_get()
         tolerance_s = ensure_nesting_level(tolerance_s, 2)
 
-        geometry_out = []
-        for params in zip_long_repeat(geometry_s, tolerance_s):
-            new_geometry = []
-            for geometry, tolerance in zip_long_repeat(*params):
-                if self.union_all:
-                    geometry = union_collection(geometry)
-                g = shapely.simplify(geometry,
-                                     tolerance = tolerance,
-                                     preserve_topology = self.preserve_topology)
-                new_geometry.append(g)
-            if flat_output:
-                geometry_out.extend(new_geometry)
-            else:
-                geometry_out.append(new_geometry)
+        if self.union_all:
+            geometry_s = [[union_collection(geometry) for geometry in geometries] for geometries in geometry_s]
+
+        def simplify(geometry, tolerance):
+            return shapely.simplify(geometry,
+                                    tolerance = tolerance,
+                                    preserve_topology = self.preserve_topology)
+
+        geometry_out = vectorize_nested(simplify, [geometry_s, tolerance_s], flat_output)
 
         self.outputs['Geometry'].sv_set(geometry_out)
 
@@ -6,12 +6,34 @@ from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty, Fl
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level, get_data_nesting_level
 from sverchok_extra.dependencies import shapely
+from sverchok_extra.utils.shapely import broadcast_nested, unflatten_nested, as_ufunc_arg
 
 def transform_by_matrix(matrix):
     m = np.array(matrix)[:2, :2]
     v = np.array(matrix.translation)[:2]
     return lambda pts: (m @ pts.T).T + v
 
+def transform_by_matrices(geometries, matrices):
+    """
+    Transform each geometry by corresponding matrix; coordinates of all
+    geometries are transformed in one go.
+    """
+    # Many items usually share the same matrix object
+    matrix_idxs = dict()
+    ms, vs, idxs = [], [], []
+    for matrix in matrices:
+        idx = matrix_idxs.get(id(matrix))
+        if idx is None:
+            idx = matrix_idxs[id(matrix)] = len(ms)
+            ms.append(np.array(matrix)[:2, :2])
+            vs.append(np.array(matrix.translation)[:2])
+        idxs.append(idx)
+    ms, vs, idxs = np.array(ms), np.array(vs), np.array(idxs, dtype=np.int64)
+    coords, coord_idxs = shapely.get_coordinates(geometries, return_index=True)
+    item_idxs = idxs[coord_idxs]
+    coords = np.einsum('nij,nj->ni', ms[item_idxs], coords) + vs[item_idxs]
+    return shapely.set_coordinates(geometries.copy(), coords)
+
 class SvExShapelyTransformNode(SverchCustomTreeNode, bpy.types.Node):
     """
     Triggers: 2D Transform
@@ -39,16 +61,9 @@ class SvExShapelyTransformNode(SverchCustomTreeNode, bpy.types.Node):
         matrix_s = self.inputs['Matrix'].sv_get()
         matrix_s = ensure_nesting_level(matrix_s, 2, data_types=(Matrix,))
 
-        geometry_out = []
-        for params in zip_long_repeat(geometry_s, matrix_s):
-            new_geometry = []
-            for geometry, matrix in zip_long_repeat(*params):
-                g = shapely.transform(geometry, transform_by_matrix(matrix))
-                new_geometry.append(g)
-            if flat_output:
-                geometry_out.extend(new_geometry)
-            else:
-                geometry_out.append(new_geometry)
+        (geometries, matrices), lengths = broadcast_nested(geometry_s, matrix_s)
+        geometries = transform_by_matrices(as_ufunc_arg(geometries), matrices)
+        geometry_out = unflatten_nested(geometries, lengths, flat_output)
 
         self.outputs['Geometry'].sv_set(geometry_out)
 
@@ -1,9 +1,14 @@
+import numpy as np
+
 import bpy
 from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty, FloatVectorProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, ensure_nesting_level, get_data_nesting_level
 from sverchok_extra.dependencies import shapely
+from sverchok_extra.utils.shapely import (broadcast_nested, unflatten_nested, as_ufunc_arg,
+            geometries_from_lists, clip_geometries, voronoi_mesh, voronoi_mesh_job)
+from sverchok_extra.utils.parallel import get_pool_context
 
 def make_points(pts):
     return shapely.MultiPoint(pts)
@@ -19,10 +24,60 @@ class SvExShapelyVoronoiNode(SverchCustomTreeNode, bpy.types.Node):
     sv_icon = 'SV_VORONOI'
     sv_dependencies = {'shapely'}
 
+    clip : BoolProperty(
+            name = "Clip",
+            description = "Clip cells by ExtendTo geometry",
+            default = False,
+            update = updateNode)
+
+    n_workers : IntProperty(
+            name = "Workers",
+            description = "Number of processes used to build meshes for many sets of sites. Not supported on Windows and macOS",
+            default = 1,
+            min = 1,
+            update = updateNode)
+
     def sv_init(self, context):
         self.inputs.new('SvVerticesSocket', "Sites")
         self.inputs.new('SvGeom2DSocket', "ExtendTo")
         self.outputs.new('SvGeom2DSocket', "Geometry")
+        self.outputs.new('SvVerticesSocket', "Vertices")
+        self.outputs.new('SvStringsSocket', "Faces")
+        self.outputs.new('SvStringsSocket', "SiteIndex")
+
+    def draw_buttons(self, context, layout):
+        layout.prop(self, 'clip')
+
+    def draw_buttons_ext(self, context, layout):
+        self.draw_buttons(context, layout)
+        layout.prop(self, 'n_workers')
+
+    def process_cells(self, sites, extend_to, clip):
+        points = geometries_from_lists(shapely.multipoints, sites, shapely.MultiPoint)
+        diagrams = shapely.voronoi_polygons(points, extend_to = extend_to)
+        # Split each diagram into cells
+        cells = shapely.get_parts(diagrams)
+        counts = shapely.get_num_geometries(diagrams)
+        if clip:
+            cells = clip_geometries(cells, np.repeat(extend_to, counts))
+        cells = cells.tolist()
+        bounds = np.concatenate(([0], np.cumsum(counts))).tolist()
+        return [cells[start : end] for start, end in zip(bounds, bounds[1:])]
+
+    def process_meshes(self, sites, extend_to, clip):
+        if extend_to is None:
+            extend_to = [None] * len(sites)
+        context = get_pool_context() if self.n_workers > 1 and len(sites) > 1 else None
+        if context is None:
+            results = [voronoi_mesh(site_list, geometry, clip) for site_list, geometry in zip(sites, extend_to)]
+            results = [(cells.tolist(), verts, faces, face_sites) for cells, verts, faces, face_sites in results]
+        else:
+            jobs = [(np.asarray(site_list), None if geometry is None else shapely.to_wkb(geometry), clip)
+                        for site_list, geometry in zip(sites, extend_to)]
+            with context.Pool(self.n_workers) as pool:
+                results = pool.map(voronoi_mesh_job, jobs, chunksize=max(1, len(jobs) // (4*self.n_workers)))
+            results = [(shapely.from_wkb(cells).tolist(), verts, faces, face_sites) for cells, verts, faces, face_sites in results]
+        return [list(r) for r in zip(*results)]
 
     def process(self):
         if not any(socket.is_linked for socket in self.outputs):
@@ -38,17 +93,29 @@ class SvExShapelyVoronoiNode(SverchCustomTreeNode, bpy.types.Node):
         else:
             geometry_s = [[None]]
 
-        geometry_out = []
-        for params in zip_long_repeat(sites_s, geometry_s):
-            new_geometry = []
-            for sites, geometry in zip_long_repeat(*params):
-                v = shapely.voronoi_polygons(make_points(sites),
-                                            extend_to = geometry)
-                new_geometry.append(list(v.geoms))
-            if flat_output:
-                geometry_out.extend(new_geometry)
+        (sites, geometries), lengths = broadcast_nested(sites_s, geometry_s)
+        if self.inputs['ExtendTo'].is_linked:
+            extend_to = as_ufunc_arg(geometries)
+        else:
+            extend_to = None
+        clip = self.clip and extend_to is not None
+
+        # Nodes created with older versions do not have mesh outputs
+        mesh_outputs = [name for name in ['Vertices', 'Faces', 'SiteIndex'] if name in self.outputs]
+        if any(self.outputs[name].is_linked for name in mesh_outputs):
+            if sites:
+                new_geometry, new_verts, new_faces, new_site_idxs = self.process_meshes(sites, extend_to, clip)
             else:
-                geometry_out.append(new_geometry)
+                new_geometry, new_verts, new_faces, new_site_idxs = [], [], [], []
+            if 'Vertices' in self.outputs:
+                self.outputs['Vertices'].sv_set(unflatten_nested(new_verts, lengths, flat_output))
+            if 'Faces' in self.outputs:
+                self.outputs['Faces'].sv_set(unflatten_nested(new_faces, lengths, flat_output))
+            if 'SiteIndex' in self.outputs:
+                self.outputs['SiteIndex'].sv_set(unflatten_nested(new_site_idxs, lengths, flat_output))
+        else:
+            new_geometry = self.process_cells(sites, extend_to, clip)
+        geometry_out = unflatten_nested(new_geometry, lengths, flat_output)
 
         self.outputs['Geometry'].sv_set(geometry_out)
 
@@ -10,7 +10,7 @@ import numpy as np
 
 from mathutils import Vector, Matrix
 import bpy
-from bpy.props import BoolProperty, FloatProperty, EnumProperty
+from bpy.props import BoolProperty, FloatProperty, EnumProperty, IntProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import zip_long_repeat, ensure_nesting_level, updateNode
@@ -21,6 +21,8 @@ from sverchok.utils.surface.core import SvSurface
 from sverchok.utils.surface.freecad import SvSolidFaceSurface, is_solid_face_surface, surface_to_freecad
 from sverchok.dependencies import FreeCAD
 
+from sverchok_extra.utils.parallel import get_pool_context
+
 if FreeCAD is not None:
     import Part
     from FreeCAD import Base
@@ -65,20 +67,90 @@ def do_split_many(solids, split_face, select):
         mids_2.append(mid_2)
     return mids_1, mids_2
 
-def do_waffel(solid, thickness, split_face, select, sections_a, sections_b):
-    n_a = len(sections_a)
-    cyls = []
-    cyl_idx = 0
-    cyls_per_section = defaultdict(list)
-    half_cyls1, half_cyls2 = [], []
-    for i, section_a in enumerate(sections_a):
-        for j, section_b in enumerate(sections_b):
-            r = section_a.section(section_b)
-            if not r.Compounds[0].Edges:
+def section_bboxes(sections):
+    bboxes = [section.BoundBox for section in sections]
+    return np.array([[bb.XMin, bb.YMin, bb.ZMin, bb.XMax, bb.YMax, bb.ZMax] for bb in bboxes]).reshape((-1, 6))
+
+def overlapping_pairs(sections_a, sections_b, tolerance=1e-6):
+    """
+    Indexes (i, j) of pairs of sections with overlapping bounding boxes;
+    only such sections can intersect.
+    """
+    bbox_a = section_bboxes(sections_a)[:,np.newaxis,:]
+    bbox_b = section_bboxes(sections_b)[np.newaxis,:,:]
+    overlap = (bbox_a[...,:3] <= bbox_b[...,3:] + tolerance) & (bbox_b[...,:3] <= bbox_a[...,3:] + tolerance)
+    return np.argwhere(overlap.all(axis=2)).tolist()
+
+def section_intersection(section_a, section_b):
+    """
+    Start and end points of intersection edge of two sections, as tuples,
+    or None.
+    """
+    r = section_a.section(section_b)
+    if not r.Compounds[0].Edges:
+        return None
+    intersection_edge = r.Compounds[0].Edges[0]
+    start = intersection_edge.Curve.value(intersection_edge.FirstParameter)
+    end = intersection_edge.Curve.value(intersection_edge.LastParameter)
+    return tuple(start), tuple(end)
+
+def cut_section(section, cylinders):
+    part = section.cut(cylinders)
+    return part.Faces[0]
+
+# Sections of the current do_waffel() call, in worker processes
+_worker_sections = None
+
+def _init_worker(breps_a, breps_b):
+    global _worker_sections
+    _worker_sections = [[shape_from_brep(brep) for brep in breps] for breps in (breps_a, breps_b)]
+
+def _worker_intersect(pair):
+    i, j = pair
+    sections_a, sections_b = _worker_sections
+    return section_intersection(sections_a[i], sections_b[j])
+
+def _worker_cut(task):
+    side, i, cylinder_breps = task
+    section = _worker_sections[side][i]
+    cylinders = [shape_from_brep(brep) for brep in cylinder_breps]
+    return cut_section(section, cylinders).exportBrepToString()
+
+def shape_from_brep(brep):
+    shape = Part.Shape()
+    shape.importBrepFromString(brep)
+    return shape
+
+def do_waffel(solid, thickness, split_face, select, sections_a, sections_b, n_workers=1):
+    """
+    If n_workers > 1, intersections of sections and cuts are calculated in
+    a pool of worker processes; shapes are passed to them as BREP strings.
+    """
+    # Only sections with overlapping bounding boxes can intersect
+    pairs = overlapping_pairs(sections_a, sections_b)
+
+    context = get_pool_context() if n_workers > 1 else None
+    pool = None
+    if context is not None:
+        breps_a = [section.exportBrepToString() for section in sections_a]
+        breps_b = [section.exportBrepToString() for section in sections_b]
+        pool = context.Pool(n_workers, initializer=_init_worker, initargs=(breps_a, breps_b))
+
+    try:
+        if pool is not None:
+            segments = pool.map(_worker_intersect, pairs, chunksize=max(1, len(pairs) // (4*n_workers)))
+        else:
+            segments = [section_intersection(sections_a[i], sections_b[j]) for i, j in pairs]
+
+        cyls = []
+        cyl_idx = 0
+        cyls_per_section_a = defaultdict(list)
+        cyls_per_section_b = defaultdict(list)
+        half_cyls1, half_cyls2 = [], []
+        for (i, j), segment in zip(pairs, segments):
+            if segment is None:
                 continue
-            intersection_edge = r.Compounds[0].Edges[0]
-            start = intersection_edge.Curve.value(intersection_edge.FirstParameter)
-            end = intersection_edge.Curve.value(intersection_edge.LastParameter)
+            start, end = Base.Vector(*segment[0]), Base.Vector(*segment[1])
             direction = end - start
             start = start - thickness * direction
             end = end + thickness * direction
@@ -94,29 +166,31 @@ def do_waffel(solid, thickness, split_face, select, sections_a, sections_b):
                 half_cyls1.append(half1)
                 half_cyls2.append(half2)
 
-            cyls_per_section[i].append(cyl_idx)
-            cyls_per_section[j].append(cyl_idx)
+            cyls_per_section_a[i].append(cyl_idx)
+            cyls_per_section_b[j].append(cyl_idx)
             cyl_idx += 1
 
-    if split_face is not None:
-        half_cyls1, half_cyls2 = do_split_many(cyls, split_face, select)
-    
-    result_a = []
-    for i, section_a in enumerate(sections_a):
-        half_cyls = [half_cyls1[k] for k in cyls_per_section[i]]
-        part = section_a.cut(half_cyls)
-        face = part.Faces[0]
-        surface = SvSolidFaceSurface(face)
-        result_a.append(surface)
-
-    result_b = []
-    for j, section_b in enumerate(sections_b):
-        half_cyls = [half_cyls2[k] for k in cyls_per_section[j]]
-        part = section_b.cut(half_cyls)
-        face = part.Faces[0]
-        surface = SvSolidFaceSurface(face)
-        result_b.append(surface)
-    
+        if split_face is not None:
+            half_cyls1, half_cyls2 = do_split_many(cyls, split_face, select)
+
+        tasks = []
+        for side, sections, half_cyls, cyls_per_section in [(0, sections_a, half_cyls1, cyls_per_section_a), (1, sections_b, half_cyls2, cyls_per_section_b)]:
+            for i in range(len(sections)):
+                tasks.append((side, i, [half_cyls[k] for k in cyls_per_section[i]]))
+
+        if pool is not None:
+            tasks = [(side, i, [cyl.exportBrepToString() for cyl in cylinders]) for side, i, cylinders in tasks]
+            faces = [shape_from_brep(brep).Faces[0] for brep in pool.map(_worker_cut, tasks)]
+        else:
+            all_sections = [sections_a, sections_b]
+            faces = [cut_section(all_sections[side][i], cylinders) for side, i, cylinders in tasks]
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    surfaces = [SvSolidFaceSurface(face) for face in faces]
+    result_a = surfaces[:len(sections_a)]
+    result_b = surfaces[len(sections_a):]
     return result_a, result_b
 
 class SvSolidWaffleNode(SverchCustomTreeNode, bpy.types.Node):
@@ -153,6 +227,13 @@ class SvSolidWaffleNode(SverchCustomTreeNode, bpy.types.Node):
             min = 0.0,
             update = updateNode)
 
+    n_workers : IntProperty(
+            name = "Workers",
+            description = "Number of processes used to intersect and cut sections. Not supported on Windows and macOS",
+            default = 1,
+            min = 1,
+            update = updateNode)
+
     def sv_init(self, context):
         self.inputs.new('SvSolidSocket', "Solid")
         self.inputs.new('SvMatrixSocket', "MatrixA")
@@ -168,6 +249,10 @@ class SvSolidWaffleNode(SverchCustomTreeNode, bpy.types.Node):
     def draw_buttons(self, context, layout):
         layout.prop(self, 'split_mode')
 
+    def draw_buttons_ext(self, context, layout):
+        self.draw_buttons(context, layout)
+        layout.prop(self, 'n_workers')
+
     def process(self):
         if not any(socket.is_linked for socket in self.outputs):
             return
@@ -229,7 +314,7 @@ class SvSolidWaffleNode(SverchCustomTreeNode, bpy.types.Node):
                         splitted_a.append(sections_a)
                         splitted_b.append(sections_b)
         #print(splitted_a, splitted_b)
-        result_a, result_b = do_waffel(solid, thickness, split_face, select, splitted_a, splitted_b)
+        result_a, result_b = do_waffel(solid, thickness, split_face, select, splitted_a, splitted_b, n_workers=self.n_workers)
         face_a_out.append(result_a)
         face_b_out.append(result_b)
 
@@ -25,6 +25,50 @@ from sverchok.dependencies import scipy
 if scipy is not None:
     from scipy.spatial import Delaunay
 
+# Vertex indices of tetrahedron faces and edges, in the order of
+# itertools.combinations(range(4), 3) and combinations(range(4), 2)
+TETRA_FACES = np.array(list(combinations(range(4), 3)))
+TETRA_EDGES = np.array(list(combinations(range(4), 2)))
+# For each face, indices of its edges in TETRA_EDGES
+FACE_EDGES = np.array([[0, 1, 3], [0, 2, 4], [1, 2, 5], [3, 4, 5]])
+
+def delaunay_surface_faces(vertices, normals, simplices, volume_threshold, edge_threshold, cos_threshold):
+    """
+    Select triangles of 3D Delaunay tetrahedrons which lie along the surface.
+    All tetrahedrons are processed at once:
+    * nearly planar tetrahedrons (normalized volume below volume_threshold)
+      are skipped;
+    * triangles having edges longer than edge_threshold, or edges which are
+      not nearly perpendicular to surface normals at their ends, are skipped;
+    * at most 3 triangles of each tetrahedron are used.
+    Returns np.array of shape (n, 3), each triangle listed once.
+    """
+    simplices = np.asarray(simplices)
+    if volume_threshold > 0:
+        vs = vertices[simplices[:,1:]] - vertices[simplices[:,:1]]
+        vs = vs / np.linalg.norm(vs, axis=2, keepdims=True)
+        volumes = np.einsum('ij,ij->i', np.cross(vs[:,0], vs[:,1]), vs[:,2]) / 6
+        simplices = simplices[abs(volumes) >= volume_threshold]
+
+    # Edges of all tetrahedrons, shape (m, 6)
+    i1 = simplices[:, TETRA_EDGES[:,0]]
+    i2 = simplices[:, TETRA_EDGES[:,1]]
+    dv = vertices[i2] - vertices[i1]
+    dot1 = np.einsum('ijk,ijk->ij', normals[i1], dv)
+    dot2 = np.einsum('ijk,ijk->ij', normals[i2], dv)
+    bad_edges = (abs(dot1) > cos_threshold) | (abs(dot2) > cos_threshold)
+    if edge_threshold > 0:
+        bad_edges |= np.linalg.norm(dv, axis=2) > edge_threshold
+
+    good_faces = ~ bad_edges[:, FACE_EDGES].any(axis=2)
+    # Not more than 3 faces of each tetrahedron
+    good_faces &= np.cumsum(good_faces, axis=1) <= 3
+
+    faces = simplices[:, TETRA_FACES][good_faces]
+    if len(faces) == 0:
+        return np.empty((0, 3), dtype=np.int64)
+    return np.unique(np.sort(faces, axis=1), axis=0)
+
 class SvDelaunayOnSurfaceNode(SverchCustomTreeNode, bpy.types.Node):
     """
     Triggers: Delaunay 3D Surface
@@ -72,37 +116,6 @@ class SvDelaunayOnSurfaceNode(SverchCustomTreeNode, bpy.types.Node):
         self.outputs.new('SvStringsSocket', "Edges")
         self.outputs.new('SvStringsSocket', "Faces")
 
-    def is_planar(self, verts, idxs, threshold):
-        if threshold == 0:
-            return False
-        a, b, c, d = [verts[i] for i in idxs]
-        a, b, c, d = np.array(a), np.array(b), np.array(c), np.array(d)
-        v1 = b - a
-        v2 = c - a
-        v3 = d - a
-        v1 = v1 / np.linalg.norm(v1)
-        v2 = v2 / np.linalg.norm(v2)
-        v3 = v3 / np.linalg.norm(v3)
-        volume = np.cross(v1, v2).dot(v3) / 6
-        return abs(volume) < threshold
-    
-    def is_too_long(self, verts, edge, threshold):
-        if threshold == 0:
-            return False
-        i, j = edge
-        v1, v2 = verts[i], verts[j]
-        d = np.linalg.norm(v1 - v2)
-        return (d > threshold)
-
-    def is_bad_angle(self, vertices, normals, edge, cos_threshold):
-        i,j = edge
-        dv = vertices[j] - vertices[i]
-        normal1 = normals[i]
-        normal2 = normals[j]
-        dot1 = np.dot(normal1, dv)
-        dot2 = np.dot(normal2, -dv)
-        return (abs(dot1) > cos_threshold) or (abs(dot2) > cos_threshold)
-
     def process(self):
         if not any(socket.is_linked for socket in self.outputs):
             return
@@ -129,38 +142,27 @@ class SvDelaunayOnSurfaceNode(SverchCustomTreeNode, bpy.types.Node):
         for params in zip_long_repeat(surface_in, uvpoints_in, volume_threshold_s, edge_threshold_s, angle_threshold_s):
             verts_item = []
             edges_item = []
-            faces_item = set()
+            faces_item = []
             for surface, uvpoints, volume_threshold, edge_threshold, angle_threshold in zip_long_repeat(*params):
                 cos_threshold = abs(cos(pi/2 + angle_threshold))
-                us = np.array([p[0] for p in uvpoints])
-                vs = np.array([p[1] for p in uvpoints])
+                uvpoints = np.asarray(uvpoints)
+                us, vs = uvpoints[:,0], uvpoints[:,1]
                 vertices = surface.evaluate_array(us, vs)
                 normals = surface.normal_array(us, vs)
                 tri = Delaunay(vertices)
-                verts_item = [vertices.tolist()]
-                used_faces = set()
-                for simplex_idx, simplex in enumerate(tri.simplices):
-                    if self.is_planar(vertices, simplex, volume_threshold):
-                        continue
-                    faces_count = 0
-                    faces = list(combinations(simplex, 3))
-                    if any(face in used_faces for face in faces):
-                        continue
-                    for face in faces:
-                        if faces_count <= 2 and not any(self.is_bad_angle(vertices, normals, edge, cos_threshold) or self.is_too_long(vertices, edge, edge_threshold) for edge in combinations(face, 2)):
-                            faces_item.add(face)
-                            used_faces.add(face)
-                            faces_count += 1
-                    #verts_item.append(verts_new.tolist())
+                faces = delaunay_surface_faces(vertices, normals, tri.simplices,
+                            volume_threshold, edge_threshold, cos_threshold)
+                verts_item.append(vertices.tolist())
+                faces_item.append(faces.tolist())
 
             if nested_output:
                 verts_out.append(verts_item)
                 edges_out.append(edges_item)
-                faces_out.append([list(faces_item)])
+                faces_out.append(faces_item)
             else:
                 verts_out.extend(verts_item)
                 edges_out.extend(edges_item)
-                faces_out.extend([list(faces_item)])
+                faces_out.extend(faces_item)
 
         self.outputs['Vertices'].sv_set(verts_out)
         self.outputs['Edges'].sv_set(edges_out)
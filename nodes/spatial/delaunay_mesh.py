@@ -15,6 +15,9 @@ from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import zip_long_repeat, repeat_last_for_length, updateNode
 from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata
 from sverchok.utils.mesh_spatial import mesh_insert_verts, find_nearest_idxs
+from sverchok.dependencies import scipy
+
+from sverchok_extra.utils.nearest_face import get_nearest_face_finder
 
 class SvDelaunayOnMeshNode(SverchCustomTreeNode, bpy.types.Node):
     """
@@ -104,6 +107,9 @@ class SvDelaunayOnMeshNode(SverchCustomTreeNode, bpy.types.Node):
         for verts, faces, add_verts, face_idxs in zip_long_repeat(verts_in, faces_in, add_verts_in, face_idxs_in):
             if self.mode == 'INDEX':
                 face_idxs = repeat_last_for_length(face_idxs, len(add_verts))
+            elif scipy is not None:
+                # Spatial index is cached, and rebuilt only when the mesh changes
+                face_idxs = get_nearest_face_finder(verts, faces).find(add_verts)
             else:
                 face_idxs = find_nearest_idxs(verts, faces, add_verts)
 
@@ -66,6 +66,7 @@ def nodes_index():
                     ("shapely.shapely_area", "SvExShapelyAreaNode"),
                     ("shapely.shapely_distance", "SvExShapelyDistanceNode"),
                     ("shapely.shapely_min_circle", "SvExShapelyMinBoundingCircleNode"),
+                    ("shapely.shapely_contains_points", "SvExShapelyContainsPointsNode"),
                     None,
                     ("shapely.shapely_triangulate", "SvExShapelyTriangulateNode")
                 ]},
@@ -0,0 +1,165 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+import logging
+import unittest
+from time import perf_counter
+
+import numpy as np
+
+from sverchok.utils.testing import SverchokTestCase
+from sverchok_extra.utils.array_math import array_numba, subdivide_polyline, resample_polyline
+
+try:
+    import awkward as ak
+except ImportError:
+    ak = None
+
+logger = logging.getLogger('sverchok.extra')
+
+INTERPOLATIONS = ['LINEAR', 'CUBIC', 'CATMULL_ROM']
+
+
+# ---------------------------------------------------------------------------
+# Shared test data
+# ---------------------------------------------------------------------------
+
+def two_polylines():
+    """Two open polylines with different number of vertices."""
+    return ak.Array([
+        [[0.0, 0.0, 0.0], [1.5, 0.0, 0.0], [2.0, 0.5, 0.0]],
+        [[0.0, 0.0, 0.0], [0.0, 1.5, 0.0], [0.0, 2.0, 0.5], [0.0, 3.0, 0.0]],
+    ])
+
+
+def random_polylines(seed=42, n=1000, max_verts=50):
+    """Reproducible random polylines with 2 to max_verts vertices."""
+    rng = np.random.RandomState(seed)
+    counts = rng.randint(2, max_verts, n)
+    return ak.unflatten(rng.rand(counts.sum(), 3) * 10, counts)
+
+
+def _as_numpy(polylines):
+    """Vertices of all polylines as one array and number of vertices per line."""
+    return ak.to_numpy(ak.flatten(polylines, axis=1)), ak.to_numpy(ak.num(polylines, axis=1))
+
+
+# ===========================================================================
+#  subdivide_polyline: numba vs awkward implementation
+# ===========================================================================
+
+@unittest.skipIf(ak is None or array_numba.numba is None, "awkward and numba are required")
+class SubdividePolylineTests(SverchokTestCase):
+
+    def _compare(self, polylines, cuts, interpolation):
+        expected = subdivide_polyline.ak_implementation(polylines, cuts, interpolation)
+        result = array_numba.subdivide_polyline(polylines, cuts, interpolation)
+        expected_verts, expected_counts = _as_numpy(expected)
+        result_verts, result_counts = _as_numpy(result)
+        self.assert_numpy_arrays_equal(result_counts, expected_counts)
+        self.assert_numpy_arrays_equal(result_verts, expected_verts, precision=8)
+
+    def test_numba_is_used(self):
+        """With numba available the public function is the numba one."""
+        self.assertIsNot(subdivide_polyline, subdivide_polyline.ak_implementation)
+
+    def test_linear_values(self):
+        """Linear subdivision puts new points in the middle of segments."""
+        result = array_numba.subdivide_polyline(two_polylines(), 1, 'LINEAR')
+        expected = np.array([[0, 0, 0], [0.75, 0, 0], [1.5, 0, 0], [1.75, 0.25, 0], [2, 0.5, 0]])
+        self.assert_numpy_arrays_equal(ak.to_numpy(result[0]), expected, precision=8)
+
+    def test_scalar_cuts(self):
+        """Same number of cuts for all segments."""
+        for interpolation in INTERPOLATIONS:
+            with self.subTest(interpolation=interpolation):
+                self._compare(two_polylines(), 2, interpolation)
+
+    def test_per_line_cuts(self):
+        """Number of cuts given per polyline."""
+        for interpolation in INTERPOLATIONS:
+            with self.subTest(interpolation=interpolation):
+                self._compare(two_polylines(), [0, 3], interpolation)
+
+    def test_per_segment_cuts(self):
+        """Number of cuts given per segment, including zero."""
+        cuts = ak.Array([[1, 2], [0, 1, 3]])
+        for interpolation in INTERPOLATIONS:
+            with self.subTest(interpolation=interpolation):
+                self._compare(two_polylines(), cuts, interpolation)
+
+    def test_single_segment(self):
+        """Ends of a one-segment line are extrapolated on both sides."""
+        polylines = ak.Array([[[0.0, 0.0, 0.0], [1.0, 1.0, 0.0]]])
+        for interpolation in INTERPOLATIONS:
+            with self.subTest(interpolation=interpolation):
+                self._compare(polylines, 3, interpolation)
+
+    def test_random(self):
+        """Many random polylines with random cuts per segment."""
+        polylines = random_polylines()
+        rng = np.random.RandomState(0)
+        n_segments = ak.num(polylines, axis=1) - 1
+        cuts = ak.unflatten(rng.randint(0, 5, ak.sum(n_segments)), n_segments)
+        for interpolation in INTERPOLATIONS:
+            with self.subTest(interpolation=interpolation):
+                self._compare(polylines, cuts, interpolation)
+
+    def test_wrong_interpolation(self):
+        with self.assertRaises(TypeError):
+            array_numba.subdivide_polyline(two_polylines(), 1, 'QUADRATIC')
+
+    def test_timing(self):
+        """Report time of both implementations on a large input."""
+        polylines = random_polylines(n=20000)
+        array_numba.subdivide_polyline(polylines[:1], 1, 'LINEAR')  # compile
+        for interpolation in INTERPOLATIONS:
+            start = perf_counter()
+            expected = subdivide_polyline.ak_implementation(polylines, 3, interpolation)
+            ak_time = perf_counter() - start
+            start = perf_counter()
+            result = array_numba.subdivide_polyline(polylines, 3, interpolation)
+            numba_time = perf_counter() - start
+            logger.info("subdivide_polyline %s: awkward %.3fs, numba %.3fs", interpolation, ak_time, numba_time)
+            self.assertEqual(len(ak.flatten(result, axis=1)), len(ak.flatten(expected, axis=1)))
+
+
+# ===========================================================================
+#  resample_polyline
+# ===========================================================================
+
+@unittest.skipIf(ak is None, "awkward is required")
+class ResamplePolylineTests(SverchokTestCase):
+
+    def test_even_spacing(self):
+        """New vertices are equally spaced along the length of the line."""
+        result = resample_polyline(two_polylines(), 4, 'LINEAR')
+        step = (1.5 + 0.5 ** 0.5) / 3
+        expected = np.array([[0, 0, 0], [step, 0, 0], [2 * step, 0, 0], [2, 0.5, 0]])
+        self.assert_numpy_arrays_equal(ak.to_numpy(result[0]), expected, precision=8)
+
+    def test_linear_random(self):
+        """Per-line counts, compared with per-line numpy interpolation."""
+        polylines = random_polylines()
+        counts = np.random.RandomState(0).randint(2, 40, len(polylines))
+        result = resample_polyline(polylines, counts, 'LINEAR')
+        for i in range(0, len(polylines), 50):
+            verts = ak.to_numpy(polylines[i])
+            dist = np.concatenate([[0], np.cumsum(np.linalg.norm(np.diff(verts, axis=0), axis=1))])
+            target = np.linspace(0, dist[-1], counts[i])
+            expected = np.stack([np.interp(target, dist, verts[:, axis]) for axis in range(3)], axis=1)
+            self.assert_numpy_arrays_equal(ak.to_numpy(result[i]), expected, precision=8)
+
+    def test_keeps_end_points(self):
+        """First and last vertices are kept for all interpolations."""
+        polylines = two_polylines()
+        for interpolation in INTERPOLATIONS:
+            with self.subTest(interpolation=interpolation):
+                result = resample_polyline(polylines, [3, 5], interpolation)
+                self.assertEqual(ak.to_list(ak.num(result, axis=1)), [3, 5])
+                self.assert_numpy_arrays_equal(ak.to_numpy(result[:, 0]), ak.to_numpy(polylines[:, 0]), precision=8)
+                self.assert_numpy_arrays_equal(ak.to_numpy(result[:, -1]), ak.to_numpy(polylines[:, -1]), precision=8)
@@ -163,7 +163,7 @@ def polyline_length(verts):
     return ak.sum(segment_length(verts), axis=-1)
 
 
-# @add_numba_implementation
+@add_numba_implementation
 def subdivide_polyline(verts, cuts, interpolation='LINEAR'):
     """Only works with list of polylines"""
     lines_mum = len(verts)
@@ -203,6 +203,60 @@ def subdivide_polyline(verts, cuts, interpolation='LINEAR'):
     return new_verts
 
 
+def resample_polyline(verts, count, interpolation='LINEAR'):
+    """Put given number of vertices evenly along length of each polyline.
+    Only works with list of polylines with at least two vertices. All lines
+    are handled at once on flat arrays of their segments."""
+    if interpolation not in {'LINEAR', 'CUBIC', 'CATMULL_ROM'}:
+        raise TypeError(f"{interpolation=} is not among supported.")
+    seg_len = segment_length(verts)
+    seg_num = ak.to_numpy(ak.num(seg_len, axis=-1)).astype(np.int64)
+    lines_num = len(seg_num)
+    _, count = ak.broadcast_arrays(seg_num, count)
+    count = np.maximum(ak.to_numpy(count).astype(np.int64), 2)
+
+    # Cumulative length along all lines one after another
+    seg_len = ak.to_numpy(ak.flatten(seg_len, axis=None))
+    dist = np.concatenate([[0], np.cumsum(seg_len)])
+    seg_offsets = np.concatenate([[0], np.cumsum(seg_num)])
+    line_start = dist[seg_offsets[:-1]]
+    line_end = dist[seg_offsets[1:]]
+
+    # Target distances for all new vertices
+    line_idx = np.repeat(np.arange(lines_num), count)
+    vert_offsets = np.concatenate([[0], np.cumsum(count)])
+    local_idx = np.arange(vert_offsets[-1]) - vert_offsets[line_idx]
+    factor = local_idx / (count - 1)[line_idx]
+    start = line_start[line_idx]
+    target = start + (line_end[line_idx] - start) * factor
+
+    # Segment of each target distance, kept inside its own line
+    seg_idx = np.searchsorted(dist, target, side='right') - 1
+    first_seg = seg_offsets[:-1][line_idx]
+    last_seg = seg_offsets[1:][line_idx] - 1
+    seg_idx = np.clip(seg_idx, first_seg, last_seg)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        seg_factor = (target - dist[seg_idx]) / seg_len[seg_idx]
+    seg_factor = np.nan_to_num(np.clip(seg_factor, 0, 1))[:, np.newaxis]
+
+    # Each line has one more vertex than segments
+    points = ak.to_numpy(ak.flatten(verts, axis=1)).astype(np.float64)
+    i1 = seg_idx + line_idx
+    v1 = points[i1]
+    v2 = points[i1 + 1]
+    if interpolation == 'LINEAR':
+        new_verts = linear_interpolation(v1, v2, seg_factor)
+    else:
+        # Missing neighbours of end segments repeat the edge slope
+        v0 = np.where((seg_idx > first_seg)[:, np.newaxis], points[np.maximum(i1 - 1, 0)], v1 + v1 - v2)
+        v3 = np.where((seg_idx < last_seg)[:, np.newaxis], points[np.minimum(i1 + 2, len(points) - 1)], v2 + v2 - v1)
+        if interpolation == 'CUBIC':
+            new_verts = cubic_interpolation(v0, v1, v2, v3, seg_factor)
+        else:
+            new_verts = catmull_rom_interpolation(v0, v1, v2, v3, seg_factor)
+    return ak.unflatten(new_verts, count, axis=0)
+
+
 @add_numba_implementation
 def connect_polyline(verts):
     _, edge_shape = ak.broadcast_arrays(verts, 0, depth_limit=verts.ndim - 1)  # if cycle
@@ -35,14 +35,31 @@ def add_numba_implementation(decorated_func):
     def wrap(*args, **kwargs):
         return implementation(*args, **kwargs)
 
+    # Keep the original implementation accessible, e.g. for comparison in tests
+    wrap.ak_implementation = decorated_func
     return wrap
 
 
+INTERPOLATION_CODES = {'LINEAR': 0, 'CUBIC': 1, 'CATMULL_ROM': 2}
+
+
 def subdivide_polyline(verts, cuts, interpolation='LINEAR'):
+    if interpolation not in INTERPOLATION_CODES:
+        raise TypeError(f"{interpolation=} is not among supported.")
     verts = ak.from_regular(verts)  # https://github.com/scikit-hep/awkward/discussions/2197
     segment_shape = ak.num(verts, axis=-1)[..., :-1]
     _, cuts2 = ak.broadcast_arrays(segment_shape, cuts)  # [[2, 3], [4]]
-    flat_result, flat_count = _subdivide_polylines(verts, cuts2)
+
+    # The kernel works on flat buffers: all points, offsets of lines in them,
+    # and number of cuts for each segment
+    line_counts = ak.to_numpy(ak.num(verts, axis=1)).astype(np.int64)
+    line_offsets = np.zeros(len(line_counts) + 1, dtype=np.int64)
+    np.cumsum(line_counts, out=line_offsets[1:])
+    points = ak.to_numpy(ak.flatten(verts, axis=1)).astype(np.float64)
+    flat_cuts = ak.to_numpy(ak.flatten(cuts2, axis=None)).astype(np.int64)
+
+    flat_result, flat_count = _subdivide_polylines(
+        points, line_offsets, flat_cuts, INTERPOLATION_CODES[interpolation])
     return ak.unflatten(flat_result, flat_count, axis=0)
 
 
@@ -57,64 +74,74 @@ def connect_polyline(verts):
 if numba is not None:
 
     @numba.njit
-    def _subdivide_polylines(polylines, cuts):
-        # if interpolation == 'LINEAR':
-        #     interpolation_func = _linear_interpolation
-        # elif interpolation == 'CUBIC':
-        #     interpolation_func = _cubic_interpolation
-        # elif interpolation == 'CATMULL_ROM':
-        #     interpolation = _catmull_rom_interpolation
-        # else:
-        #     raise TypeError("Given interpolation type is unknown.")
+    def _subdivide_polylines(points, line_offsets, cuts, interpolation):
+        """
+        points: all vertices of all polylines, array of shape (n, 3)
+        line_offsets: index of first vertex of each line in points, and
+            total number of points at the end
+        cuts: number of new vertices for each segment of each line
+        interpolation: 0 - linear, 1 - cubic, 2 - Catmull-Rom
+        """
+        n_lines = len(line_offsets) - 1
 
         # Pre-pass over the data to determine how large our arrays need to be
-        final_vertex_count = 0
-        for line_cuts in cuts:
-            for cut in line_cuts:
-                final_vertex_count += cut  # etra points inside segment
-                final_vertex_count += 1  # first point of each segment
-            final_vertex_count += 1  # last point of last segment
-
-        flat_result = np.empty((final_vertex_count, 3), dtype=np.float64)
-        flat_result = np.empty((10, 3), dtype=np.float64)
-        flat_count = np.zeros(len(polylines), dtype=np.int64)
-        flat_count = np.zeros(10, dtype=np.int64)
+        flat_count = np.zeros(n_lines, dtype=np.int64)
+        for i_line in range(n_lines):
+            start = line_offsets[i_line]
+            stop = line_offsets[i_line + 1]
+            if stop == start:
+                continue
+            # Segments of previous lines; each line has one segment less
+            # than vertices
+            seg_start = start - i_line
+            count = 1  # last point of last segment
+            for j_segment in range(stop - start - 1):
+                count += cuts[seg_start + j_segment] + 1  # first point and extra points
+            flat_count[i_line] = count
+
+        flat_result = np.empty((flat_count.sum(), 3), dtype=np.float64)
 
         # Keep track of the vertex index in the flat result
         l_vertex_index = 0
-
-        # For each polyline
-        for i_line, line in enumerate(polylines):
-            assert len(line) >= 2
-
-            # Add first point of the line
-            start = np.asarray(line[0])
-            flat_result[l_vertex_index] = start
+        for i_line in range(n_lines):
+            start = line_offsets[i_line]
+            stop = line_offsets[i_line + 1]
+            if stop == start:
+                continue
+            seg_start = start - i_line
+            for j_segment in range(stop - start - 1):
+                i_vertex = start + j_segment
+                n = cuts[seg_start + j_segment] + 1
+                # Interpolate coordinates one by one, with scalars
+                # no temporary arrays are created in the inner loop
+                for axis in range(3):
+                    v1 = points[i_vertex, axis]
+                    v2 = points[i_vertex + 1, axis]
+                    # Missing neighbours of end segments repeat the edge slope
+                    if j_segment > 0:
+                        v0 = points[i_vertex - 1, axis]
+                    else:
+                        v0 = v1 + v1 - v2
+                    if i_vertex + 2 < stop:
+                        v3 = points[i_vertex + 2, axis]
+                    else:
+                        v3 = v2 + v2 - v1
+                    for k in range(n):
+                        t = k / n
+                        if interpolation == 0:
+                            value = _linear_interpolation(v1, v2, t)
+                        elif interpolation == 1:
+                            value = _cubic_interpolation(v0, v1, v2, v3, t)
+                        else:
+                            value = _catmull_rom_interpolation(v0, v1, v2, v3, t)
+                        flat_result[l_vertex_index + k, axis] = value
+                l_vertex_index += n
+            flat_result[l_vertex_index] = points[stop - 1]
             l_vertex_index += 1
 
-            # For each segment (three vertices = two segments)
-            segments_num = len(line) - 1
-            for j_segment in range(segments_num):
-                seg_cuts = cuts[i_line][j_segment]
-                _subdivide_segment(
-                    line, j_segment, seg_cuts, flat_result[l_vertex_index:])
-                l_vertex_index += seg_cuts+1
-
-            flat_count[i_line] = len(line) + sum([n for n in cuts[i_line]])
-
         return flat_result, flat_count
 
 
-    @numba.njit
-    def _subdivide_segment(polyline, segment_index, cuts, result):
-        start = np.asarray(polyline[segment_index])
-        stop = np.asarray(polyline[segment_index + 1])
-        for i, k_segment_vertex in enumerate(range(1, cuts + 2)):
-            # Interpolate between start and stop
-            t = k_segment_vertex / (cuts + 1)
-            result[i] = _linear_interpolation(start, stop, t)
-
-
     @numba.njit
     def _linear_interpolation(val1, val2, factor):
         return val1 * (1 - factor) + val2 * factor
@@ -142,20 +169,6 @@ if numba is not None:
         return a0 * f2 * factor + a1 * f2 + a2 * factor + a3
 
 
-    @numba.njit
-    def _extend_polylines(polylines):
-        """Except list of polylines which are lists of vertices. Add extra points
-        ot the start and end of them repeating previous edge slope."""
-        v1 = verts[..., 0, :]
-        v2 = verts[..., 1, :]
-        v0 = v1 + v1 - v2
-        last = verts[..., -1, :]
-        prev = verts[..., -2, :]
-        new_last = last + last - prev
-        new_verts = ak.concatenate([v0[:, np.newaxis], verts, new_last[:, np.newaxis]], axis=1)
-        return new_verts
-
-
     @numba.njit
     def _connect_polyline(verts):
         if verts.ndim == 2:
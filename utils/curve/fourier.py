@@ -0,0 +1,91 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+FFT-based approximation of closed point sequences by Fourier curves.
+
+A closed sequence of N points, evenly spaced in curve parameter t in [0, 1),
+is one period of a function with omega = 2*pi; its Fourier amplitudes are
+read directly from the discrete Fourier transform:
+
+    start = X_0 / N
+    a_m   =  2 Re(X_m) / N      (coefficient of cos(m*omega*t))
+    b_m   = -2 Im(X_m) / N      (coefficient of sin(m*omega*t))
+
+This takes O(N log N) instead of fitting. Many sequences with the same
+number of points are transformed by one call of numpy.fft.rfft.
+"""
+
+import numpy as np
+from math import pi
+
+from sverchok.utils.geom import Spline
+from sverchok.utils.curve.fourier import SvFourierCurve
+
+def resample_closed(points, metric='DISTANCE'):
+    """
+    Resample closed point sequence to the same number of points, evenly
+    spaced in curve parameter, calculated with the specified metric.
+    Points are connected linearly.
+    """
+    n = len(points)
+    if metric == 'POINTS':
+        return points
+    closed = np.concatenate((points, points[:1]))
+    tknots = Spline.create_knots(closed, metric=metric)
+    tknots = tknots / tknots[-1]
+    ts = np.linspace(0.0, 1.0, num=n, endpoint=False)
+    return np.stack([np.interp(ts, tknots, closed[:,i]) for i in range(3)], axis=1)
+
+def prepare_fft_points(points, metric='DISTANCE'):
+    """
+    Drop the duplicated closing point, if any, and resample to even
+    parametrization.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) > 2 and np.allclose(points[0], points[-1]):
+        points = points[:-1]
+    return resample_closed(points, metric)
+
+def fft_amplitudes(points, degree):
+    """
+    points: np.array of shape (n_curves, n_points, 3): closed sequences,
+    evenly spaced in curve parameter.
+    Returns start points of shape (n_curves, 3) and amplitudes of shape
+    (n_curves, 2*degree, 3), in the order used by SvFourierCurve:
+    cos(omega*t), sin(omega*t), cos(2*omega*t), ...
+    """
+    n_curves, n_points = points.shape[:2]
+    max_degree = (n_points - 1) // 2
+    if degree > max_degree:
+        raise Exception(f"Degree {degree} is too high for {n_points} points; maximum is {max_degree}")
+    spectrum = np.fft.rfft(points, axis=1) / n_points
+    starts = spectrum[:,0].real
+    coeffs = np.empty((n_curves, 2*degree, 3))
+    coeffs[:,0::2] = 2 * spectrum[:,1:degree+1].real
+    coeffs[:,1::2] = -2 * spectrum[:,1:degree+1].imag
+    return starts, coeffs
+
+def approximate_fft(points_list, degree, metric='DISTANCE'):
+    """
+    Approximate several closed point sequences by Fourier curves with
+    omega = 2*pi. Sequences having the same number of points (after
+    dropping duplicated closing points) are processed in one batch.
+    Returns list of SvFourierCurve.
+    """
+    prepared = [prepare_fft_points(points, metric) for points in points_list]
+    groups = dict()
+    for i, points in enumerate(prepared):
+        groups.setdefault(len(points), []).append(i)
+
+    curves = [None] * len(prepared)
+    for idxs in groups.values():
+        starts, coeffs = fft_amplitudes(np.array([prepared[i] for i in idxs]), degree)
+        for i, start, curve_coeffs in zip(idxs, starts, coeffs):
+            curves[i] = SvFourierCurve(2*pi, start, curve_coeffs)
+    return curves
+
@@ -0,0 +1,133 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Batched solving of NURBS curve goals.
+
+When many curves with the same degree, knotvector and weights have to pass
+through points at the same parameter values, the linear systems for all of
+them share one matrix; only the right-hand sides (target points) differ.
+So the matrix is pseudo-inverted once, and the pseudo-inverse is applied to
+all right-hand sides stacked together.
+
+Only goal lists consisting of SvNurbsCurvePoints goals are supported here;
+other goal types should be solved by SvNurbsCurveSolver one by one.
+"""
+
+import numpy as np
+
+from sverchok.utils.nurbs_common import SvNurbsBasisFunctions
+from sverchok.utils.curve.nurbs import SvNurbsMaths
+from sverchok.utils.curve import knotvector as sv_knotvector
+from sverchok.utils.curve.nurbs_solver import SvNurbsCurvePoints
+
+def is_batch_solvable(goals):
+    """
+    Check if the list of goals can be solved by SvNurbsCurveBatchSolver.
+    """
+    if not goals:
+        return False
+    for goal in goals:
+        if not isinstance(goal, SvNurbsCurvePoints):
+            return False
+        if getattr(goal, 'relative_u', False):
+            return False
+    return True
+
+def goals_key(goals):
+    """
+    Hashable key which is equal for goal lists which produce the same
+    equations matrix (but possibly different right-hand sides).
+    """
+    key = []
+    for goal in goals:
+        weights = goal.weights
+        if weights is not None:
+            weights = tuple(np.broadcast_to(weights, np.shape(goal.us)).tolist())
+        key.append((tuple(np.asarray(goal.us).tolist()), weights, goal.relative))
+    return tuple(key)
+
+class SvNurbsCurveBatchSolver(object):
+    """
+    Solver for many NURBS curves which share degree, knotvector, weights and
+    structure of goals. Usage:
+
+        solver = SvNurbsCurveBatchSolver(degree, n_cpts, knotvector, weights)
+        curves = solver.solve(goal_lists, src_curves)
+
+    The equations matrix and its pseudo-inverse are calculated on the first
+    call and reused for subsequent ones.
+    """
+    def __init__(self, degree, n_cpts, knotvector=None, weights=None):
+        self.degree = degree
+        self.n_cpts = n_cpts
+        if knotvector is None:
+            knotvector = sv_knotvector.generate(degree, n_cpts)
+        self.knotvector = np.asarray(knotvector)
+        if weights is None:
+            weights = np.ones((n_cpts,))
+        self.weights = np.asarray(weights)
+        self.key = None
+        self.matrix = None
+        self.pinv = None
+
+    def _basis_matrix(self, ts):
+        basis = SvNurbsBasisFunctions(self.knotvector)
+        ns = np.array([basis.function(i, self.degree)(ts) for i in range(self.n_cpts)]).T
+        ns = ns * self.weights[np.newaxis,:]
+        denominator = ns.sum(axis=1, keepdims=True)
+        denominator[denominator == 0] = 1.0
+        return ns / denominator
+
+    def _factorize(self, goals):
+        key = goals_key(goals)
+        if key == self.key:
+            return
+        ts = np.concatenate([np.asarray(goal.us) for goal in goals])
+        row_weights = []
+        for goal in goals:
+            n = len(goal.us)
+            if goal.weights is None:
+                row_weights.append(np.ones((n,)))
+            else:
+                row_weights.append(np.broadcast_to(np.asarray(goal.weights, dtype=np.float64), (n,)))
+        self.row_scale = np.sqrt(np.concatenate(row_weights))[:,np.newaxis]
+        self.matrix = self._basis_matrix(ts)
+        self.pinv = np.linalg.pinv(self.row_scale * self.matrix)
+        self.key = key
+
+    def solve(self, goal_lists, src_curves=None):
+        """
+        goal_lists: list of goal lists, all with equal goals_key().
+        src_curves: None or list of source NURBS curves (one per goal list).
+        Returns list of NURBS curves.
+        """
+        if src_curves is None:
+            src_curves = [None] * len(goal_lists)
+        self._factorize(goal_lists[0])
+        n_curves = len(goal_lists)
+
+        # Right-hand sides: shape (n_curves, n_equations, 3)
+        rhs = np.array([np.concatenate([np.asarray(goal.vectors) for goal in goals]) for goals in goal_lists])
+        relative = np.concatenate([np.full((len(goal.us),), goal.relative) for goal in goal_lists[0]])
+
+        src_cpts = np.zeros((n_curves, self.n_cpts, 3))
+        for i, src_curve in enumerate(src_curves):
+            if src_curve is not None:
+                src_cpts[i] = src_curve.get_control_points()
+
+        # Solve for displacement of control points from the source curve
+        # (if any): absolute goals are converted to displacements.
+        src_values = np.matmul(self.matrix[np.newaxis,:,:], src_cpts)
+        rhs = np.where(relative[np.newaxis,:,np.newaxis], rhs, rhs - src_values)
+        d_cpts = np.matmul(self.pinv[np.newaxis,:,:], self.row_scale[np.newaxis,:,:] * rhs)
+        cpts = src_cpts + d_cpts
+
+        return [SvNurbsMaths.build(SvNurbsMaths.NATIVE,
+                        self.degree, self.knotvector,
+                        curve_cpts, self.weights) for curve_cpts in cpts]
+
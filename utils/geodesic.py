@@ -9,8 +9,13 @@ import numpy as np
 
 from sverchok.utils.geom import Spline, CubicSpline
 from sverchok.utils.curve.splines import SvSplineCurve
+from sverchok.utils.field.rbf import SvRbfVectorField
+from sverchok.dependencies import scipy
 from sverchok_extra import logger
 
+if scipy is not None:
+    from scipy.interpolate import Rbf
+
 
 def project(surface, derivs, uv_pts, vectors):
     #uv_pts = uv_pts[1:-1]
@@ -37,7 +42,7 @@ def do_iteration(surface, uv_pts, prev_pts, step, tolerance=1e-3):
     pts = data.points
 
     if prev_pts is not None:
-        diff = (prev_pts - pts).max()
+        diff = abs(prev_pts - pts).max()
         if diff < tolerance:
             return None
         
@@ -60,6 +65,137 @@ def process(surface, pt1, pt2, n_segments, n_iterations, step, tolerance):
             break
     return uv_pts
 
+def do_batch_iteration(surface, uv_pts, step):
+    """
+    Same as do_iteration(), but for several curves at once.
+    uv_pts: np.array of shape (n_curves, n_points, 2 or 3).
+    Returns surface points of shape (n_curves, n_points, 3)
+    and updated UV points.
+    """
+    n_curves, n_points = uv_pts.shape[:2]
+    flat_uv = uv_pts.reshape((n_curves * n_points, -1))
+    data = surface.derivatives_data_array(flat_uv[:,0], flat_uv[:,1])
+    pts = data.points.reshape((n_curves, n_points, 3))
+
+    dvs = pts[:,1:] - pts[:,:-1]
+    sums = dvs[:,1:] - dvs[:,:-1]
+    sums *= step
+
+    u_tangents, v_tangents = data.unit_tangents()
+    u_tangents = u_tangents.reshape((n_curves, n_points, 3))[:,1:-1]
+    v_tangents = v_tangents.reshape((n_curves, n_points, 3))[:,1:-1]
+    new_uv_pts = uv_pts.copy()
+    new_uv_pts[:,1:-1,0] += (sums * u_tangents).sum(axis=2)
+    new_uv_pts[:,1:-1,1] += (sums * v_tangents).sum(axis=2)
+    return pts, new_uv_pts
+
+def relax_batch(surface, uv_pts, n_iterations, step, tolerance):
+    """
+    Run relaxation iterations for several curves at once.
+    uv_pts: np.array of shape (n_curves, n_points, 2 or 3), initial
+    approximation; curve end points are kept fixed.
+    Each iteration evaluates the surface once for all curves which did not
+    converge yet. Returns relaxed UV points, the number of iterations
+    done for each curve, and a mask of curves which reached the tolerance.
+    """
+    uv_pts = uv_pts.copy()
+    n_curves, n_points = uv_pts.shape[:2]
+    prev_pts = np.empty((n_curves, n_points, 3))
+    iterations = np.zeros(n_curves, dtype=np.int64)
+    active = np.arange(n_curves)
+    for i in range(n_iterations):
+        if len(active) == 0:
+            break
+        pts, new_uv_pts = do_batch_iteration(surface, uv_pts[active], step)
+        iterations[active] += 1
+        if i > 0:
+            diff = abs(prev_pts[active] - pts).max(axis=(1,2))
+            not_converged = diff >= tolerance
+        else:
+            not_converged = np.ones(len(active), dtype=bool)
+        prev_pts[active] = pts
+        active = active[not_converged]
+        uv_pts[active] = new_uv_pts[not_converged]
+    converged = np.ones(n_curves, dtype=bool)
+    converged[active] = False
+    return uv_pts, iterations, converged
+
+def process_batch(surface, pts1, pts2, n_segments, n_iterations, step, tolerance):
+    """
+    Relax many geodesic curves on the same surface at once.
+    pts1, pts2: arrays of shape (n_curves, 2 or 3) with UV coordinates
+    of curve end points.
+    Returns an array of shape (n_curves, n_segments, 2 or 3).
+    """
+    pts1 = np.asarray(pts1, dtype=np.float64)
+    pts2 = np.asarray(pts2, dtype=np.float64)
+    uv_pts = np.linspace(pts1, pts2, num=n_segments, axis=1)
+    uv_pts, iterations, converged = relax_batch(surface, uv_pts, n_iterations, step, tolerance)
+    n_failed = np.count_nonzero(~converged)
+    if n_failed:
+        logger.info(f"{n_failed} of {len(converged)} curves not converged after {n_iterations} iterations")
+    else:
+        logger.info(f"Stop at {iterations.max()}'th iteration")
+    return uv_pts
+
+def prolongate(uv_pts, n_points):
+    """
+    Resample polylines to another number of points, by Catmull-Rom cubic
+    interpolation with uniform parametrization.
+    uv_pts: np.array of shape (n_curves, n, k).
+    Returns an array of shape (n_curves, n_points, k).
+    """
+    n = uv_pts.shape[1]
+    # Extend each polyline by one mirrored point at each end
+    first = 2*uv_pts[:,:1] - uv_pts[:,1:2]
+    last = 2*uv_pts[:,-1:] - uv_pts[:,-2:-1]
+    ext = np.concatenate((first, uv_pts, last), axis=1)
+
+    ts = np.linspace(0, n-1, num=n_points)
+    idxs = np.minimum(np.floor(ts).astype(np.int64), n-2)
+    s = (ts - idxs)[np.newaxis, :, np.newaxis]
+    p0, p1, p2, p3 = ext[:,idxs], ext[:,idxs+1], ext[:,idxs+2], ext[:,idxs+3]
+    return 0.5 * (2*p1 + (p2 - p0)*s
+                    + (2*p0 - 5*p1 + 4*p2 - p3)*s**2
+                    + (3*p1 - p0 - 3*p2 + p3)*s**3)
+
+def multilevel_sizes(n_segments, min_points=5):
+    """
+    Numbers of points at each level of multilevel relaxation,
+    from the coarsest to the finest.
+    """
+    sizes = [n_segments]
+    while sizes[-1] >= 2*min_points:
+        sizes.append((sizes[-1] + 1) // 2)
+    return list(reversed(sizes))
+
+def process_multilevel(surface, pts1, pts2, n_segments, n_iterations, step, tolerance, level_iterations=20, min_points=5):
+    """
+    Coarse-to-fine version of process_batch().
+    Curves are relaxed with a small number of points first (up to
+    n_iterations iterations); then they are prolongated to finer levels by
+    cubic interpolation, and at each finer level only up to
+    level_iterations smoothing iterations are done, since the interpolated
+    approximation is already close to the solution.
+    Returns an array of shape (n_curves, n_segments, 2 or 3) and a list of
+    (number of points, maximum number of iterations done) for each level.
+    """
+    pts1 = np.asarray(pts1, dtype=np.float64)
+    pts2 = np.asarray(pts2, dtype=np.float64)
+    sizes = multilevel_sizes(n_segments, min_points)
+    uv_pts = np.linspace(pts1, pts2, num=sizes[0], axis=1)
+    stats = []
+    for level, n_points in enumerate(sizes):
+        if level == 0:
+            max_iterations = n_iterations
+        else:
+            max_iterations = level_iterations
+            uv_pts = prolongate(uv_pts, n_points)
+        uv_pts, iterations, _ = relax_batch(surface, uv_pts, max_iterations, step, tolerance)
+        stats.append((n_points, int(iterations.max())))
+        logger.debug(f"Level #{level}: {n_points} points, {iterations.max()} iterations")
+    return uv_pts, stats
+
 def mk_curve(surface, uv_pts):
     pts = surface.evaluate_array(uv_pts[:,0], uv_pts[:,1])
     tknots = Spline.create_knots(pts)
@@ -71,3 +207,185 @@ def calculate_geodesic_curve(surface, point1, point2, n_points, iterations, step
     curve = mk_curve(surface, uv_pts)
     return uv_pts.tolist(), curve
 
+def _uv_vectors(du, dv, vectors):
+    """
+    Find UV-space vectors (a, b) such that a*du + b*dv is the closest to
+    given 3D vectors (least squares, per point).
+    """
+    E = (du * du).sum(axis=1)
+    F = (du * dv).sum(axis=1)
+    G = (dv * dv).sum(axis=1)
+    p = (vectors * du).sum(axis=1)
+    q = (vectors * dv).sum(axis=1)
+    det = E*G - F*F
+    return np.stack(((G*p - F*q) / det, (E*q - F*p) / det), axis=1)
+
+def _transport(directions, normals):
+    """
+    Project unit vectors to tangent planes and normalize them.
+    """
+    directions = directions - (directions * normals).sum(axis=1)[:,np.newaxis] * normals
+    return directions / np.linalg.norm(directions, axis=1, keepdims=True)
+
+class GeodesicFan(object):
+    """
+    Result of shoot_geodesics(). All arrays have shape (n_rays, n_steps+1, 3).
+    After a ray leaves the surface domain, its last valid point is repeated
+    till the end of the array; `lengths` holds the number of valid points of
+    each ray (at least 2).
+    """
+    def __init__(self, angles, uv_points, surface_points, orig_points, lengths):
+        self.angles = angles
+        self.uv_points = uv_points
+        self.surface_points = surface_points
+        self.orig_points = orig_points
+        self.lengths = lengths
+
+    def valid_mask(self):
+        n_points = self.uv_points.shape[1]
+        return np.arange(n_points)[np.newaxis,:] < self.lengths[:,np.newaxis]
+
+    def get_uv_lines(self):
+        return [uv[:k] for uv, k in zip(self.uv_points, self.lengths)]
+
+    def get_all_uv_points(self):
+        return self.uv_points[self.valid_mask()]
+
+    def get_all_surface_points(self):
+        return self.surface_points[self.valid_mask()]
+
+    def get_all_orig_points(self):
+        return self.orig_points[self.valid_mask()]
+
+def shoot_geodesics(surface, starts, angles, target_radius, n_steps, closed_u=False, closed_v=False):
+    """
+    Solve Cauchy problem for many geodesics at once: for each ray, start at
+    the point starts[i] (UV coordinates) in the direction defined by
+    angles[i], and walk the distance target_radius in n_steps steps.
+
+    Angles are measured in the tangent plane, from the unit U tangent
+    towards cross(U tangent, normal), the same way as calc_angles() of
+    Geodesic Cauchy node does.
+
+    All rays are integrated as one vectorized system with shared step size
+    (midpoint method: each step evaluates the surface twice for all rays).
+    Rays which leave the surface domain along non-closed directions are
+    stopped.
+
+    Returns GeodesicFan. Orig points are the corresponding points of the
+    tangent plane in polar coordinates around the origin.
+    """
+    starts = np.asarray(starts, dtype=np.float64)
+    angles = np.asarray(angles, dtype=np.float64)
+    n_rays = len(starts)
+    h = target_radius / n_steps
+    u_min, u_max = surface.get_u_min(), surface.get_u_max()
+    v_min, v_max = surface.get_v_min(), surface.get_v_max()
+
+    def wrap(uv):
+        if closed_u:
+            uv[:,0] = u_min + (uv[:,0] - u_min) % (u_max - u_min)
+        if closed_v:
+            uv[:,1] = v_min + (uv[:,1] - v_min) % (v_max - v_min)
+        return uv
+
+    def inside(uv):
+        us, vs = uv[:,0], uv[:,1]
+        return (us >= u_min) & (us <= u_max) & (vs >= v_min) & (vs <= v_max)
+
+    uv = starts[:,:2].copy()
+    data = surface.derivatives_data_array(uv[:,0], uv[:,1])
+    normals = data.unit_normals()
+    du1, _ = data.unit_tangents()
+    dy = np.cross(du1, normals)
+    directions = np.cos(angles)[:,np.newaxis] * du1 + np.sin(angles)[:,np.newaxis] * dy
+    du, dv = data.du.copy(), data.dv.copy()
+
+    uv_out = np.zeros((n_rays, n_steps+1, 3))
+    uv_out[:,0,:2] = uv
+    pts_out = np.empty((n_rays, n_steps+1, 3))
+    pts_out[:,0] = data.points
+    lengths = np.full(n_rays, n_steps+1)
+    active = np.arange(n_rays)
+
+    for i in range(n_steps):
+        if len(active) == 0:
+            break
+        d = directions[active]
+        half_uv = wrap(uv[active] + 0.5 * h * _uv_vectors(du[active], dv[active], d))
+        half = surface.derivatives_data_array(half_uv[:,0], half_uv[:,1])
+        half_d = _transport(d, half.unit_normals())
+        new_uv = wrap(uv[active] + h * _uv_vectors(half.du, half.dv, half_d))
+
+        ok = inside(new_uv)
+        if i == 0 and not ok.all():
+            # Keep the first step of rays which leave the domain at once,
+            # clipped to the domain, so that each ray has at least two points
+            stopped = active[~ok]
+            clipped = np.clip(new_uv[~ok], [u_min, v_min], [u_max, v_max])
+            uv_out[stopped,1,:2] = clipped
+            pts_out[stopped,1] = surface.evaluate_array(clipped[:,0], clipped[:,1])
+            lengths[stopped] = 2
+        else:
+            lengths[active[~ok]] = i+1
+        active, new_uv, half_d = active[ok], new_uv[ok], half_d[ok]
+        if len(active) == 0:
+            break
+
+        new = surface.derivatives_data_array(new_uv[:,0], new_uv[:,1])
+        uv[active] = new_uv
+        du[active], dv[active] = new.du, new.dv
+        directions[active] = _transport(half_d, new.unit_normals())
+        uv_out[active,i+1,:2] = new_uv
+        pts_out[active,i+1] = new.points
+
+    # Repeat the last valid point of stopped rays
+    idxs = np.minimum(np.arange(n_steps+1)[np.newaxis,:], lengths[:,np.newaxis]-1)
+    uv_out = np.take_along_axis(uv_out, idxs[:,:,np.newaxis], axis=1)
+    pts_out = np.take_along_axis(pts_out, idxs[:,:,np.newaxis], axis=1)
+
+    rs = np.linspace(0.0, target_radius, num=n_steps+1)[np.newaxis,:]
+    rs = np.minimum(rs, (lengths[:,np.newaxis]-1) * h)
+    orig_out = np.zeros((n_rays, n_steps+1, 3))
+    orig_out[:,:,0] = rs * np.cos(angles)[:,np.newaxis]
+    orig_out[:,:,1] = rs * np.sin(angles)[:,np.newaxis]
+
+    return GeodesicFan(angles, uv_out, pts_out, orig_out, lengths)
+
+class FanExponentialMap(object):
+    """
+    Polar exponential map built from a fan of geodesics, which all start
+    at the same center point. Same interface as exponential map objects
+    of sverchok.utils.geodesic.
+    """
+    def __init__(self, fan):
+        self.fan = fan
+        # All rays share the start point; take it only once, otherwise
+        # RBF interpolation matrix would be singular.
+        valid = fan.valid_mask()
+        valid[:,0] = False
+        self.orig_points = np.concatenate((fan.orig_points[:1,0], fan.orig_points[valid]))
+        self.uv_points = np.concatenate((fan.uv_points[:1,0], fan.uv_points[valid]))
+        self.surface_points = np.concatenate((fan.surface_points[:1,0], fan.surface_points[valid]))
+
+    def _rbf_field(self, values, function):
+        xs, ys, zs = self.orig_points.T
+        rbf = Rbf(xs, ys, zs, values, function=function, mode='N-D')
+        return SvRbfVectorField(rbf, relative=False)
+
+    def get_uv_field(self, function='thin_plate'):
+        return self._rbf_field(self.uv_points, function)
+
+    def get_field(self, function='thin_plate'):
+        return self._rbf_field(self.surface_points, function)
+
+def exponential_map_fan(surface, center, radius, radius_steps=50, angle_steps=16, closed_u=False, closed_v=False):
+    """
+    Vectorized version of polar exponential map: all angle_steps geodesics
+    from the center are shot by one call of shoot_geodesics().
+    """
+    angles = np.linspace(0, 2*np.pi, num=angle_steps, endpoint=False)
+    starts = np.repeat(np.asarray(center, dtype=np.float64)[np.newaxis,:], angle_steps, axis=0)
+    fan = shoot_geodesics(surface, starts, angles, radius, radius_steps,
+                          closed_u = closed_u, closed_v = closed_v)
+    return FanExponentialMap(fan)
@@ -0,0 +1,82 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+import numpy as np
+
+from sverchok.utils.field.vector import SvVectorField
+from sverchok.dependencies import scipy
+
+if scipy is not None:
+    from scipy.interpolate import RBFInterpolator, LinearNDInterpolator, NearestNDInterpolator
+
+LOCAL_RBF = 'LOCAL_RBF'
+LINEAR = 'LINEAR'
+
+class SvExInterpolatedVectorField(SvVectorField):
+    """
+    Vector field, which is defined by values at a set of points and
+    interpolated between them with local support:
+
+    * LOCAL_RBF: thin plate spline RBF, fitted to `neighbors` nearest known
+      points of each evaluated point (scipy.interpolate.RBFInterpolator).
+    * LINEAR: barycentric interpolation on Delaunay triangulation of known
+      points; outside of their convex hull, the value of the nearest known
+      point is used.
+
+    Unlike global RBF, building cost does not grow as O(N^3), and each
+    evaluation takes only nearby points into account.
+
+    If all known points lie in one plane z = const (which is the case for
+    exponential maps), interpolation is done in XY only.
+    The interpolator is built on first evaluation.
+    """
+    def __init__(self, points, values, method=LOCAL_RBF, neighbors=16):
+        points = np.asarray(points, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        # Coinciding points would make interpolation matrices singular
+        points, idxs = np.unique(points, axis=0, return_index=True)
+        self.values = values[idxs]
+        self.planar = np.ptp(points[:,2]) < 1e-12
+        self.points = points[:,:2] if self.planar else points
+        self.method = method
+        self.neighbors = neighbors
+        self.interpolator = None
+        self.__description__ = "Interpolated"
+
+    def _get_interpolator(self):
+        if self.interpolator is None:
+            if self.method == LOCAL_RBF:
+                neighbors = min(self.neighbors, len(self.points))
+                self.interpolator = RBFInterpolator(self.points, self.values,
+                                        neighbors = neighbors,
+                                        kernel = 'thin_plate_spline')
+            elif self.method == LINEAR:
+                linear = LinearNDInterpolator(self.points, self.values)
+                nearest = NearestNDInterpolator(self.points, self.values)
+                def interpolate(pts):
+                    result = linear(pts)
+                    outside = np.isnan(result).any(axis=1)
+                    if outside.any():
+                        result[outside] = nearest(pts[outside])
+                    return result
+                self.interpolator = interpolate
+            else:
+                raise Exception(f"Unsupported interpolation method: {self.method}")
+        return self.interpolator
+
+    def evaluate_grid(self, xs, ys, zs):
+        if self.planar:
+            pts = np.stack((xs, ys), axis=1)
+        else:
+            pts = np.stack((xs, ys, zs), axis=1)
+        values = self._get_interpolator()(pts)
+        return values[:,0], values[:,1], values[:,2]
+
+    def evaluate(self, x, y, z):
+        vx, vy, vz = self.evaluate_grid(np.array([x]), np.array([y]), np.array([z]))
+        return np.array([vx[0], vy[0], vz[0]])
+
@@ -13,7 +13,23 @@ if skimage is not None:
     from skimage import measure
 
 
-def intersect_surface_plane_msquares(surface, plane, need_points = True, samples_u=50, samples_v=50):
+def intersect_surface_plane_msquares(surface, plane, need_points = True, samples_u=50, samples_v=50, **refine_args):
+    return intersect_surface_planes_msquares(surface, [plane],
+                need_points = need_points,
+                samples_u = samples_u, samples_v = samples_v,
+                **refine_args)[0]
+
+def intersect_surface_planes_msquares(surface, planes, need_points = True, samples_u=50, samples_v=50,
+        refine = False, tolerance = 1e-6, max_iterations = 10, chord_tolerance = None, max_subdivisions = 3):
+    """
+    Intersect the surface with several planes at once.
+    The surface is sampled only once; signed distances from all sample
+    points to all planes are calculated with one matrix product, and
+    marching squares are run for each plane on the shared grid.
+    If refine is True, contours are refined by refine_plane_contours(),
+    see it for meaning of other parameters.
+    Returns a list of (uv_points, points) pairs, one per plane.
+    """
     u_min, u_max = surface.get_u_min(), surface.get_u_max()
     v_min, v_max = surface.get_v_min(), surface.get_v_max()
     u_range = np.linspace(u_min, u_max, num=samples_u)
@@ -22,34 +38,153 @@ def intersect_surface_plane_msquares(surface, plane, need_points = True, samples
     us, vs = us.flatten(), vs.flatten()
 
     surface_points = surface.evaluate_array(us, vs)
-    normal = np.array(plane.normal)
-    p2 = np.apply_along_axis(lambda p : normal.dot(p), 1, surface_points)
-    data = p2 + plane.d
-    data = data.reshape((samples_u, samples_v))
-
-    contours = measure.find_contours(data, level=0.0)
+    normals = np.array([plane.normal for plane in planes])
+    ds = np.array([plane.d for plane in planes])
+    data = surface_points @ normals.T + ds
+    data = data.T.reshape((len(planes), samples_u, samples_v))
 
     u_size = (u_max - u_min) / samples_u
     v_size = (v_max - v_min) / samples_v
 
-    uv_points, _, _ = make_contours(samples_u, samples_v,
-                    u_min, u_size, v_min, v_size,
-                    0,
-                    contours,
-                    make_faces = False,
-                    connect_bounds = False)
+    uv_points_per_plane = []
+    for plane_data in data:
+        contours = measure.find_contours(plane_data, level=0.0)
+
+        uv_points, _, _ = make_contours(samples_u, samples_v,
+                        u_min, u_size, v_min, v_size,
+                        0,
+                        contours,
+                        make_faces = False,
+                        connect_bounds = False)
+        uv_points_per_plane.append(uv_points)
+
+    if refine:
+        contour_normals = [normal for normal, uv_points in zip(normals, uv_points_per_plane) for uv_i in uv_points]
+        contour_ds = [d for d, uv_points in zip(ds, uv_points_per_plane) for uv_i in uv_points]
+        all_contours = [uv_i for uv_points in uv_points_per_plane for uv_i in uv_points]
+        all_contours, all_points = refine_plane_contours(surface, contour_normals, contour_ds, all_contours,
+                                        tolerance = tolerance,
+                                        max_iterations = max_iterations,
+                                        chord_tolerance = chord_tolerance,
+                                        max_subdivisions = max_subdivisions)
+        result = []
+        start = 0
+        for uv_points in uv_points_per_plane:
+            end = start + len(uv_points)
+            points = all_points[start:end] if need_points else []
+            result.append((all_contours[start:end], points))
+            start = end
+        return result
 
     if need_points:
-        points = []
-        for uv_i in uv_points:
-            us_i = [p[0] for p in uv_i]
-            vs_i = [p[1] for p in uv_i]
-            ps = surface.evaluate_array(np.array(us_i), np.array(vs_i)).tolist()
-            points.append(ps)
+        # Evaluate points of all contours of all planes by one call
+        all_uvs = [np.asarray(uv_i)[:,:2] for uv_points in uv_points_per_plane for uv_i in uv_points if len(uv_i)]
+        if all_uvs:
+            all_uvs = np.concatenate(all_uvs)
+            all_points = surface.evaluate_array(all_uvs[:,0], all_uvs[:,1]).tolist()
+        else:
+            all_points = []
+        points_per_plane = []
+        start = 0
+        for uv_points in uv_points_per_plane:
+            points = []
+            for uv_i in uv_points:
+                points.append(all_points[start : start + len(uv_i)])
+                start += len(uv_i)
+            points_per_plane.append(points)
     else:
-        points = []
+        points_per_plane = [[] for plane in planes]
+
+    return list(zip(uv_points_per_plane, points_per_plane))
 
-    return uv_points, points
+def project_uv_to_planes(surface, uvs, normals, ds, tolerance=1e-6, max_iterations=10):
+    """
+    Move UV points so that corresponding surface points lie on the planes,
+    by Newton iterations for the equation n . S(u,v) + d = 0, done for all
+    points at once. Each point has its own plane: normals is an array of
+    shape (n, 3), ds has shape (n,). Since there is one equation for two
+    unknowns, the minimum-norm Newton step (along the gradient in UV space)
+    is used.
+    """
+    u_min, u_max = surface.get_u_min(), surface.get_u_max()
+    v_min, v_max = surface.get_v_min(), surface.get_v_max()
+    uvs = np.array(uvs, dtype=np.float64)
+    active = np.arange(len(uvs))
+    for i in range(max_iterations):
+        if len(active) == 0:
+            break
+        data = surface.derivatives_data_array(uvs[active,0], uvs[active,1])
+        ns = normals[active]
+        fs = (data.points * ns).sum(axis=1) + ds[active]
+        gus = (data.du * ns).sum(axis=1)
+        gvs = (data.dv * ns).sum(axis=1)
+        g2s = gus*gus + gvs*gvs
+        good = (abs(fs) >= tolerance) & (g2s > 1e-24)
+        active, fs, gus, gvs, g2s = active[good], fs[good], gus[good], gvs[good], g2s[good]
+        uvs[active,0] = np.clip(uvs[active,0] - fs * gus / g2s, u_min, u_max)
+        uvs[active,1] = np.clip(uvs[active,1] - fs * gvs / g2s, v_min, v_max)
+    return uvs
+
+def refine_plane_contours(surface, normals, ds, uv_contours, tolerance=1e-6, max_iterations=10, chord_tolerance=None, max_subdivisions=3):
+    """
+    Refine approximate contours of surface / plane intersection (for
+    example, ones produced by marching squares).
+    Each vertex is moved to the exact intersection by project_uv_to_planes().
+    If chord_tolerance is provided, then for each segment, the middle point
+    is projected to the intersection as well; if it deviates from the
+    middle of the chord by more than chord_tolerance, it is inserted into
+    the contour. This is repeated up to max_subdivisions times.
+    All vertices of all contours are processed at once.
+
+    normals, ds: plane of each contour.
+    Returns refined UV contours and contours of surface points.
+    """
+    if len(uv_contours) == 0:
+        return [], []
+    counts = np.array([len(uv_i) for uv_i in uv_contours])
+    contour_idxs = np.repeat(np.arange(len(uv_contours)), counts)
+    normals = np.asarray(normals, dtype=np.float64)[contour_idxs]
+    ds = np.asarray(ds, dtype=np.float64)[contour_idxs]
+    uvs = np.concatenate([np.asarray(uv_i, dtype=np.float64).reshape((-1,3))[:,:2] for uv_i in uv_contours])
+
+    uvs = project_uv_to_planes(surface, uvs, normals, ds,
+                tolerance = tolerance, max_iterations = max_iterations)
+    points = surface.evaluate_array(uvs[:,0], uvs[:,1])
+
+    if chord_tolerance is not None:
+        for i in range(max_subdivisions):
+            # Segments connect consecutive vertices of the same contour
+            segments = np.flatnonzero(contour_idxs[:-1] == contour_idxs[1:])
+            if len(segments) == 0:
+                break
+            mid_uvs = 0.5 * (uvs[segments] + uvs[segments+1])
+            mid_uvs = project_uv_to_planes(surface, mid_uvs, normals[segments], ds[segments],
+                        tolerance = tolerance, max_iterations = max_iterations)
+            mid_points = surface.evaluate_array(mid_uvs[:,0], mid_uvs[:,1])
+            chord_mids = 0.5 * (points[segments] + points[segments+1])
+            deviation = np.linalg.norm(mid_points - chord_mids, axis=1)
+            bad = deviation > chord_tolerance
+            if not bad.any():
+                break
+            positions = segments[bad] + 1
+            uvs = np.insert(uvs, positions, mid_uvs[bad], axis=0)
+            points = np.insert(points, positions, mid_points[bad], axis=0)
+            normals = np.insert(normals, positions, normals[segments[bad]], axis=0)
+            ds = np.insert(ds, positions, ds[segments[bad]])
+            contour_idxs = np.insert(contour_idxs, positions, contour_idxs[segments[bad]])
+
+    n_contours = len(uv_contours)
+    uv_contours = [[] for i in range(n_contours)]
+    point_contours = [[] for i in range(n_contours)]
+    if len(uvs) == 0:
+        return uv_contours, point_contours
+    splits = np.flatnonzero(contour_idxs[:-1] != contour_idxs[1:]) + 1
+    uvs3 = np.zeros((len(uvs), 3))
+    uvs3[:,:2] = uvs
+    for i, uv_i, ps in zip(contour_idxs[np.insert(splits, 0, 0)], np.split(uvs3, splits), np.split(points, splits)):
+        uv_contours[i] = uv_i.tolist()
+        point_contours[i] = ps.tolist()
+    return uv_contours, point_contours
 
 def intersect_surface_plane_uv(surface, plane, samples_u = 50, samples_v = 50, init_samples=10, ortho_samples=10, tolerance=1e-3, maxiter=50):
     # Unsorted!
@@ -73,3 +208,106 @@ def intersect_surface_plane_uv(surface, plane, samples_u = 50, samples_v = 50, i
         points.extend(ps)
     return [tuple(p) for p in points]
 
+def intersect_surface_plane_isolines(surface, plane, samples_u = 50, samples_v = 50, tolerance=1e-6, maxiter=50, need_polylines=True):
+    """
+    Vectorized version of intersect_surface_plane_uv().
+    All U and V iso-lines are evaluated on one grid; brackets, where the
+    signed distance to the plane changes sign between neighbouring grid
+    points, are detected in bulk, and all of them are refined together by
+    regula falsi (Illinois) iterations.
+
+    Returns UV points and surface points. If need_polylines is True (this
+    requires skimage), points are returned as a list of sorted, connected
+    polylines; otherwise, as one unsorted list.
+    """
+    u_min, u_max = surface.get_u_min(), surface.get_u_max()
+    v_min, v_max = surface.get_v_min(), surface.get_v_max()
+    u_range = np.linspace(u_min, u_max, num=samples_u)
+    v_range = np.linspace(v_min, v_max, num=samples_v)
+    us, vs = np.meshgrid(u_range, v_range, indexing='ij')
+
+    normal = np.array(plane.normal)
+    def signed_distance(us, vs):
+        return surface.evaluate_array(us, vs) @ normal + plane.d
+
+    data = signed_distance(us.flatten(), vs.flatten()).reshape((samples_u, samples_v))
+    positive = data > 0
+
+    # Brackets along U iso-lines (V changes) and along V iso-lines (U changes)
+    u_line_i, u_line_j = np.nonzero(positive[:,:-1] != positive[:,1:])
+    v_line_i, v_line_j = np.nonzero(positive[:-1,:] != positive[1:,:])
+    n_u, n_v = len(u_line_i), len(v_line_i)
+
+    # For U iso-lines the unknown is v, for V iso-lines it is u
+    fixed = np.concatenate((u_range[u_line_i], v_range[v_line_j]))
+    ts_a = np.concatenate((v_range[u_line_j], u_range[v_line_i]))
+    ts_b = np.concatenate((v_range[u_line_j+1], u_range[v_line_i+1]))
+    fs_a = np.concatenate((data[u_line_i, u_line_j], data[v_line_i, v_line_j]))
+    fs_b = np.concatenate((data[u_line_i, u_line_j+1], data[v_line_i+1, v_line_j]))
+    is_u_line = np.arange(n_u + n_v) < n_u
+
+    def to_uv(ts, idxs):
+        us = np.where(is_u_line[idxs], fixed[idxs], ts)
+        vs = np.where(is_u_line[idxs], ts, fixed[idxs])
+        return us, vs
+
+    roots = ts_a - fs_a * (ts_b - ts_a) / (fs_b - fs_a)
+    active = np.arange(n_u + n_v)
+    for i in range(maxiter):
+        if len(active) == 0:
+            break
+        a, b = ts_a[active], ts_b[active]
+        fa, fb = fs_a[active], fs_b[active]
+        ts = b - fb * (b - a) / (fb - fa)
+        roots[active] = ts
+        fs = signed_distance(*to_uv(ts, active))
+        converged = abs(fs) < tolerance
+        # Keep the root bracketed; Illinois modification prevents
+        # one end of the bracket from sticking.
+        flip = fs * fb < 0
+        ts_a[active] = np.where(flip, b, a)
+        fs_a[active] = np.where(flip, fb, 0.5 * fa)
+        ts_b[active] = ts
+        fs_b[active] = fs
+        active = active[~converged]
+
+    root_us, root_vs = to_uv(roots, np.arange(n_u + n_v))
+    uv_points = np.zeros((n_u + n_v, 3))
+    uv_points[:,0] = root_us
+    uv_points[:,1] = root_vs
+
+    if not need_polylines:
+        points = surface.evaluate_array(root_us, root_vs)
+        return [uv_points.tolist()], [points.tolist()]
+
+    # Marching squares provide the connectivity: each contour vertex lies
+    # on a grid edge, i.e. in one of the brackets found above.
+    root_index_u = np.full((samples_u, samples_v), -1)
+    root_index_u[u_line_i, u_line_j] = np.arange(n_u)
+    root_index_v = np.full((samples_u, samples_v), -1)
+    root_index_v[v_line_i, v_line_j] = np.arange(n_u, n_u + n_v)
+
+    contours = measure.find_contours(data, level=0.0)
+    if not contours:
+        return [], []
+    lengths = [len(contour) for contour in contours]
+    rcs = np.concatenate(contours)
+    rows, cols = rcs[:,0], rcs[:,1]
+    on_u_line = abs(rows - np.round(rows)) < 1e-9
+    int_rows = np.clip(np.where(on_u_line, np.round(rows), np.floor(rows)).astype(np.int64), 0, samples_u-1)
+    int_cols = np.clip(np.where(on_u_line, np.floor(cols), np.round(cols)).astype(np.int64), 0, samples_v-1)
+    idxs = np.where(on_u_line, root_index_u[int_rows, int_cols], root_index_v[int_rows, int_cols])
+
+    # Vertices which could not be matched with a bracket (grid points
+    # exactly on the plane) are taken from the grid as is.
+    contour_uvs = np.zeros((len(rcs), 3))
+    contour_uvs[:,0] = u_min + rows * (u_max - u_min) / (samples_u - 1)
+    contour_uvs[:,1] = v_min + cols * (v_max - v_min) / (samples_v - 1)
+    found = idxs >= 0
+    contour_uvs[found] = uv_points[idxs[found]]
+
+    points = surface.evaluate_array(contour_uvs[:,0], contour_uvs[:,1])
+    splits = np.cumsum(lengths)[:-1]
+    uv_polylines = [uv_i.tolist() for uv_i in np.split(contour_uvs, splits)]
+    polylines = [ps.tolist() for ps in np.split(points, splits)]
+    return uv_polylines, polylines
@@ -0,0 +1,179 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Search of nearest mesh faces for many points at once.
+
+Faces are split into triangles (fan triangulation); a KD-tree is built on
+triangle centroids. For each point, several triangles with nearest centroids
+are taken as candidates, and exact distances to them are calculated in bulk.
+The result is exact: if the candidates can not guarantee that the nearest
+triangle is among them, the point is checked again with more candidates.
+
+Finders are cached by contents of vertex and face buffers, so that the
+KD-tree is rebuilt only when the mesh changes.
+"""
+
+from collections import OrderedDict
+import hashlib
+
+import numpy as np
+
+from sverchok.dependencies import scipy
+
+if scipy is not None:
+    from scipy.spatial import cKDTree
+
+# Number of meshes to keep finders for
+FINDER_CACHE_SIZE = 8
+
+_finder_cache = OrderedDict()
+
+def closest_points_on_triangles(ps, as_, bs, cs):
+    """
+    Closest points on triangles (as_[i], bs[i], cs[i]) to points ps[i].
+    All arguments are arrays of shape (..., 3).
+    See C. Ericson, Real-Time Collision Detection, 5.1.5.
+    """
+    def dot(x, y):
+        return (x * y).sum(axis=-1)
+
+    ab = bs - as_
+    ac = cs - as_
+    ap = ps - as_
+    bp = ps - bs
+    cp = ps - cs
+    d1, d2 = dot(ab, ap), dot(ac, ap)
+    d3, d4 = dot(ab, bp), dot(ac, bp)
+    d5, d6 = dot(ab, cp), dot(ac, cp)
+    va = d3*d6 - d5*d4
+    vb = d5*d2 - d1*d6
+    vc = d1*d4 - d3*d2
+
+    def safe(x):
+        return np.where(x == 0, 1.0, x)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        denom = 1.0 / safe(va + vb + vc)
+        result = as_ + ab * (vb * denom)[...,np.newaxis] + ac * (vc * denom)[...,np.newaxis]
+
+        # Voronoi regions of edges and vertices; checked in reverse order of
+        # priority, so that later assignments win
+        bc_mask = (va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0)
+        t = (d4 - d3) / safe((d4 - d3) + (d5 - d6))
+        result = np.where(bc_mask[...,np.newaxis], bs + (cs - bs) * t[...,np.newaxis], result)
+
+        ac_mask = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+        t = d2 / safe(d2 - d6)
+        result = np.where(ac_mask[...,np.newaxis], as_ + ac * t[...,np.newaxis], result)
+
+        c_mask = (d6 >= 0) & (d5 <= d6)
+        result = np.where(c_mask[...,np.newaxis], cs, result)
+
+        ab_mask = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+        t = d1 / safe(d1 - d3)
+        result = np.where(ab_mask[...,np.newaxis], as_ + ab * t[...,np.newaxis], result)
+
+        b_mask = (d3 >= 0) & (d4 <= d3)
+        result = np.where(b_mask[...,np.newaxis], bs, result)
+
+        a_mask = (d1 <= 0) & (d2 <= 0)
+        result = np.where(a_mask[...,np.newaxis], as_, result)
+
+    return result
+
+class NearestFaceFinder(object):
+    """
+    Usage:
+
+        finder = NearestFaceFinder(verts, faces)
+        face_idxs = finder.find(points)
+    """
+    def __init__(self, verts, faces, n_candidates=8, max_chunk=1<<18):
+        self.max_chunk = max_chunk
+        self.verts = np.asarray(verts, dtype=np.float64)
+        triangles = []
+        tri_faces = []
+        for face_idx, face in enumerate(faces):
+            for i in range(1, len(face) - 1):
+                triangles.append((face[0], face[i], face[i+1]))
+                tri_faces.append(face_idx)
+        self.triangles = self.verts[np.array(triangles, dtype=np.int64).reshape((-1, 3))]
+        self.tri_faces = np.array(tri_faces, dtype=np.int64)
+        centroids = self.triangles.mean(axis=1)
+        # Maximum distance from triangle centroid to any point of the triangle
+        radiuses = np.linalg.norm(self.triangles - centroids[:,np.newaxis,:], axis=2).max(axis=1)
+        self.max_radius = radiuses.max() if len(radiuses) else 0.0
+        self.n_candidates = min(n_candidates, len(self.triangles))
+        self.kdtree = cKDTree(centroids)
+
+    def _distances(self, points, tri_idxs):
+        tris = self.triangles[tri_idxs]
+        points = np.broadcast_to(points[...,np.newaxis,:], tris.shape[:-2] + (3,))
+        closest = closest_points_on_triangles(points, tris[...,0,:], tris[...,1,:], tris[...,2,:])
+        return np.linalg.norm(points - closest, axis=-1)
+
+    def find(self, points):
+        """
+        Indexes of nearest faces for all points.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        result = np.zeros((len(points),), dtype=np.int64)
+        n_triangles = len(self.triangles)
+        pending = np.arange(len(points))
+        k = self.n_candidates
+        while len(pending):
+            # Limit the size of temporary arrays
+            chunk_size = max(1, self.max_chunk // k)
+            unsure = []
+            for start in range(0, len(pending), chunk_size):
+                chunk = pending[start : start + chunk_size]
+                centroid_dists, candidates = self.kdtree.query(points[chunk], k=k)
+                centroid_dists = centroid_dists.reshape((len(chunk), k))
+                candidates = candidates.reshape((len(chunk), k))
+
+                distances = self._distances(points[chunk], candidates)
+                best = distances.argmin(axis=1)
+                rows = np.arange(len(chunk))
+                result[chunk] = candidates[rows, best]
+
+                # Triangles which were not candidates have centroids farther
+                # than the last candidate, so they can be nearer only if the
+                # last candidate's centroid is within max_radius of the best
+                # distance. For such points, try again with more candidates.
+                sure = centroid_dists[:,-1] - self.max_radius >= distances[rows, best]
+                unsure.append(chunk[~sure])
+            if k == n_triangles:
+                break
+            pending = np.concatenate(unsure)
+            k = min(4*k, n_triangles)
+
+        return self.tri_faces[result].tolist()
+
+def mesh_key(verts, faces):
+    digest = hashlib.sha1()
+    digest.update(np.asarray(verts, dtype=np.float64).tobytes())
+    digest.update(np.array([len(face) for face in faces], dtype=np.int64).tobytes())
+    digest.update(np.array([i for face in faces for i in face], dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+def get_nearest_face_finder(verts, faces):
+    """
+    Get NearestFaceFinder for the mesh; finders are reused while the mesh
+    does not change.
+    """
+    key = mesh_key(verts, faces)
+    finder = _finder_cache.get(key)
+    if finder is None:
+        finder = NearestFaceFinder(verts, faces)
+        _finder_cache[key] = finder
+        while len(_finder_cache) > FINDER_CACHE_SIZE:
+            _finder_cache.popitem(last=False)
+    else:
+        _finder_cache.move_to_end(key)
+    return finder
+
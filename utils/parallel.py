@@ -0,0 +1,23 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+import sys
+import multiprocessing
+
+def get_pool_context():
+    """
+    Multiprocessing context for worker pools, or None if parallel
+    processing is not supported on this platform. Workers are forked, so
+    that they do not have to import Blender modules again; fork is not
+    available on Windows and is not safe on macOS.
+    """
+    if sys.platform == 'darwin':
+        return None
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return None
+    return multiprocessing.get_context('fork')
+
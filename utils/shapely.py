@@ -5,7 +5,11 @@
 # SPDX-License-Identifier: GPL3
 # License-Filename: LICENSE
 
-from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata
+from itertools import chain
+
+import numpy as np
+
+from sverchok.data_structure import get_data_nesting_level, ensure_nesting_level
 from sverchok.utils.sv_mesh_utils import polygons_to_edges
 from sverchok_extra.dependencies import shapely
 
@@ -15,7 +19,69 @@ def to_3d(pt):
     else:
         return pt
 
+def weld_vertices(coords, tolerance=None):
+    """
+    Merge coinciding points.
+    coords: array of shape (n, 3).
+    If tolerance is specified, points are merged if they fall into the same
+    cell of a grid with such step.
+    Returns array of unique vertices, in order of first appearance, and
+    index of vertex for each point.
+    """
+    # Adding zero turns -0.0 into 0.0, so that they are merged
+    coords = coords + 0.0
+    if tolerance:
+        keys = np.round(coords / tolerance) + 0.0
+    else:
+        keys = coords
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return coords[first[order]], rank[inverse.reshape((-1,))]
+
+def weld_triangles(coords):
+    """
+    Merge coinciding vertices of triangles.
+    coords: array of shape (n, 3, 3).
+    Returns vertices array and faces array of shape (n, 3).
+    """
+    verts, inverse = weld_vertices(coords.reshape((-1, 3)))
+    faces = inverse.reshape((-1, 3))
+    return verts, faces
+
+def faces_to_edges(faces):
+    """
+    Unique edges of triangular faces, as array of shape (n, 2).
+    """
+    edges = faces[:, [[0, 1], [1, 2], [2, 0]]].reshape((-1, 2))
+    return np.unique(np.sort(edges, axis=1), axis=0)
+
 def triangulate(geometry):
+    if not hasattr(shapely, 'constrained_delaunay_triangles'):
+        return triangulate_by_intersection(geometry)
+
+    tris = shapely.get_parts(shapely.constrained_delaunay_triangles(geometry))
+    if len(tris) == 0:
+        return [], [], []
+    # Each triangle is a closed ring of 4 points
+    coords = shapely.get_coordinates(tris, include_z=True).reshape((-1, 4, 3))[:, :3]
+    coords = np.nan_to_num(coords)
+    # Make all triangles counterclockwise
+    v1 = coords[:, 1, :2] - coords[:, 0, :2]
+    v2 = coords[:, 2, :2] - coords[:, 0, :2]
+    cw = v1[:, 0] * v2[:, 1] - v1[:, 1] * v2[:, 0] < 0
+    coords[cw] = coords[cw][:, ::-1]
+    verts, faces = weld_triangles(coords)
+    edges = faces_to_edges(faces)
+    return verts.tolist(), edges.tolist(), faces.tolist()
+
+def triangulate_by_intersection(geometry):
+    """
+    Triangulation for shapely versions which do not have
+    constrained_delaunay_triangles(): unconstrained Delaunay triangles are
+    intersected with the geometry one by one.
+    """
     tris = shapely.delaunay_triangles(geometry)
 
     vert_idxs = dict()
@@ -46,31 +112,22 @@ def triangulate(geometry):
     return list(vert_idxs.keys()), edges, faces
 
 def edges_only(geometry):
-    if isinstance(geometry, (shapely.LineString, shapely.LinearRing)):
-        geoms = [geometry]
-    elif isinstance(geometry, shapely.Polygon):
-        geoms = [geometry.exterior]
-    elif isinstance(geometry, shapely.MultiLineString):
-        geoms = geometry.geoms
-    elif isinstance(geometry, shapely.MultiPolygon):
-        geoms = [g.exterior for g in geometry.geoms]
+    if isinstance(geometry, (shapely.LineString, shapely.LinearRing, shapely.MultiLineString)):
+        lines = shapely.get_parts(geometry)
+    elif isinstance(geometry, (shapely.Polygon, shapely.MultiPolygon)):
+        lines = shapely.get_exterior_ring(shapely.get_parts(geometry))
     else:
-        geoms = []
+        lines = []
+    if len(lines) == 0:
+        return [], [], []
 
-    vert_idxs = dict()
-    idx = 0
-    all_edges = []
-    for geom in geoms:
-        for pt in geom.coords:
-            i = vert_idxs.get(to_3d(pt), None)
-            if i is None:
-                i = idx
-                idx += 1
-                vert_idxs[to_3d(pt)] = i
-        face = [vert_idxs[to_3d(pt)] for pt in geom.coords]
-        edges = list(zip(face, face[1:]))
-        all_edges.extend(edges)
-    return list(vert_idxs.keys()), all_edges, []
+    coords, line_idxs = shapely.get_coordinates(lines, include_z=True, return_index=True)
+    coords = np.nan_to_num(coords)
+    verts, vert_idxs = weld_vertices(coords)
+    # Edges connect consecutive points of the same line
+    same_line = line_idxs[:-1] == line_idxs[1:]
+    edges = np.stack((vert_idxs[:-1][same_line], vert_idxs[1:][same_line]), axis=1)
+    return verts.tolist(), edges.tolist(), []
 
 def to_mesh(geometry):
     if isinstance(geometry, (shapely.Polygon, shapely.MultiPolygon, shapely.GeometryCollection)):
@@ -78,31 +135,77 @@ def to_mesh(geometry):
     else:
         return edges_only(geometry)
 
+def ragged_indices(lists):
+    """
+    Flatten list of index lists.
+    Returns flat array of indices and array of list lengths.
+    """
+    lengths = np.fromiter(map(len, lists), dtype=np.int64, count=len(lists))
+    flat = np.fromiter(chain.from_iterable(lists), dtype=np.int64, count=lengths.sum())
+    return flat, lengths
+
+def mesh_to_geometries(verts, edges, faces):
+    """
+    Convert mesh to arrays of shapely geometries, without making bmesh:
+    * one Polygon per face;
+    * one LineString per wire edge (an edge which does not belong to any face);
+    * one Point per vertex which is not used by any edge or face.
+    Returns three object arrays.
+    """
+    verts = np.asarray(verts, dtype=np.float64)
+    if len(verts) == 0:
+        verts = np.empty((0, 3))
+    elif verts.shape[1] == 2:
+        verts = np.concatenate((verts, np.zeros((len(verts), 1))), axis=1)
+    n_verts = len(verts)
+
+    face_idxs, face_lengths = ragged_indices(faces)
+    good = face_lengths >= 3
+    if not good.all():
+        face_idxs = face_idxs[np.repeat(good, face_lengths)]
+        face_lengths = face_lengths[good]
+    ring_idxs = np.repeat(np.arange(len(face_lengths)), face_lengths)
+    if len(face_lengths):
+        polygons = shapely.polygons(shapely.linearrings(verts[face_idxs], indices=ring_idxs))
+    else:
+        polygons = np.empty((0,), dtype=object)
+
+    edges = np.asarray(edges, dtype=np.int64).reshape((-1, 2))
+    edges = edges[edges[:,0] != edges[:,1]]
+    if len(edges):
+        # Edges of faces: each face vertex with the next one in the same face
+        face_ends = np.cumsum(face_lengths)
+        next_idxs = np.arange(1, len(face_idxs) + 1)
+        next_idxs[face_ends - 1] = face_ends - face_lengths
+        face_edges = np.sort(np.stack((face_idxs, face_idxs[next_idxs]), axis=1), axis=1)
+
+        sorted_edges = np.sort(edges, axis=1)
+        edge_keys = sorted_edges[:,0] * n_verts + sorted_edges[:,1]
+        # Each edge is used once, in order of first appearance
+        edge_keys, first = np.unique(edge_keys, return_index=True)
+        first = np.sort(first[~ np.isin(edge_keys, face_edges[:,0] * n_verts + face_edges[:,1])])
+        wire_edges = edges[first]
+    else:
+        wire_edges = edges
+    strings = shapely.linestrings(verts[wire_edges])
+
+    used = np.zeros((n_verts,), dtype=bool)
+    used[face_idxs] = True
+    used[edges.reshape((-1,))] = True
+    points = shapely.points(verts[~ used])
+
+    return polygons, strings, points
+
 def from_mesh(verts, edges, faces):
-    verts = [to_3d(v) for v in verts]
-    bm = bmesh_from_pydata(verts, edges, faces)
-    polygons = []
-    for bm_face in bm.faces:
-        poly = shapely.Polygon([list(v.co) for v in bm_face.verts])
-        polygons.append(poly)
-    strings = []
-    for bm_edge in bm.edges:
-        if bm_edge.is_wire:
-            string = shapely.LineString([list(v.co) for v in bm_edge.verts])
-            strings.append(string)
-    points = []
-    for bm_vert in bm.verts:
-        if len(bm_vert.link_edges) == 0:
-            point = shapely.Point(list(bm_vert.co))
-            points.append(point)
+    polygons, strings, points = mesh_to_geometries(verts, edges, faces)
     if len(polygons) > 0 and len(strings) == 0 and len(points) == 0:
-        return shapely.MultiPolygon(polygons)
+        return shapely.multipolygons(polygons)
     elif len(polygons) == 0 and len(strings) > 0 and len(points) == 0:
-        return shapely.MultiLineString(strings)
+        return shapely.multilinestrings(strings)
     elif len(polygons) == 0 and len(strings) == 0 and len(points) > 0:
-        return shapely.MultiPoint(points)
+        return shapely.multipoints(points)
     else:
-        return shapely.GeometryCollection(polygons + strings + points)
+        return shapely.geometrycollections(np.concatenate((polygons, strings, points)))
 
 def boundary(geometry):
     if isinstance(geometry, shapely.GeometryCollection):
@@ -120,3 +223,462 @@ def union_collection(geometry):
     else:
         return geometry
 
+
+def difference_all(geometries, union_first=True, prefilter=True):
+    """
+    Subtract geometries[1:] from geometries[0].
+    If union_first is True, all subtrahends are merged by one cascaded union,
+    and then subtracted at once; otherwise they are subtracted one by one.
+    If prefilter is True, subtrahends which do not intersect the first
+    geometry are skipped (found by STRtree).
+    """
+    if len(geometries) == 0:
+        return shapely.GeometryCollection()
+    base = geometries[0]
+    others = as_ufunc_arg(list(geometries[1:]))
+    if prefilter and len(others):
+        tree = shapely.STRtree(others)
+        others = others[np.sort(tree.query(base, predicate='intersects'))]
+    if len(others) == 0:
+        return base
+    if union_first:
+        return shapely.difference(base, shapely.union_all(others))
+    for g in others:
+        base = base.difference(g)
+    return base
+
+def boundary_array(geometries):
+    """
+    Vectorized version of boundary().
+    """
+    result = shapely.boundary(geometries)
+    collections = np.where(shapely.get_type_id(geometries) == shapely.GeometryType.GEOMETRYCOLLECTION)[0]
+    for i in collections:
+        result[i] = boundary(geometries[i])
+    return result
+
+# Shapely 2 functions work on arrays of geometries ("ufuncs"), running the
+# loop over items in C. The functions below convert nested node inputs to
+# such arrays and back.
+
+def as_ufunc_arg(values):
+    """
+    Convert list of numbers to numpy array, and list of geometries (or
+    None's) to object array.
+    """
+    if values and isinstance(values[0], (int, float, np.number)):
+        return np.asarray(values)
+    array = np.empty((len(values),), dtype=object)
+    array[:] = values
+    return array
+
+def broadcast_nested(*data_s):
+    """
+    Match nested lists of level 2 the same way as zip_long_repeat() does on
+    both levels, and flatten them.
+    Returns list of flat lists (one per input) and list of lengths of
+    inner lists.
+    """
+    data_s = [data.nested_lists() if isinstance(data, PackedGeometries) else data for data in data_s]
+    columns = [[] for data in data_s]
+    lengths = []
+    if any(len(data) == 0 for data in data_s):
+        return columns, lengths
+    n_outer = max(len(data) for data in data_s)
+    for i in range(n_outer):
+        params = [data[min(i, len(data)-1)] for data in data_s]
+        if any(len(param) == 0 for param in params):
+            lengths.append(0)
+            continue
+        n = max(len(param) for param in params)
+        for column, param in zip(columns, params):
+            column.extend(param)
+            if len(param) < n:
+                column.extend([param[-1]] * (n - len(param)))
+        lengths.append(n)
+    return columns, lengths
+
+def unflatten_nested(values, lengths, flat_output=False):
+    """
+    Reverse of broadcast_nested(): split flat list (or array) of results
+    into lists of specified lengths.
+    """
+    if isinstance(values, np.ndarray):
+        values = values.tolist()
+    if flat_output:
+        return values
+    result = []
+    start = 0
+    for n in lengths:
+        result.append(values[start : start + n])
+        start += n
+    return result
+
+def apply_grouped(func, arrays, scalar_params=()):
+    """
+    Call func(*arrays). Some shapely functions accept only scalar values for
+    some parameters; for them, items are grouped by values of such
+    parameters (listed in scalar_params by index), and func is called once
+    per group.
+    """
+    n = len(arrays[0]) if arrays else 0
+    if not scalar_params:
+        return func(*arrays)
+    if n == 0:
+        return np.empty((0,), dtype=object)
+    keys = np.stack([arrays[i] for i in scalar_params], axis=1)
+    unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.reshape((-1,))
+    result = None
+    for k, values in enumerate(unique.tolist()):
+        mask = inverse == k
+        scalars = dict(zip(scalar_params, values))
+        args = [scalars[i] if i in scalars else array[mask] for i, array in enumerate(arrays)]
+        group_result = np.asarray(func(*args))
+        if result is None:
+            result = np.empty((n,), dtype=group_result.dtype)
+        result[mask] = group_result
+    return result
+
+def vectorize_nested(func, data_s, flat_output=False, scalar_params=()):
+    """
+    Apply shapely ufunc to nested node inputs of level 2 in one call.
+    data_s: list of inputs, matched by zip_long_repeat() rules.
+    Returns nested (or flat) list of results.
+    """
+    columns, lengths = broadcast_nested(*data_s)
+    arrays = [as_ufunc_arg(column) for column in columns]
+    result = apply_grouped(func, arrays, scalar_params)
+    return unflatten_nested(result, lengths, flat_output)
+
+def ragged_coordinates(verts_s):
+    """
+    Coordinates of all vertices in list of vertex lists, as one array, with
+    index of vertex list for each vertex.
+    """
+    counts = np.array([len(verts) for verts in verts_s], dtype=np.int64)
+    coords = np.array([v for verts in verts_s for v in verts], dtype=np.float64).reshape((-1, 3))
+    indices = np.repeat(np.arange(len(verts_s)), counts)
+    return coords, indices, counts
+
+def geometries_from_lists(func, verts_s, empty):
+    """
+    Build one geometry per vertex list by shapely constructor function
+    (shapely.linestrings, shapely.linearrings, shapely.multipoints...),
+    which accepts coordinates and indices. Empty vertex lists give
+    empty() geometries.
+    """
+    coords, indices, counts = ragged_coordinates(verts_s)
+    good = counts > 0
+    result = np.empty((len(verts_s),), dtype=object)
+    if good.any():
+        # Constructors do not accept gaps in indices
+        new_idxs = np.cumsum(good) - 1
+        result[good] = func(coords, indices=new_idxs[indices])
+    for i in np.where(~good)[0]:
+        result[i] = empty()
+    return result
+
+def query_pairs(geometries1, geometries2, predicate='intersects', distance=None):
+    """
+    Find pairs of geometries (geometries1[i], geometries2[j]) for which
+    predicate(geometries1[i], geometries2[j]) is true, or which lie within
+    specified distance from each other. Only candidates selected by STRtree
+    built on geometries2 are checked, instead of all N*M pairs.
+    Returns two arrays of indices, sorted by i, then by j.
+    """
+    geometries1 = as_ufunc_arg(list(geometries1))
+    geometries2 = as_ufunc_arg(list(geometries2))
+    tree = shapely.STRtree(geometries2)
+    if distance is not None:
+        idxs1, idxs2 = tree.query(geometries1, predicate='dwithin', distance=distance)
+    else:
+        idxs1, idxs2 = tree.query(geometries1, predicate=predicate)
+    order = np.lexsort((idxs2, idxs1))
+    return idxs1[order], idxs2[order]
+
+# Minimal number of geometries for socket data to be packed
+PACK_THRESHOLD = 1000
+
+class PackedGeometries(object):
+    """
+    Compact representation of a list (or a list of lists) of geometries,
+    passed between 2D Geometry sockets: all geometries are serialized into
+    one WKB byte buffer, with offsets of each geometry in it. Geometries are
+    restored only when requested.
+
+    Restored geometries are cached until they are read `readers` times
+    (usually the number of links from the output socket), so that all
+    consumers share one decoding, and the memory is released afterwards.
+    """
+    def __init__(self, buffer, offsets, lengths=None, readers=None):
+        self.buffer = buffer
+        self.offsets = offsets
+        # Lengths of inner lists; None for a flat list
+        self.lengths = lengths
+        # Number of reads after which the cache is released; None - never
+        self.readers = readers
+        self._geometries = None
+        self._reads = 0
+
+    @classmethod
+    def pack(cls, data, min_count=0, readers=None):
+        """
+        Pack list or list of lists of geometries.
+        Returns None if data has other structure, or less than min_count
+        geometries.
+        """
+        level = get_data_nesting_level(data, data_types=(shapely.Geometry,))
+        if level == 1:
+            geometries, lengths = data, None
+        elif level == 2:
+            geometries = [g for item in data for g in item]
+            lengths = np.array([len(item) for item in data], dtype=np.int64)
+        else:
+            return None
+        if len(geometries) == 0 or len(geometries) < min_count:
+            return None
+        geometries = as_ufunc_arg(geometries)
+        if not shapely.is_geometry(geometries).all():
+            return None
+        wkbs = shapely.to_wkb(geometries)
+        sizes = np.fromiter(map(len, wkbs), dtype=np.int64, count=len(wkbs))
+        offsets = np.concatenate(([0], np.cumsum(sizes)))
+        return cls(b''.join(wkbs), offsets, lengths, readers)
+
+    @property
+    def nesting_level(self):
+        return 1 if self.lengths is None else 2
+
+    def __len__(self):
+        if self.lengths is None:
+            return len(self.offsets) - 1
+        return len(self.lengths)
+
+    def geometries(self):
+        """
+        All geometries, as flat object array.
+        """
+        geometries = self._geometries
+        if geometries is None:
+            buffer = self.buffer
+            offsets = self.offsets.tolist()
+            wkbs = [buffer[start : end] for start, end in zip(offsets[:-1], offsets[1:])]
+            geometries = shapely.from_wkb(as_ufunc_arg(wkbs))
+        self._reads += 1
+        if self.readers is None or self._reads < self.readers:
+            self._geometries = geometries
+        else:
+            self._geometries = None
+            self._reads = 0
+        return geometries
+
+    def nested_lists(self):
+        """
+        Geometries as list of lists (nesting level 2), even for packed flat list.
+        """
+        geometries = self.geometries().tolist()
+        if self.lengths is None:
+            return [geometries]
+        return unflatten_nested(geometries, self.lengths.tolist())
+
+    def unpack(self):
+        """
+        Geometries in the same structure as was packed.
+        """
+        if self.lengths is None:
+            return self.geometries().tolist()
+        return self.nested_lists()
+
+def unpack_geometries(data):
+    if isinstance(data, PackedGeometries):
+        return data.unpack()
+    return data
+
+def nested_geometries(data):
+    """
+    Bring 2D Geometry socket data (lists or PackedGeometries) to nesting
+    level 2, as expected by vectorize_nested(). Packed data is not unpacked;
+    broadcast_nested() treats packed flat list as a list with one item.
+    Returns the data and a flag telling if the input was a flat list.
+    """
+    if isinstance(data, PackedGeometries):
+        return data, data.lengths is None
+    input_level = get_data_nesting_level(data, data_types=(shapely.Geometry,))
+    return ensure_nesting_level(data, 2, data_types=(shapely.Geometry,)), input_level == 1
+
+# Number of geometries starting from which points_in_geometries() uses
+# STRtree instead of checking all points against each geometry
+POINTS_TREE_THRESHOLD = 16
+
+def points_in_geometries(geometries, coords, boundary=False):
+    """
+    Find which points lie inside geometries.
+    geometries: list of geometries (polygons, usually).
+    coords: array of shape (n, 2) or (n, 3); Z coordinates are ignored.
+    If boundary is True, points on geometry boundaries are counted as inside.
+    Returns boolean mask of points which are inside any geometry, and array
+    with index of first geometry containing each point (-1 for points
+    which are outside).
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    geometries = as_ufunc_arg(list(geometries))
+    idxs = np.full((len(coords),), -1, dtype=np.int64)
+    if coords.size == 0 or len(geometries) == 0:
+        return idxs >= 0, idxs
+    xs, ys = coords[:,0], coords[:,1]
+    shapely.prepare(geometries)
+    test_xy = shapely.intersects_xy if boundary else shapely.contains_xy
+
+    if len(geometries) < POINTS_TREE_THRESHOLD:
+        for i, geometry in enumerate(geometries):
+            todo = np.where(idxs < 0)[0]
+            if len(todo) == 0:
+                break
+            inside = test_xy(geometry, xs[todo], ys[todo])
+            idxs[todo[inside]] = i
+    else:
+        # STRtree gives candidate pairs by bounding boxes only; exact tests
+        # are then done for all pairs at once, with prepared geometries
+        tree = shapely.STRtree(geometries)
+        point_idxs, geometry_idxs = tree.query(shapely.points(xs, ys))
+        inside = test_xy(geometries[geometry_idxs], xs[point_idxs], ys[point_idxs])
+        point_idxs, geometry_idxs = point_idxs[inside], geometry_idxs[inside]
+        # First (smallest) geometry index for each point
+        order = np.lexsort((geometry_idxs, point_idxs))
+        point_idxs, geometry_idxs = point_idxs[order], geometry_idxs[order]
+        point_idxs, first = np.unique(point_idxs, return_index=True)
+        idxs[point_idxs] = geometry_idxs[first]
+    return idxs >= 0, idxs
+
+def polygons_to_mesh(polygons, tolerance=None):
+    """
+    Convert array of polygons (or multipolygons) to one mesh, merging
+    vertices which are shared by neighbouring polygons.
+    Polygons without holes give one n-gon face each; polygons with holes
+    are triangulated.
+    Returns lists of vertices and faces, and array with index of source
+    polygon for each face.
+    """
+    parts, part_idxs = shapely.get_parts(polygons, return_index=True)
+    good = (shapely.get_type_id(parts) == shapely.GeometryType.POLYGON) & ~ shapely.is_empty(parts)
+    parts, part_idxs = parts[good], part_idxs[good]
+    if len(parts) == 0:
+        return [], [], np.empty((0,), dtype=np.int64)
+    simple = shapely.get_num_interior_rings(parts) == 0
+
+    rings = shapely.get_exterior_ring(parts[simple])
+    coords, ring_idxs = shapely.get_coordinates(rings, include_z=True, return_index=True)
+    # Skip the closing point of each ring
+    last = np.ones((len(ring_idxs),), dtype=bool)
+    last[:-1] = ring_idxs[1:] != ring_idxs[:-1]
+    coords, ring_idxs = coords[~last], ring_idxs[~last]
+    face_lengths = np.bincount(ring_idxs, minlength=len(rings))
+    face_srcs = part_idxs[simple]
+    reverse = ~ shapely.is_ccw(rings)
+
+    all_coords = [coords]
+    all_lengths = [face_lengths]
+    all_srcs = [face_srcs]
+    all_reverse = [reverse]
+    for part, src in zip(parts[~simple], part_idxs[~simple]):
+        verts, _, faces = triangulate(part)
+        if not faces:
+            continue
+        faces = np.array(faces)
+        all_coords.append(np.array(verts)[faces].reshape((-1, 3)))
+        all_lengths.append(np.full((len(faces),), 3))
+        all_srcs.append(np.full((len(faces),), src))
+        all_reverse.append(np.zeros((len(faces),), dtype=bool))
+
+    coords = np.nan_to_num(np.concatenate(all_coords))
+    face_lengths = np.concatenate(all_lengths)
+    if len(coords) == 0:
+        return [], [], np.empty((0,), dtype=np.int64)
+    verts, vert_idxs = weld_vertices(coords, tolerance)
+    face_srcs = np.concatenate(all_srcs)
+    reverse = np.concatenate(all_reverse)
+    if tolerance:
+        # Welding can merge close points of one face; drop repeated
+        # consecutive vertices (including the last and the first one),
+        # and faces which have less than 3 vertices left
+        face_idxs = np.repeat(np.arange(len(face_lengths)), face_lengths)
+        starts = np.concatenate(([0], np.cumsum(face_lengths)[:-1]))
+        next_idxs = np.arange(len(vert_idxs)) + 1
+        next_idxs[starts + face_lengths - 1] = starts
+        keep = vert_idxs != vert_idxs[next_idxs]
+        face_lengths = np.bincount(face_idxs[keep], minlength=len(face_lengths))
+        good = face_lengths >= 3
+        keep &= good[face_idxs]
+        vert_idxs = vert_idxs[keep]
+        face_lengths, face_srcs, reverse = face_lengths[good], face_srcs[good], reverse[good]
+        used = np.zeros((len(verts),), dtype=bool)
+        used[vert_idxs] = True
+        if not used.all():
+            # Vertices of dropped faces only
+            new_idxs = np.cumsum(used) - 1
+            verts, vert_idxs = verts[used], new_idxs[vert_idxs]
+    faces = unflatten_nested(vert_idxs, face_lengths.tolist())
+    for i in np.where(reverse)[0]:
+        faces[i].reverse()
+    return verts.tolist(), faces, face_srcs
+
+def clip_geometries(geometries, regions):
+    """
+    Intersect array of geometries with a region (or with array of regions,
+    one per geometry). Only geometries crossing region boundary are
+    actually intersected; ones lying inside are kept as is.
+    """
+    shapely.prepare(regions)
+    todo = ~ shapely.contains_properly(regions, geometries)
+    if isinstance(regions, np.ndarray):
+        regions = regions[todo]
+    result = geometries.copy()
+    result[todo] = shapely.intersection(geometries[todo], regions)
+    return result
+
+def voronoi_cells(sites, extend_to=None, clip=False):
+    """
+    Voronoi diagram of one set of sites.
+    sites: array of shape (n, 2) or (n, 3).
+    If clip is True, cells are intersected with extend_to geometry.
+    Returns array of cells, and array with index of site for each cell.
+    """
+    sites = np.asarray(sites, dtype=np.float64)
+    if len(sites) == 0:
+        return np.empty((0,), dtype=object), np.empty((0,), dtype=np.int64)
+    diagram = shapely.voronoi_polygons(shapely.multipoints(sites), extend_to=extend_to)
+    cells = shapely.get_parts(diagram)
+    # Each site lies inside its own cell
+    inside, cell_idxs = points_in_geometries(cells, sites, boundary=True)
+    site_idxs = np.full((len(cells),), -1, dtype=np.int64)
+    site_idxs[cell_idxs[inside]] = np.where(inside)[0]
+    if clip and extend_to is not None:
+        cells = clip_geometries(cells, extend_to)
+    return cells, site_idxs
+
+def voronoi_mesh(sites, extend_to=None, clip=False):
+    """
+    Voronoi diagram of one set of sites, as cells and one mesh, where
+    neighbouring cells share vertices.
+    Returns array of cells, vertices, faces and index of site for each face.
+    """
+    cells, site_idxs = voronoi_cells(sites, extend_to, clip)
+    sites = np.asarray(sites, dtype=np.float64)
+    extent = np.ptp(sites, axis=0).max() if len(sites) else 0.0
+    # Clipped cells calculate their common points on extend_to boundary
+    # separately, so these points can differ slightly
+    verts, faces, face_cells = polygons_to_mesh(cells, tolerance = 1e-9 * (1.0 + extent))
+    return cells, verts, faces, site_idxs[face_cells].tolist()
+
+def voronoi_mesh_job(job):
+    """
+    voronoi_mesh() for execution in worker processes: geometries are passed
+    as WKB.
+    job: tuple (sites, extend_to WKB or None, clip).
+    """
+    sites, extend_to, clip = job
+    if extend_to is not None:
+        extend_to = shapely.from_wkb(extend_to)
+    cells, verts, faces, face_sites = voronoi_mesh(sites, extend_to, clip)
+    return shapely.to_wkb(cells), verts, faces, face_sites
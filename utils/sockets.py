@@ -1,11 +1,12 @@
-
 import bpy
 from bpy.types import NodeTree, NodeSocket
+from bpy.props import BoolProperty
 
 from sverchok.data_structure import flatten_data, graft_data
-from sverchok.core.sockets import InterfaceSocket, SocketDomain, SvSocketCommon
+from sverchok.core.sockets import InterfaceSocket, SocketDomain, SvSocketCommon, process_from_socket
 
 from sverchok_extra.dependencies import shapely
+from sverchok_extra.utils.shapely import PackedGeometries, unpack_geometries, PACK_THRESHOLD
 
 class SvGeom2DSocket(SocketDomain, NodeSocket, SvSocketCommon):
     """Socket type for Shapely 2D Geometry"""
@@ -14,6 +15,52 @@ class SvGeom2DSocket(SocketDomain, NodeSocket, SvSocketCommon):
 
     color = (0.64, 0.8, 0.96, 1.0)
 
+    pack_data : BoolProperty(
+            name = "Pack Data",
+            description = "Keep large output data (at least 1000 geometries) as one WKB buffer. This takes several times less memory, but packing and unpacking takes time on each update",
+            default = False,
+            update = process_from_socket)
+
+    # Socket options which process data as nested lists
+    processing_flags = ['use_flatten', 'use_simplify', 'use_graft', 'use_graft_2', 'use_wrap', 'use_unwrap']
+
+    def has_processing(self):
+        return any(getattr(self, flag, False) for flag in self.processing_flags)
+
+    def sv_get(self, *args, packed=False, **kwargs):
+        """
+        If packed is True, PackedGeometries instance can be returned instead
+        of nested lists; nodes which can process it directly may use this.
+        """
+        data = super().sv_get(*args, **kwargs)
+        if packed:
+            return data
+        return unpack_geometries(data)
+
+    def preprocess_input(self, data):
+        # List operations of socket options do not know about packed data
+        if self.has_processing():
+            data = unpack_geometries(data)
+        return super().preprocess_input(data)
+
+    def can_pack(self):
+        # Only 2D Geometry sockets know how to unpack the data
+        return self.is_output and self.pack_data and self.is_linked and \
+                not self.has_processing() and \
+                all(link.to_socket.bl_idname == self.bl_idname for link in self.links)
+
+    def sv_set(self, data):
+        if shapely is not None and self.can_pack():
+            packed = PackedGeometries.pack(data, min_count=PACK_THRESHOLD, readers=len(self.links))
+            if packed is not None:
+                data = packed
+        super().sv_set(data)
+
+    def draw_menu_items(self, context, layout):
+        super().draw_menu_items(context, layout)
+        if self.is_output:
+            layout.prop(self, 'pack_data')
+
     def do_flatten(self, data):
         return flatten_data(data, 1, data_types=(shapely.Geometry,))
 
@@ -25,4 +72,3 @@ def register():
 
 def unregister():
     bpy.utils.unregister_class(SvGeom2DSocket)
-
@@ -7,128 +7,335 @@ if svgelements is not None:
             SimpleLine, Group, Close,
             CubicBezier, QuadraticBezier)
 
+import os
+from io import BytesIO
+from collections import OrderedDict
+from xml.etree import ElementTree
+
 import numpy as np
 import mathutils
 
 from sverchok.utils.curve.core import UnsupportedCurveTypeException
 from sverchok.utils.curve.primitives import SvLine, SvCircle, SvEllipse
 from sverchok.utils.curve.bezier import SvBezierCurve, SvCubicBezierCurve
-from sverchok.utils.curve.nurbs import SvNurbsCurve
+from sverchok.utils.curve.nurbs import SvNurbsCurve, SvNurbsMaths
 from sverchok.utils.curve.algorithms import concatenate_curves, sort_curves_for_concat
 
+from sverchok_extra.utils.parallel import get_pool_context
+
 def convert_matrix(transform, center):
-    m = [[transform.a, transform.c, 0, transform.e],
-         [transform.b, transform.d, 0, transform.f],
+    if not isinstance(transform, tuple):
+        transform = transform_tuple(transform)
+    a, b, c, d, e, f = transform
+    m = [[a, c, 0, e],
+         [b, d, 0, f],
          [0.0, 0.0, 1.0, 0.0],
          [0.0, 0.0, 0.0, 1.0]]
     matrix = mathutils.Matrix(m)
     translate = mathutils.Matrix.Translation((center[0], center[1], 0))
     return matrix @ translate
 
+SVG_NAMESPACE = "http://www.w3.org/2000/svg"
+
+# Number of parsed documents to keep in cache
+PARSE_CACHE_SIZE = 8
+
+_parse_cache = OrderedDict()
+
+def polyline_to_nurbs(points, closed=False):
+    """
+    Make a NURBS curve of degree 1 passing through all points.
+    The curve is parametrized by length, same as SvLine.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if closed and not np.allclose(points[0], points[-1]):
+        points = np.concatenate((points, points[:1]))
+    # Drop coinciding consecutive points, they would give
+    # repeated knots of multiplicity 2
+    lengths = np.linalg.norm(points[1:] - points[:-1], axis=1)
+    good = np.concatenate(([True], lengths > 0))
+    points, lengths = points[good], lengths[good[1:]]
+    if len(points) < 2:
+        return None
+    ts = np.concatenate(([0.0], np.cumsum(lengths)))
+    knotvector = np.concatenate(([0.0], ts, [ts[-1]]))
+    return SvNurbsMaths.build(SvNurbsMaths.NATIVE, 1, knotvector, points)
+
 def process_path(element, concatenate=True, tolerance=1e-6):
-    result = []
-    for segment in element:
-        curve = process_path_element(segment)
-        if curve:
-            result.append(curve)
-    if concatenate:
-        result = sort_curves_for_concat(result, allow_flip=False).curves
-        curve = concatenate_curves(result, allow_generic=False, allow_split=True, tolerance=tolerance)
-        if isinstance(curve, list):
-            result = curve
-        else:
-            result = [curve]
-    return result
+    return build_curves([path_records(element)], concatenate_paths=concatenate, tolerance=tolerance)
 
 def process_path_element(segment):
+    record = segment_record(segment)
+    if record is not None:
+        return build_curve(record)
+
+def process_element(element, concatenate_paths=True, tolerance=1e-6):
+    return build_curves(element_records(element), concatenate_paths=concatenate_paths, tolerance=tolerance)
+
+# Conversion of SVG elements is done in two steps. First, elements are
+# converted to "records": tuples of a kind tag and plain numbers / numpy
+# arrays. Records are compact and can be passed between processes. Then
+# Sverchok curves are built from records.
+#
+# Record kinds:
+#   ('line', points)                  points: array of shape (2, 3)
+#   ('bezier', points)                points: array of shape (3, 3) or (4, 3)
+#   ('arc', center, angle, rx, ry, start_t, sweep)
+#   ('ellipse', transform, center, rx, ry)   transform: SVG (a, b, c, d, e, f)
+#   ('circle', transform, center, r)
+#   ('polyline', points, closed)
+#   ('path', [records])               segments to be concatenated
+
+def segment_record(segment):
     if isinstance(segment, CubicBezier):
         pts = [(p.x,p.y,0) for p in [segment.start, segment.control1, segment.control2, segment.end]]
-        return SvCubicBezierCurve(*pts)
+        return ('bezier', np.array(pts))
     elif isinstance (segment, QuadraticBezier):
         pts = [(p.x,p.y,0) for p in [segment.start, segment.control, segment.end]]
-        return SvBezierCurve(pts)
-    elif isinstance(segment, Line):
-        pts = [(p.x,p.y,0) for p in [segment.start, segment.end]]
-        return SvLine.from_two_points(*pts)
-    elif isinstance(segment, Close):
+        return ('bezier', np.array(pts))
+    elif isinstance(segment, (Line, Close)):
         pts = [(p.x,p.y,0) for p in [segment.start, segment.end]]
-        return SvLine.from_two_points(*pts)
+        return ('line', np.array(pts))
     elif isinstance(segment, Arc):
-        matrix = mathutils.Matrix.Rotation(segment.get_rotation().as_radians, 4, 'Z')
         center = segment.center
-        matrix.translation = (center[0], center[1], 0)
-        ellipse = SvEllipse(matrix, segment.rx, segment.ry)
-        start_t = segment.get_start_t()
-        ellipse.u_bounds = (start_t, start_t + segment.sweep)
-        return ellipse
+        return ('arc', (center[0], center[1]), segment.get_rotation().as_radians,
+                    segment.rx, segment.ry, segment.get_start_t(), segment.sweep)
     else:
         pass
         #print("Unsupported:", segment)
 
-def process_element(element, concatenate_paths=True, tolerance=1e-6):
+def path_records(element):
+    segments = []
+    for segment in element:
+        record = segment_record(segment)
+        if record is not None:
+            segments.append(record)
+    return ('path', segments)
+
+def transform_tuple(transform):
+    return (transform.a, transform.b, transform.c, transform.d, transform.e, transform.f)
+
+def element_records(element):
     result = []
-    #print("Process", type(element))
     if isinstance(element, Group) and not isinstance(element, SVG):
         for child in element:
-            group = process_element(child, concatenate_paths=concatenate_paths, tolerance=tolerance)
-            if group:
-                result.extend(group)
+            result.extend(element_records(child))
 
     elif isinstance(element, Path):
-        result.extend(process_path(element, concatenate=concatenate_paths, tolerance=tolerance))
-        
+        result.append(path_records(element))
+
     elif isinstance(element, (Line, SimpleLine)):
-        start = (element.x1, element.y1, 0)
-        end = (element.x2, element.y2, 0)
-        result.append(SvLine.from_two_points(start, end))
-    
+        pts = [(element.x1, element.y1, 0), (element.x2, element.y2, 0)]
+        result.append(('line', np.array(pts)))
+
     elif isinstance(element, Circle):
-        cx, cy, r = element.cx, element.cy, element.rx
-        m = convert_matrix(element.transform, (cx, cy))
-        result.append(SvCircle(matrix = m, radius=r, center=(cx,cy, 0)))
-    
+        result.append(('circle', transform_tuple(element.transform), (element.cx, element.cy), element.rx))
+
     elif isinstance(element, Ellipse):
-        cx, cy, rx, ry = element.cx, element.cy, element.rx, element.ry
-        m = convert_matrix(element.transform, (cx, cy))
-        ellipse = SvEllipse(matrix=m, a=rx, b=ry)
-        result.append(ellipse)
-    
+        result.append(('ellipse', transform_tuple(element.transform), (element.cx, element.cy), element.rx, element.ry))
+
     elif isinstance(element, Rect):
-        #segments = [segment * element.transform for segment in element.segments()]
-        result.extend(process_path(element.segments(), concatenate=concatenate_paths))
-    
+        result.append(path_records(element.segments()))
+
     elif isinstance(element, (Polygon, Polyline)):
+        # One curve per polygon instead of one line per edge
         points = [(p.x, p.y, 0) for p in element.points]
-        for p1, p2 in zip(points, points[1:]):
-            line = SvLine.from_two_points(p1, p2)
-            result.append(line)
-        if isinstance(element, Polygon):
-            line = SvLine.from_two_points(points[-1], points[0])
-            result.append(line)
+        if len(points) > 1:
+            result.append(('polyline', np.array(points), isinstance(element, Polygon)))
 
     return result
 
-def parse_svg(path, ppi=96.0, concatenate_paths=True, convert_coords=True, tolerance=1e-6):
+def build_curve(record):
+    kind = record[0]
+    if kind == 'line':
+        return SvLine.from_two_points(*record[1])
+    elif kind == 'bezier':
+        points = record[1]
+        if len(points) == 4:
+            return SvCubicBezierCurve(*points)
+        else:
+            return SvBezierCurve(points)
+    elif kind == 'arc':
+        _, center, angle, rx, ry, start_t, sweep = record
+        matrix = mathutils.Matrix.Rotation(angle, 4, 'Z')
+        matrix.translation = (center[0], center[1], 0)
+        ellipse = SvEllipse(matrix, rx, ry)
+        ellipse.u_bounds = (start_t, start_t + sweep)
+        return ellipse
+    elif kind == 'circle':
+        _, transform, (cx, cy), r = record
+        m = convert_matrix(transform, (cx, cy))
+        return SvCircle(matrix = m, radius=r, center=(cx,cy, 0))
+    elif kind == 'ellipse':
+        _, transform, (cx, cy), rx, ry = record
+        m = convert_matrix(transform, (cx, cy))
+        return SvEllipse(matrix=m, a=rx, b=ry)
+    elif kind == 'polyline':
+        return polyline_to_nurbs(record[1], closed=record[2])
+    else:
+        raise Exception(f"Unsupported record: {kind}")
+
+def build_curves(records, concatenate_paths=True, tolerance=1e-6):
     result = []
-    svg = SVG.parse(path, ppi=ppi)
+    for record in records:
+        if record[0] == 'path':
+            curves = [build_curve(segment) for segment in record[1]]
+            if concatenate_paths and curves:
+                curves = sort_curves_for_concat(curves, allow_flip=False).curves
+                curve = concatenate_curves(curves, allow_generic=False, allow_split=True, tolerance=tolerance)
+                if isinstance(curve, list):
+                    curves = curve
+                else:
+                    curves = [curve]
+            result.extend(curves)
+        else:
+            curve = build_curve(record)
+            if curve is not None:
+                result.append(curve)
+    return result
 
+def svg_records(svg):
+    records = []
+    for element in svg:
+        records.extend(element_records(element))
+    return records
+
+def build_svg_curves(records, height, concatenate_paths=True, convert_coords=True, tolerance=1e-6):
+    curves = build_curves(records, concatenate_paths=concatenate_paths, tolerance=tolerance)
     if convert_coords:
-        vector = np.array((0, svg.height, 0))
+        vector = np.array((0, height, 0))
+        curves = [curve.mirror(1).translate(vector) for curve in curves]
+    return curves
 
-    print("SVG", len(list(svg.elements())))
-    for element in svg:
-        sub = process_element(element, concatenate_paths=concatenate_paths, tolerance=tolerance)
-        if sub:
-            curves = sub
-            #for curve in sub:
-            #    nurbs_curve = SvNurbsCurve.to_nurbs(curve)
-            #    if nurbs_curve is None:
-            #        raise UnsupportedCurveTypeException(f"Cannot convert to NURBS: {curve}")
-            #    curves.append(nurbs_curve)
-            if convert_coords:
-                for curve in curves:
-                    result.append(curve.mirror(1).translate(vector))
-            else:
-                result.extend(curves)
+def process_svg(svg, concatenate_paths=True, convert_coords=True, tolerance=1e-6):
+    return build_svg_curves(svg_records(svg), svg.height,
+                concatenate_paths=concatenate_paths, convert_coords=convert_coords, tolerance=tolerance)
+
+# Elements which iter_svg_documents() descends into
+CONTAINER_TAGS = {'g', 'a'}
+
+def iter_svg_documents(path, group_size=16):
+    """
+    Split SVG file into small SVG documents while reading it, so that the
+    whole XML tree is never kept in memory. Groups (<g>, <a>, e.g. Inkscape
+    layers) are descended into: each document contains up to group_size
+    consecutive elements (path, rect, polyline...) of one group, wrapped into
+    copies of all their ancestor groups, so that transforms and styles of
+    the groups still apply. Other elements (<defs>, <text>, nested <svg>...)
+    are kept whole. Each document has the attributes (size, viewBox) of the
+    original root element, so coordinates are interpreted the same way.
+    Yields bytes.
+
+    Note: references between elements (<use>, gradients in <defs>, CSS in
+    <style>) are not resolved in this mode.
+    """
+    ElementTree.register_namespace('', SVG_NAMESPACE)
+    # Currently open elements, from the root
+    stack = []
+    # Elements waiting to be written: (parent, element) pairs, and the
+    # ancestor groups they share
+    pending = []
+    pending_chain = []
+    root = None
+
+    def is_container(elem):
+        return elem.tag.rsplit('}', 1)[-1] in CONTAINER_TAGS
+
+    def flush():
+        document = ElementTree.Element(root.tag, root.attrib)
+        parent = document
+        for group in pending_chain:
+            parent = ElementTree.SubElement(parent, group.tag, group.attrib)
+        parent.extend([elem for _, elem in pending])
+        data = ElementTree.tostring(document)
+        for elem_parent, elem in pending:
+            elem_parent.remove(elem)
+            elem.clear()
+        pending.clear()
+        return data
+
+    for event, elem in ElementTree.iterparse(path, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = elem
+            stack.append(elem)
+            continue
+        stack.pop()
+        if not stack:
+            # End of the root element
+            if pending:
+                yield flush()
+            break
+        parent = stack[-1]
+        if is_container(elem):
+            if pending:
+                yield flush()
+            parent.remove(elem)
+            elem.clear()
+        elif len(stack) == 1 or is_container(parent):
+            if pending and (pending[-1][0] is not parent or len(pending) >= group_size):
+                yield flush()
+            if not pending:
+                pending_chain = stack[1:]
+            pending.append((parent, elem))
+
+def convert_document(job):
+    """
+    Parse one small SVG document and convert it to records.
+    This is executed in worker processes, so it does not build any Sverchok
+    objects: records are cheap to pass back to the main process.
+    """
+    document, ppi = job
+    svg = SVG.parse(BytesIO(document), ppi=ppi)
+    return svg.height, svg_records(svg)
+
+def parse_svg_iterative(path, ppi=96.0, concatenate_paths=True, convert_coords=True, tolerance=1e-6, n_workers=1, chunksize=64):
+    """
+    Parse elements of SVG file by small groups (see iter_svg_documents()).
+    If n_workers > 1, elements are converted in a pool of worker processes;
+    curves are still built in the main process, in document order.
+    """
+    jobs = ((document, ppi) for document in iter_svg_documents(path))
+    context = get_pool_context() if n_workers > 1 else None
+    result = []
+    if context is None:
+        for height, records in map(convert_document, jobs):
+            result.extend(build_svg_curves(records, height,
+                            concatenate_paths=concatenate_paths, convert_coords=convert_coords, tolerance=tolerance))
+    else:
+        with context.Pool(n_workers) as pool:
+            for height, records in pool.imap(convert_document, jobs, chunksize=chunksize):
+                result.extend(build_svg_curves(records, height,
+                                concatenate_paths=concatenate_paths, convert_coords=convert_coords, tolerance=tolerance))
     return result
 
+def parse_svg(path, ppi=96.0, concatenate_paths=True, convert_coords=True, tolerance=1e-6, iterative=False, use_cache=True, n_workers=1):
+    """
+    Read curves from SVG file.
+
+    If iterative is True, elements are parsed by small groups, see
+    iter_svg_documents(). If n_workers > 1, they are also converted in
+    parallel, which implies iterative mode. Results are cached by file path,
+    modification time and parameters.
+    """
+    iterative = iterative or n_workers > 1
+    key = (os.path.abspath(path), os.path.getmtime(path), ppi, concatenate_paths, convert_coords, tolerance, iterative)
+    if use_cache and key in _parse_cache:
+        _parse_cache.move_to_end(key)
+        return list(_parse_cache[key])
+
+    if iterative:
+        result = parse_svg_iterative(path, ppi=ppi, concatenate_paths=concatenate_paths, convert_coords=convert_coords, tolerance=tolerance, n_workers=n_workers)
+    else:
+        svg = SVG.parse(path, ppi=ppi)
+        result = process_svg(svg, concatenate_paths=concatenate_paths, convert_coords=convert_coords, tolerance=tolerance)
+
+    if use_cache:
+        _parse_cache[key] = result
+        while len(_parse_cache) > PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return list(result)
+
+def clear_parse_cache():
+    _parse_cache.clear()
+